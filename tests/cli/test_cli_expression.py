@@ -45,3 +45,30 @@ class TestExpressionCli():
         cmd_str = " ".join(cmd)
 
         subprocess.check_call(cmd_str, shell=True)
+
+    def test_evaluate_many(self, device, tmpdir):
+        """Evaluates expressions listed in a file"""
+        exprs = tmpdir.join("exprs.txt")
+        exprs.write("# expressions\n1 + 1\n\n2 * 3\n")
+
+        cmd = get_cmd_with_device_params(device)
+
+        cmd.extend(["evaluate-many", "\"%s\"" % str(exprs)])
+        cmd_str = " ".join(cmd)
+
+        output = subprocess.check_output(cmd_str, shell=True)
+
+        assert output.decode().splitlines()[-2:] == ["1 + 1 = 2", "2 * 3 = 6"]
+
+    def test_evaluate_many_with_error(self, device, tmpdir):
+        """Tests a non-zero exit when an expression fails"""
+        exprs = tmpdir.join("exprs.txt")
+        exprs.write("1 + 1\nvar i = 0\n")
+
+        cmd = get_cmd_with_device_params(device)
+
+        cmd.extend(["evaluate-many", "\"%s\"" % str(exprs)])
+        cmd_str = " ".join(cmd)
+
+        with pytest.raises(subprocess.CalledProcessError):
+            subprocess.check_call(cmd_str, shell=True)
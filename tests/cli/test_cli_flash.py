@@ -62,3 +62,15 @@ class TestFlashCli():
             cmd_str = " ".join(cmd)
 
             subprocess.check_call(cmd_str, shell=True)
+
+    def test_flash_many(self, device):
+        """Tests flashing with multiple --serno args (parallel flashing)"""
+        cmd = ["tiflash"]
+        cmd.extend(["--devicetype", "\"%s\"" % device['devicetype']])
+        cmd.extend(["--connection", "\"%s\"" % device['connection']])
+
+        cmd.extend(["flash", "\"%s\"" % device["image"],
+                    "--serno", "\"%s\"" % device['serno'], "-j", "2"])
+        cmd_str = " ".join(cmd)
+
+        subprocess.check_call(cmd_str, shell=True)
@@ -36,6 +36,77 @@ class TestMemoryCli():
 
         subprocess.check_call(cmd_str, shell=True)
 
+    def test_memory_read_hex_num_bytes(self, device):
+        """Tests memory read with number of bytes given in hex"""
+        NUM_BYTES = "0x4"
+        cmd = get_cmd_with_device_params(device)
+
+        cmd.extend(["memory-read", "\"%s\"" % ADDRESS, "-n", NUM_BYTES])
+        cmd_str = " ".join(cmd)
+
+        subprocess.check_call(cmd_str, shell=True)
+
+    def test_basic_memory_read_many(self, device, tmpdir):
+        """Tests reading many regions listed in a file"""
+        regions = tmpdir.join("regions.txt")
+        regions.write("# address num_bytes [page]\n"
+                      "%s 4\n"
+                      "0x20000000 8 0\n" % ADDRESS)
+        cmd = get_cmd_with_device_params(device)
+
+        cmd.extend(["memory-read-many", "\"%s\"" % str(regions), "--hex"])
+        cmd_str = " ".join(cmd)
+
+        subprocess.check_call(cmd_str, shell=True)
+
+    def test_basic_memory_watch(self, device, tmpdir):
+        """Tests sampling memory to a CSV file"""
+        out_path = str(tmpdir.join("samples.csv"))
+        cmd = get_cmd_with_device_params(device)
+
+        cmd.extend(["memory-watch", "--address", "\"%s\"" % ADDRESS,
+                    "--num-bytes", "4", "--interval", "0.1", "--count", "3",
+                    "--out", "\"%s\"" % out_path])
+        cmd_str = " ".join(cmd)
+
+        subprocess.check_call(cmd_str, shell=True)
+
+        with open(out_path) as f:
+            lines = f.read().splitlines()
+
+        assert len(lines) == 4  # header + samples
+        assert lines[0] == "timestamp,value0,value1,value2,value3"
+
+    def test_basic_memory_dump(self, device, tmpdir):
+        """Tests simple memory dump to file"""
+        NUM_BYTES = "16"
+        out_path = str(tmpdir.join("dump.bin"))
+        cmd = get_cmd_with_device_params(device)
+
+        cmd.extend(["memory-dump", "\"%s\"" % ADDRESS, NUM_BYTES,
+                    "-o", "\"%s\"" % out_path, "--sha256"])
+        cmd_str = " ".join(cmd)
+
+        subprocess.check_call(cmd_str, shell=True)
+
+        with open(out_path, 'rb') as f:
+            assert len(f.read()) == int(NUM_BYTES)
+
+    def test_memory_dump_hex_length(self, device, tmpdir):
+        """Tests memory dump with length given in hex"""
+        NUM_BYTES = "0x10"
+        out_path = str(tmpdir.join("dump.bin"))
+        cmd = get_cmd_with_device_params(device)
+
+        cmd.extend(["memory-dump", "\"%s\"" % ADDRESS, NUM_BYTES,
+                    "-o", "\"%s\"" % out_path, "--sha256"])
+        cmd_str = " ".join(cmd)
+
+        subprocess.check_call(cmd_str, shell=True)
+
+        with open(out_path, 'rb') as f:
+            assert len(f.read()) == int(NUM_BYTES, 0)
+
 
     def test_basic_memory_write(self, device):
         """Tests simple memory write"""
@@ -1,3 +1,4 @@
+import json
 import pytest
 import subprocess
 
@@ -30,6 +31,23 @@ class TestRegisterCli():
 
         subprocess.check_call(cmd_str, shell=True)
 
+    def test_basic_register_dump(self, device, tmpdir):
+        """Tests dumping a register snapshot to a JSON file"""
+        out_path = str(tmpdir.join("registers.json"))
+
+        cmd = get_cmd_with_device_params(device)
+
+        cmd.extend(["register-dump", "PC", "SP", "--hex",
+                    "-o", "\"%s\"" % out_path])
+        cmd_str = " ".join(cmd)
+
+        subprocess.check_call(cmd_str, shell=True)
+
+        with open(out_path) as f:
+            result = json.load(f)
+
+        assert sorted(result.keys()) == ["PC", "SP"]
+
 
     def test_invalid_register_read(self, device):
         """Tests an Error is raised when trying to access invalid register for
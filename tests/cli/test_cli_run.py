@@ -0,0 +1,26 @@
+import os
+import json
+import pytest
+import subprocess
+
+from clihelpers import get_cmd_with_device_params
+
+
+@pytest.mark.usefixtures("device")
+class TestRunCli():
+
+    def test_basic_run(self, device, t_env):
+        """Tests running a plan file of erase, flash, verify and reset"""
+        steps = [{"command": "erase"},
+                 {"command": "flash", "image": device['image']},
+                 {"command": "verify", "image": device['image']},
+                 {"command": "reset"}]
+        plan_path = os.path.join(t_env['TEMP_DIR'], "plan.json")
+        with open(plan_path, 'w') as f:
+            json.dump(steps, f)
+
+        cmd = get_cmd_with_device_params(device)
+        cmd.extend(["run", "\"%s\"" % plan_path])
+        cmd_str = " ".join(cmd)
+
+        subprocess.check_call(cmd_str, shell=True)
@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+
+import tiflash.aio
+
+ADDRESS = 0x500012F0
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.mark.usefixtures("device")
+class TestAioApi():
+
+    def test_aio_reset(self, device):
+        """Tests reset coroutine on each device in devices.cfg"""
+        result = run(tiflash.aio.reset(serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype']))
+
+        assert result is True
+
+    def test_aio_reset_fresh_ccxml(self, device):
+        """Tests reset coroutine generating a fresh ccxml file"""
+        result = run(tiflash.aio.reset(serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'],
+                            fresh=True))
+
+        assert result is True
+
+    def test_aio_concurrent_commands(self, device):
+        """Tests running multiple coroutines concurrently on one event loop"""
+        async def read_and_list():
+            return await asyncio.gather(
+                tiflash.aio.memory_read(ADDRESS, 4,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype']),
+                tiflash.aio.get_cpus())
+
+        (data, cpus) = run(read_and_list())
+
+        assert len(data) == 4
+        assert type(cpus) is list
+
+    def test_aio_xds110_list(self, device, t_env):
+        """Tests xds110_list coroutine returns list of all connected devices"""
+        devices = t_env['DEVICES'].keys()
+        serno_list = [t_env['DEVICES'][d]['serno'] for d in devices]
+
+        result = run(tiflash.aio.xds110_list())
+        result_sernos = [s for (s, v) in result]
+
+        for serno in serno_list:
+            assert serno in result_sernos
+
+    def test_aio_memory_read_many(self, device):
+        """Tests reading many regions with a single coroutine"""
+        regions = [(ADDRESS, 4), (ADDRESS + 4, 2)]
+        result = run(tiflash.aio.memory_read_many(
+            regions, serno=device['serno'], connection=device['connection'],
+            devicetype=device['devicetype']))
+
+        assert len(result[ADDRESS]) == 4
+        assert len(result[ADDRESS + 4]) == 2
+
+    def test_aio_memory_watch(self, device):
+        """Tests sampling memory with the async generator"""
+        async def watch():
+            return [s async for s in tiflash.aio.memory_watch(
+                ADDRESS, 4, interval=0.1, count=3, serno=device['serno'],
+                connection=device['connection'],
+                devicetype=device['devicetype'])]
+
+        samples = run(watch())
+
+        assert len(samples) == 3
+        assert all(len(values) == 4 for (timestamp, values) in samples)
+
+    def test_aio_run_pipeline(self, device):
+        """Tests running a pipeline coroutine"""
+        steps = [{'command': 'reset'},
+                 {'command': 'memory_read', 'address': ADDRESS,
+                     'num_bytes': 4}]
+        results = run(tiflash.aio.run_pipeline(
+            steps, serno=device['serno'], connection=device['connection'],
+            devicetype=device['devicetype']))
+
+        assert [r['success'] for r in results] == [True, True]
@@ -43,3 +43,36 @@ class TestExpressionApi():
 
         assert result == '0'
 
+    def test_evaluate_many(self, device):
+        """Evaluates many expressions in a single session; a failing
+        expression does not stop the others"""
+        EXPRESSIONS = ["1 + 1", "var i = 0", "2 * 3"]
+
+        results = tiflash.evaluate_many(EXPRESSIONS,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        assert [r['expression'] for r in results] == EXPRESSIONS
+        assert [r['success'] for r in results] == [True, False, True]
+        assert results[0]['result'] == "2"
+        assert results[1]['error']
+        assert results[2]['result'] == "6"
+
+    def test_evaluate_many_with_symbol_load(self, device):
+        """Evaluates many expressions with symbols loaded once"""
+
+        if 'symbol' not in device.keys() or \
+                'symbol_image' not in device.keys():
+            pytest.skip("No symbol image path or symbol name")
+
+        EXPRESSIONS = [device['symbol']] * 3
+        SYMBOL_FILE = device['symbol_image']
+
+        results = tiflash.evaluate_many(EXPRESSIONS,
+                            symbol_file=SYMBOL_FILE,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        assert [r['result'] for r in results] == ['0'] * 3
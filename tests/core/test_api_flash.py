@@ -50,3 +50,36 @@ class TestFlashApi():
             result = tiflash.flash(hex_path, binary=True, serno=device['serno'],
                                 connection=device['connection'],
                                 devicetype=device['devicetype'])
+
+    def test_flash_many(self, device):
+        """Tests flash_many returns a result per device"""
+        results = tiflash.flash_many(device['image'], [device['serno']],
+                            max_workers=2,
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        assert len(results) == 1
+        assert results[0]['serno'] == device['serno']
+        assert results[0]['success'] is True
+        assert results[0]['duration'] > 0
+
+    def test_flash_many_invalid_serno(self, device):
+        """Tests flash_many reports failure of one device without stopping
+        the other devices"""
+        results = tiflash.flash_many(device['image'],
+                                     [device['serno'], "GARBAGE"],
+                                     connection=device['connection'],
+                                     devicetype=device['devicetype'])
+
+        assert results[0]['success'] is True
+        assert results[1]['success'] is False
+        assert results[1]['error'] is not None
+
+    def test_flash_many_duplicate_sernos(self, device):
+        """Tests an Error is raised (before flashing any device) when a serno
+        is given more than once"""
+        with pytest.raises(tiflash.TIFlashError):
+            tiflash.flash_many(device['image'],
+                               [device['serno'], device['serno']],
+                               connection=device['connection'],
+                               devicetype=device['devicetype'])
@@ -1,3 +1,4 @@
+import hashlib
 import pytest
 
 import tiflash
@@ -27,6 +28,83 @@ class TestMemoryApi():
 
         assert len(result) == 4
 
+    def test_memory_read_as_bytes(self, device):
+        """Tests memory read returning bytes"""
+        result = tiflash.memory_read(ADDRESS, 4, as_bytes=True,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        assert isinstance(result, bytes)
+        assert len(result) == 4
+
+    def test_memory_read_word(self, device):
+        """Tests memory read with 32 bit access width"""
+        result = tiflash.memory_read(ADDRESS, 8, width=32,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        assert len(result) == 2
+
+    def test_memory_read_word_as_bytes(self, device):
+        """Tests memory read with 32 bit access width returning array"""
+        result = tiflash.memory_read(ADDRESS, 8, width=32, as_bytes=True,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        assert result.itemsize == 4
+        assert len(result) == 2
+
+    def test_memory_read_word_order(self, device):
+        """Tests a list of 32 bit values and an array of the same region are
+        both in address order"""
+        with tiflash.open_session(serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype']) as session:
+            values = session.memory_read(ADDRESS, 8, width=32)
+            array = session.memory_read(ADDRESS, 8, width=32, as_bytes=True)
+
+        assert values == list(array)
+
+    def test_memory_read_byte_order(self, device):
+        """Tests a list of bytes is in reverse address order of the bytes
+        of the same region"""
+        with tiflash.open_session(serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype']) as session:
+            values = session.memory_read(ADDRESS, 4)
+            raw = session.memory_read(ADDRESS, 4, as_bytes=True)
+
+        assert values == list(bytearray(raw))[::-1]
+
+    def test_memory_read_hex_num_bytes(self, device):
+        """Tests memory read with number of bytes given as hex string"""
+        result = tiflash.memory_read(ADDRESS, '0x8', width=32,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        assert len(result) == 2
+
+    def test_memory_read_invalid_num_bytes(self, device):
+        """Tests an Error is raised when num bytes is not a number"""
+        with pytest.raises(tiflash.TIFlashError):
+            tiflash.memory_read(ADDRESS, 'four',
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+    def test_memory_read_invalid_width(self, device):
+        """Tests an Error is raised when num bytes is not a multiple of the
+        access width"""
+        with pytest.raises(tiflash.TIFlashError):
+            tiflash.memory_read(ADDRESS, 3, width=16,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
     def test_basic_memory_read_and_check_byte_values(self, device):
         """Tests memory read and checks for correct byte values. This test is
         device specific."""
@@ -47,6 +125,79 @@ class TestMemoryApi():
         assert len(result) == len(answer)
         assert result == answer
 
+    def test_memory_read_many(self, device):
+        """Tests reading many regions in a single session"""
+        regions = [(ADDRESS, 4), (ADDRESS + 4, 2), (0x20000000, 8, 0)]
+        result = tiflash.memory_read_many(regions,
+                                          serno=device['serno'],
+                                          connection=device['connection'],
+                                          devicetype=device['devicetype'])
+
+        assert sorted(result.keys()) == sorted([r[0] for r in regions])
+        for region in regions:
+            assert len(result[region[0]]) == region[1]
+
+    def test_invalid_address_memory_read_many(self, device):
+        """Tests an Error is raised when a region can not be read"""
+        regions = [(ADDRESS, 4), (0xFFFFFFFF, 4)]
+
+        with pytest.raises(tiflash.TIFlashError):
+            tiflash.memory_read_many(regions,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+    def test_duplicate_address_memory_read_many(self, device):
+        """Tests an Error is raised when two regions start at the same
+        address"""
+        regions = [(ADDRESS, 4), (ADDRESS, 64)]
+
+        with pytest.raises(tiflash.TIFlashError):
+            tiflash.memory_read_many(regions,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+    def test_memory_watch(self, device):
+        """Tests sampling memory periodically on a single session"""
+        samples = list(tiflash.memory_watch(ADDRESS, 4, interval=0.1, count=3,
+                                            serno=device['serno'],
+                                            connection=device['connection'],
+                                            devicetype=device['devicetype']))
+
+        assert len(samples) == 3
+        assert samples[0][0] < samples[1][0] < samples[2][0]
+        assert all(len(values) == 4 for (timestamp, values) in samples)
+
+    def test_memory_dump(self, device, tmpdir):
+        """Tests memory dump writes all bytes and their SHA-256"""
+        NUM_BYTES = 16
+        out_path = str(tmpdir.join("dump.bin"))
+        digest = tiflash.memory_dump(ADDRESS, NUM_BYTES, out_path,
+                            sha256=True,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        with open(out_path, 'rb') as f:
+            data = f.read()
+
+        assert len(data) == NUM_BYTES
+        assert digest == hashlib.sha256(data).hexdigest()
+
+    def test_invalid_address_memory_dump(self, device, tmpdir):
+        """Tests an Error is raised when trying to access invalid memory for
+        memory dump"""
+        INVALID_ADDRESS = 0xFFFFFFFF
+        NUM_BYTES = 4
+
+        with pytest.raises(tiflash.TIFlashError):
+            tiflash.memory_dump(INVALID_ADDRESS, NUM_BYTES,
+                            str(tmpdir.join("dump.bin")),
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
 
     def test_basic_memory_write(self, device):
         """Tests simple memory write"""
@@ -57,6 +208,23 @@ class TestMemoryApi():
                         connection=device['connection'],
                         devicetype=device['devicetype'])
 
+    def test_memory_write_word(self, device):
+        """Tests memory write with 32 bit access width"""
+        WRITE_ADDRESS = 0x20000000
+        WRITE_DATA = [0x11223344, 0x55667788]
+        tiflash.memory_write(WRITE_ADDRESS, WRITE_DATA, width=32,
+                        serno=device['serno'],
+                        connection=device['connection'],
+                        devicetype=device['devicetype'])
+
+        result = tiflash.memory_read(WRITE_ADDRESS, 8, width=32,
+                            as_bytes=True,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        assert list(result) == WRITE_DATA
+
 
     def test_invalid_address_memory_read(self, device):
         """Tests an Error is raised when trying to access invalid memory for
@@ -0,0 +1,50 @@
+import pytest
+
+import tiflash
+
+ADDRESS = 0x500012F0
+
+
+@pytest.mark.usefixtures("device")
+class TestPipelineApi():
+
+    def test_basic_pipeline(self, device):
+        """Tests erase, flash, verify, reset and memory read in one run"""
+        steps = [{'command': 'erase'},
+                 {'command': 'flash', 'image': device['image']},
+                 {'command': 'verify', 'image': device['image']},
+                 {'command': 'reset'},
+                 {'command': 'memory_read', 'address': ADDRESS,
+                     'num_bytes': 4}]
+
+        results = tiflash.run_pipeline(steps, serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        assert len(results) == len(steps)
+        assert all([r['success'] for r in results])
+        assert [r['command'] for r in results] == \
+            ['erase', 'flash', 'verify', 'reset', 'memory_read']
+        assert len(results[4]['result']) == 4
+
+    def test_pipeline_stops_on_failure(self, device):
+        """Tests pipeline stops running steps after first failed step"""
+        INVALID_REGNAME = "INVALIDREGNAME"
+        steps = [{'command': 'register_read', 'regname': INVALID_REGNAME},
+                 {'command': 'reset'}]
+
+        results = tiflash.run_pipeline(steps, serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+        assert results[0]['success'] is False
+        assert results[0]['error'] is not None
+        assert results[1]['success'] is False
+
+    def test_invalid_pipeline_command(self, device):
+        """Tests an Error is raised for an unknown pipeline command"""
+        with pytest.raises(tiflash.TIFlashError):
+            tiflash.run_pipeline([{'command': 'invalid'}],
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
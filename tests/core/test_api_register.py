@@ -27,6 +27,39 @@ class TestRegisterApi():
                         connection=device['connection'],
                         devicetype=device['devicetype'])
 
+    def test_register_read_many(self, device):
+        """Tests reading many registers in a single session"""
+        REGNAMES = ["PC", "SP", "R1"]
+
+        result = tiflash.register_read_many(REGNAMES,
+                                            serno=device['serno'],
+                                            connection=device['connection'],
+                                            devicetype=device['devicetype'])
+
+        assert sorted(result.keys()) == sorted(REGNAMES)
+        assert all(type(v) is int for v in result.values())
+
+    def test_register_snapshot_and_write_many(self, device):
+        """Tests writing registers and comparing snapshots"""
+        before = tiflash.register_snapshot(
+            serno=device['serno'],
+            connection=device['connection'],
+            devicetype=device['devicetype'])
+
+        assert "PC" in before
+
+        tiflash.register_write_many({"R1": 0xBEEF, "R2": 0xCAFE},
+                                    serno=device['serno'],
+                                    connection=device['connection'],
+                                    devicetype=device['devicetype'])
+
+        after = tiflash.register_snapshot(["R1", "R2"],
+                                          serno=device['serno'],
+                                          connection=device['connection'],
+                                          devicetype=device['devicetype'])
+
+        assert after == {"R1": 0xBEEF, "R2": 0xCAFE}
+
 
     def test_invalid_register_read(self, device):
         """Tests an Error is raised when trying to access invalid register for
@@ -51,3 +84,35 @@ class TestRegisterApi():
                             serno=device['serno'],
                             connection=device['connection'],
                             devicetype=device['devicetype'])
+
+    def test_invalid_register_read_many(self, device):
+        """Tests an Error is raised when one of the registers is invalid"""
+        REGNAMES = ["PC", "INVALIDREGNAME"]
+
+        with pytest.raises(tiflash.TIFlashError):
+            tiflash.register_read_many(REGNAMES,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+    def test_invalid_register_snapshot(self, device):
+        """Tests an Error is raised when none of the snapshot's registers
+        exist (instead of returning an empty snapshot)"""
+        REGNAMES = ["INVALIDREGNAME", "INVALIDPC"]
+
+        with pytest.raises(tiflash.TIFlashError):
+            tiflash.register_snapshot(REGNAMES,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+
+
+def test_register_diff():
+    """Tests comparing register snapshots"""
+    before = {"PC": 0x100, "SP": 0x2000, "R0": 1}
+    after = {"PC": 0x104, "SP": 0x2000, "R1": 2}
+
+    assert tiflash.register_diff(before, after) == {"PC": (0x100, 0x104),
+                                                    "R0": (1, None),
+                                                    "R1": (None, 2)}
+    assert tiflash.register_diff(after, after) == {}
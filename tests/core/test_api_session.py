@@ -0,0 +1,53 @@
+import pytest
+
+import tiflash
+
+ADDRESS = 0x500012F0
+
+
+@pytest.mark.usefixtures("device")
+class TestSessionApi():
+
+    def test_basic_session(self, device):
+        """Tests running multiple commands on an open session"""
+        with tiflash.open_session(serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype']) as session:
+            assert session.is_open() is True
+
+            assert session.reset() is True
+            assert len(session.memory_read(ADDRESS, 4)) == 4
+            assert type(session.register_read("PC")) is int
+
+        assert session.is_open() is False
+
+    def test_session_error_keeps_session_open(self, device):
+        """Tests a failed command does not close the session"""
+        INVALID_REGNAME = "INVALIDREGNAME"
+
+        with tiflash.open_session(serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype']) as session:
+            with pytest.raises(tiflash.TIFlashError):
+                session.register_read(INVALID_REGNAME)
+
+            assert session.reset() is True
+
+    def test_closed_session(self, device):
+        """Tests an Error is raised when using a closed session"""
+        session = tiflash.open_session(serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
+        session.close()
+
+        with pytest.raises(tiflash.TIFlashError):
+            session.reset()
+
+    def test_session_invalid_args(self, device):
+        """Tests an Error is raised when passing session args that have no
+        effect on an open session"""
+        with pytest.raises(tiflash.TIFlashError):
+            tiflash.open_session(attach=True,
+                            serno=device['serno'],
+                            connection=device['connection'],
+                            devicetype=device['devicetype'])
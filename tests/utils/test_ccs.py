@@ -1,5 +1,6 @@
 import os
 import pytest
+from tiflash.utils import ccs
 from tiflash.utils.ccs import FindCCSError, find_ccs, get_workspace_dir, get_ccs_version
 
 class TestCCS():
@@ -66,3 +67,82 @@ class TestCCS():
         os.environ['CCS_PREFIX'] = "/nonexistant/path/to/ccs"
         with pytest.raises(Exception):
             ccs_path = find_ccs()
+
+
+def make_ccs_install(ccs_prefix, name, version):
+    """Creates a (minimal) fake ccs installation in ccs_prefix"""
+    ccs_root = ccs_prefix.mkdir(name).mkdir("ccs")
+    eclipse = ccs_root.mkdir("eclipse")
+    ccs_root.mkdir("ccs_base")
+    eclipse.join("ccstudio").write("")
+    eclipse.join("eclipsec.exe").write("")
+    eclipse.join("ccs.properties").write("ccs_buildid=%s\nPF_FILTERS=arm\n"
+                                         % version)
+    return str(ccs_root)
+
+
+class TestCCSIndex():
+    """Test suite for the ccs installation index"""
+
+    def test_ccs_index_is_reused(self, tmpdir, monkeypatch):
+        ccs_prefix = tmpdir.mkdir("ti")
+        index_path = str(tmpdir.join("ccs-index.json"))
+        make_ccs_install(ccs_prefix, "ccs1000", "10.0.0.00010")
+
+        installs = ccs.get_ccs_index(str(ccs_prefix), index_path=index_path)
+        assert [i['version'] for i in installs] == ["10.0.0.00010"]
+        assert installs[0]['pf_filters'] == ["arm"]
+        assert os.path.exists(index_path)
+
+        # Index file is used (no search) when nothing changed
+        ccs.clear_ccs_index(index_path)
+        monkeypatch.setattr(ccs, "get_ccs_installations", None)
+        assert ccs.get_ccs_index(str(ccs_prefix),
+                                 index_path=index_path) == installs
+
+    def test_ccs_index_detects_new_install(self, tmpdir):
+        ccs_prefix = tmpdir.mkdir("ti")
+        index_path = str(tmpdir.join("ccs-index.json"))
+        make_ccs_install(ccs_prefix, "ccs1000", "10.0.0.00010")
+        ccs.get_ccs_index(str(ccs_prefix), index_path=index_path)
+
+        make_ccs_install(ccs_prefix, "ccs1100", "11.0.0.00011")
+        ccs.clear_ccs_index(index_path)
+
+        installs = ccs.get_ccs_index(str(ccs_prefix), index_path=index_path)
+        assert sorted(i['version'] for i in installs) == ["10.0.0.00010",
+                                                          "11.0.0.00011"]
+
+    def test_find_ccs_with_index(self, tmpdir, monkeypatch):
+        ccs_prefix = tmpdir.mkdir("ti")
+        monkeypatch.setattr(ccs, "CCS_INDEX_PATH",
+                            str(tmpdir.join("ccs-index.json")))
+        old_path = make_ccs_install(ccs_prefix, "ccs1000", "10.0.0.00010")
+        new_path = make_ccs_install(ccs_prefix, "ccs1100", "11.0.0.00011")
+
+        assert find_ccs(ccs_prefix=str(ccs_prefix)) == new_path
+        assert find_ccs(version="10", ccs_prefix=str(ccs_prefix)) == old_path
+        with pytest.raises(FindCCSError):
+            find_ccs(version="9", ccs_prefix=str(ccs_prefix))
+
+        ccs.clear_ccs_index(remove=True)
+
+    def test_get_ccs_installation(self, tmpdir, monkeypatch):
+        ccs_prefix = tmpdir.mkdir("ti")
+        monkeypatch.setattr(ccs, "CCS_INDEX_PATH",
+                            str(tmpdir.join("ccs-index.json")))
+        ccs_path = make_ccs_install(ccs_prefix, "ccs1000", "10.0.0.00010")
+        other_path = make_ccs_install(tmpdir, "custom", "11.0.0.00011")
+
+        # Installation not indexed yet is indexed on its own
+        installation = ccs.get_ccs_installation(other_path)
+        assert installation['version'] == "11.0.0.00011"
+
+        # Installation found by find_ccs() is not parsed again
+        assert find_ccs(ccs_prefix=str(ccs_prefix)) == ccs_path
+        monkeypatch.setattr(ccs, "get_ccs_pf_filters", None)
+        installation = ccs.get_ccs_installation(ccs_path)
+        assert installation['version'] == "10.0.0.00010"
+        assert installation['pf_filters'] == ["arm"]
+
+        ccs.clear_ccs_index(remove=True)
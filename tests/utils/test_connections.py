@@ -1,6 +1,9 @@
 import os
+import pytest
 
 from tiflash.utils import connections
+from tiflash.utils import targetdb
+from tiflash.utils import xmlhelper
 
 
 class TestConnections():
@@ -26,3 +29,40 @@ class TestConnections():
         result = connections.get_connection_name(connxml)
 
         assert result == expected
+
+
+CONNECTION_XML = """<?xml version="1.0"?>
+<connection id="TIXDS110_Connection"
+            desc="Texas Instruments XDS110 USB Debug Probe">
+</connection>
+"""
+
+
+@pytest.fixture
+def ccs_tree(tmpdir, monkeypatch):
+    """CCS installation with a single connection xml (indexed in tmpdir)"""
+    monkeypatch.setattr(targetdb, 'INDEX_DIR', str(tmpdir.join("index")))
+    ccs_path = tmpdir.mkdir("ccs")
+    ccs_path.join("ccs_base", "common", "targetdb", "connections",
+                  "TIXDS110_Connection.xml").write(CONNECTION_XML,
+                                                   ensure=True)
+
+    yield str(ccs_path)
+
+    targetdb.clear_index(str(tmpdir.join("index")))
+
+
+class TestConnectionsIndex():
+    def test_get_connection_name_uses_index(self, ccs_tree, monkeypatch):
+        """Tests the name of an indexed connection xml is read from the index
+        (without parsing the xml)"""
+        conn_xml = connections.get_connection_xml_path("TIXDS110_Connection",
+                                                       ccs_tree)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("connection xml was parsed")
+        monkeypatch.setattr(xmlhelper, 'get_xml_root_element', fail)
+
+        result = connections.get_connection_name(conn_xml, ccs_tree)
+
+        assert result == "Texas Instruments XDS110 USB Debug Probe"
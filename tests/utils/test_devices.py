@@ -2,6 +2,8 @@ import os
 import pytest
 
 from tiflash.utils import devices
+from tiflash.utils import targetdb
+from tiflash.utils import xmlhelper
 
 
 class TestDevices():
@@ -71,3 +73,52 @@ class TestDevices():
         result = devices.get_device_from_serno(serno, t_env['CCS_PATH'])
 
         assert result == expected
+
+
+DEVICE_XML = """<?xml version="1.0"?>
+<device id="CC1350F128" partnum="CC1350F128" desc="CC1350F128">
+    <instance xml="cortex_m3.xml" xmlpath="cpus"/>
+    <cpu id="Cortex_M3_0" desc="Cortex_M3_0"/>
+    <property id="DefaultConnection" Value="TIXDS110_Connection.xml"/>
+</device>
+"""
+
+
+@pytest.fixture
+def ccs_tree(tmpdir, monkeypatch):
+    """CCS installation with a single device xml (indexed in tmpdir)"""
+    monkeypatch.setattr(targetdb, 'INDEX_DIR', str(tmpdir.join("index")))
+    ccs_path = tmpdir.mkdir("ccs")
+    targetdb_dir = ccs_path.join("ccs_base", "common", "targetdb")
+    device_xml = targetdb_dir.join("devices", "cc1350f128.xml")
+    device_xml.write(DEVICE_XML, ensure=True)
+    targetdb_dir.mkdir("connections")
+
+    yield str(ccs_path)
+
+    targetdb.clear_index(str(tmpdir.join("index")))
+
+
+class TestDevicesIndex():
+    def test_lookups_use_index(self, ccs_tree, monkeypatch):
+        """Tests devicetype, cpu and default connection of an indexed device
+        xml are read from the index (without parsing the xml)"""
+        device_xml = devices.get_device_xml_from_devicetype("CC1350F128",
+                                                            ccs_tree)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("device xml was parsed")
+        monkeypatch.setattr(xmlhelper, 'find_elements', fail)
+
+        assert devices.get_devicetype(device_xml, ccs_tree) == "CC1350F128"
+        assert devices.get_cpu(device_xml, ccs_tree) == "Cortex_M3"
+        assert devices.get_default_connection_xml(device_xml, ccs_tree) == \
+            os.path.normpath(ccs_tree + "/ccs_base/common/targetdb/"
+                             "connections/TIXDS110_Connection.xml")
+
+    def test_lookups_of_xml_not_indexed(self, ccs_tree, tmpdir):
+        """Tests a device xml outside of the ccs installation is parsed"""
+        device_xml = tmpdir.join("custom.xml")
+        device_xml.write(DEVICE_XML)
+
+        assert devices.get_cpu(str(device_xml), ccs_tree) == "Cortex_M3"
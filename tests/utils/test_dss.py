@@ -1,9 +1,25 @@
 import os
+import sys
+import json
 import platform
+import subprocess
+import time
 import pytest
 
 from tiflash.utils import dss
 
+FAKE_LAUNCHER = """#!%s
+import socket, struct, sys, time
+port = int(sys.argv[-1].split(" ")[2])
+s = socket.create_connection(("localhost", port))
+for i in range(%d):     # each 'DSS call' of the command
+    time.sleep(%s)
+result = b'{"version": 1, "status": "ok", "type": "none", "value": null, ' \\
+    b'"error": null, "timings": {}}'
+s.sendall(b"R" + struct.pack(">I", len(result)) + result)
+s.close()
+"""
+
 
 if platform.system() == 'Windows':
     eclipsec = 'eclipsec.exe'
@@ -23,11 +39,147 @@ class TestDSS():
 
         assert result == expected
 
+    def test_find_dss_canonical_path(self, tmpdir):
+        """Tests the launcher is found at its canonical path (and
+        remembered)"""
+        ccs_path = str(tmpdir)
+        launcher = tmpdir.join("eclipse", eclipsec)
+        launcher.ensure()
+
+        result = dss.find_dss(ccs_path)
+        assert result == os.path.normpath(str(launcher))
+
+        launcher.remove()
+        assert dss.find_dss(ccs_path) == result
+
+    def test_find_dss_search(self, tmpdir):
+        """Tests the launcher is searched for when not at its canonical
+        path"""
+        launcher_name = os.path.basename(eclipsec)
+        launcher = tmpdir.join("eclipse", "bin", launcher_name)
+        launcher.ensure()
+        tmpdir.join("eclipse", "a", "b", "c", "d", "e", launcher_name).ensure()
+
+        result = dss.find_dss(str(tmpdir))
+        assert result == os.path.normpath(str(launcher))
+
+        too_deep = tmpdir.mkdir("deep")
+        too_deep.join("eclipse", "a", "b", "c", "d", "e",
+                      launcher_name).ensure()
+        with pytest.raises(dss.DSSError):
+            dss.find_dss(str(too_deep))
+
     def test_call_dss(self, t_env):
         expected = (True, '')
         dss_path = os.path.normpath(t_env['CCS_PATH'] +
                                     "/eclipse/" + eclipsec)
 
-        result = dss.call_dss(dss_path, [], timeout=60)
+        (code, envelope) = dss.call_dss(dss_path, [], timeout=60)
+        result = dss.decode_result(code, envelope)[:2]
+
+        assert result == expected
+
+    def test_decode_result(self):
+        envelope = ('{"version": 1, "status": "ok", "type": "list", '
+                    '"value": [1, 2, 255], "error": null, "timings": {}}')
+
+        (code, value, decoded) = dss.decode_result(True, envelope)
+
+        assert code is True
+        assert value == [1, 2, 255]
+        assert decoded['type'] == "list"
+
+    def test_decode_result_error(self):
+        envelope = ('{"version": 1, "status": "error", "type": "none", '
+                    '"value": null, "error": "Could not connect", '
+                    '"timings": {}}')
+
+        (code, value, decoded) = dss.decode_result(True, envelope)
+
+        assert code is False
+        assert value == "Could not connect"
+
+    def test_decode_result_not_envelope(self):
+        expected = (False, "Command Failed", None)
+
+        result = dss.decode_result(False, "Command Failed")
 
         assert result == expected
+
+    def test_decode_result_unsupported_version(self):
+        envelope = '{"version": 99, "status": "ok", "value": null}'
+
+        with pytest.raises(dss.DSSError):
+            dss.decode_result(True, envelope)
+
+    def test_prepare_commands(self):
+        commands = ["--memory", "-write", "-hex", "00"]
+
+        assert dss.prepare_commands(commands) == (commands, None)
+
+    def test_prepare_commands_args_file(self):
+        """Tests commands too large for the command line are passed in an
+        args file"""
+        commands = ["--memory", "-write", "-hex", "ff" * dss.MAX_CMDLINE_ARGS]
+
+        (script_commands, args_file) = dss.prepare_commands(commands)
+        try:
+            assert script_commands == ["--argsfile", "\"%s\"" % args_file]
+            with open(args_file) as f:
+                assert json.load(f) == commands
+        finally:
+            dss.remove_args_file(args_file)
+
+        assert not os.path.exists(args_file)
+
+    @pytest.mark.skipif(platform.system() == 'Windows',
+                        reason="Uses POSIX shell")
+    def test_kill_process_tree(self):
+        """Tests children of the dss process are killed with it"""
+        proc = subprocess.Popen(["sh", "-c", "sleep 100 & echo $!; wait"],
+                                stdout=subprocess.PIPE,
+                                **dss.new_process_group_kwargs())
+        child_pid = int(proc.stdout.readline())
+
+        dss.kill_process_tree(proc)
+
+        assert proc.poll() is not None
+        # Child may briefly remain a zombie until reaped
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            try:
+                os.kill(child_pid, 0)
+            except OSError:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("Child process was not killed")
+        proc.stdout.close()
+
+    @pytest.mark.skipif(platform.system() == 'Windows',
+                        reason="Uses POSIX launcher script")
+    def test_call_dss_timeout(self, tmpdir):
+        """Tests timeout is used as the deadline when no deadline is given"""
+        launcher = tmpdir.join("ccstudio")
+        launcher.write(FAKE_LAUNCHER % (sys.executable, 1, 30))
+        launcher.chmod(0o755)
+
+        start = time.time()
+        with pytest.raises(dss.DSSTimeoutError):
+            dss.call_dss(str(launcher), [], timeout=0.5)
+
+        assert time.time() - start < 10
+
+    @pytest.mark.skipif(platform.system() == 'Windows',
+                        reason="Uses POSIX launcher script")
+    def test_call_dss_deadline(self, tmpdir):
+        """Tests a command is killed when it exceeds its deadline"""
+        launcher = tmpdir.join("ccstudio")
+        launcher.write(FAKE_LAUNCHER % (sys.executable, 1, 30))
+        launcher.chmod(0o755)
+
+        start = time.time()
+        with pytest.raises(dss.DSSTimeoutError):
+            dss.call_dss(str(launcher), [], deadline=0.5)
+
+        assert time.time() - start < 10
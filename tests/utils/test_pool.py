@@ -0,0 +1,43 @@
+import os
+import platform
+import pytest
+
+from tiflash.utils import dss
+from tiflash.utils.pool import DSSWorkerPool, DSSWorkerPoolError
+
+
+if platform.system() == 'Windows':
+    eclipsec = 'eclipsec.exe'
+elif platform.system() == 'Darwin':
+    eclipsec = "Ccstudio.app/Contents/MacOS/ccstudio"
+else:
+    eclipsec = 'ccstudio'
+
+
+class TestDSSWorkerPool():
+
+    def test_pool_run_multiple_commands(self, t_env):
+        expected = (True, '')
+        dss_path = os.path.normpath(t_env['CCS_PATH'] + "/eclipse/" + eclipsec)
+
+        with DSSWorkerPool(dss_path, size=2) as pool:
+            for i in range(3):
+                (code, envelope) = pool.run([], deadline=60)
+                result = dss.decode_result(code, envelope)[:2]
+
+                assert result == expected
+
+    def test_pool_keeps_idle_workers(self, t_env):
+        dss_path = os.path.normpath(t_env['CCS_PATH'] + "/eclipse/" + eclipsec)
+
+        with DSSWorkerPool(dss_path, size=2) as pool:
+            worker = pool.acquire(timeout=120)
+            assert worker.is_alive() is True
+
+            pool.release(worker)
+            assert pool.get_stats()['busy'] == 0
+
+    def test_pool_invalid_dss_path(self, t_env):
+        with DSSWorkerPool("/invalid/dss/path", size=1) as pool:
+            with pytest.raises(DSSWorkerPoolError):
+                pool.run([], deadline=10)
@@ -0,0 +1,135 @@
+import io
+import json
+import socket
+import struct
+import time
+
+import pytest
+
+from tiflash.utils.result import ResultServer, ResultServerError, recv_frame, \
+    FRAME_DATA, FRAME_PROGRESS, FRAME_RESULT
+
+
+def send_frame(sock, kind, data):
+    """Helper function for sending a frame like js/result.js"""
+    if not isinstance(data, bytes):
+        data = data.encode("utf-8")
+    sock.sendall(kind + struct.pack(">I", len(data)) + data)
+
+
+def post_result(port, result, data=None):
+    """Helper function for posting a result like js/result.js"""
+    s = socket.create_connection(("localhost", port))
+    if data is not None:
+        send_frame(s, FRAME_DATA, data)
+    send_frame(s, FRAME_RESULT, result + "\n")
+    s.close()
+
+
+class TestResultServer():
+
+    def test_get_result(self):
+        server = ResultServer()
+        port = server.start()
+
+        post_result(port, "result")
+
+        assert server.get_result(timeout=5) == "result"
+
+    def test_result_time(self):
+        server = ResultServer()
+        port = server.start()
+        start = time.time()
+
+        post_result(port, "result")
+
+        assert server.get_result(timeout=5) == "result"
+        assert start <= server.result_time <= time.time()
+
+    def test_many_result_servers(self):
+        """Tests more result servers than the old fixed port range (24) can
+        run at once"""
+        servers = [ResultServer() for i in range(48)]
+        ports = [s.start() for s in servers]
+
+        assert len(set(ports)) == len(servers)
+
+        for i, port in enumerate(ports):
+            post_result(port, str(i))
+
+        for i, server in enumerate(servers):
+            assert server.get_result(timeout=5) == str(i)
+
+    def test_large_multibyte_result(self):
+        """Tests a result larger than a single recv containing multi-byte
+        characters"""
+        expected = u"\u00e9\u6f22" * 100000
+        server = ResultServer()
+        port = server.start()
+
+        post_result(port, expected)
+
+        assert server.get_result(timeout=5) == expected
+
+    def test_data_frames_to_sink(self):
+        data = b"\x00\xff" * 100000
+        sink = io.BytesIO()
+        server = ResultServer(sink=sink)
+        port = server.start()
+
+        post_result(port, "done", data=data)
+
+        assert server.get_result(timeout=5) == "done"
+        assert sink.getvalue() == data
+
+    def test_progress_frames_to_callback(self):
+        events = list()
+        server = ResultServer(progress=events.append)
+        port = server.start()
+
+        s = socket.create_connection(("localhost", port))
+        for status in ("start", "done"):
+            send_frame(s, FRAME_PROGRESS, json.dumps({
+                'phase': "flash", 'status': status, 'done': 0, 'total': 0,
+                'elapsed': 0.0}))
+        send_frame(s, FRAME_RESULT, "done")
+        s.close()
+
+        assert server.get_result(timeout=5) == "done"
+        assert [e['status'] for e in events] == ["start", "done"]
+
+    def test_stop_without_result(self):
+        server = ResultServer(timeout=None)
+        server.start()
+
+        server.stop()
+
+        assert server.get_result(timeout=5) is None
+        assert server.done() is True
+
+    def test_timeout_without_result(self):
+        server = ResultServer(timeout=0.5)
+        server.start()
+
+        start = time.time()
+        assert server.get_result(timeout=5) is None
+        assert time.time() - start < 5
+
+
+class TestRecvFrame():
+
+    def test_closed_before_frame(self):
+        a, b = socket.socketpair()
+        b.close()
+
+        assert recv_frame(a) == (None, None)
+        a.close()
+
+    def test_closed_mid_frame(self):
+        a, b = socket.socketpair()
+        b.sendall(FRAME_RESULT + struct.pack(">I", 10) + b"abc")
+        b.close()
+
+        with pytest.raises(ResultServerError):
+            recv_frame(a)
+        a.close()
@@ -0,0 +1,108 @@
+import os
+import pytest
+
+from tiflash.utils import targetdb
+
+
+def parse_name(xml_path):
+    """Test parse function (counts xml files parsed)"""
+    parse_name.parsed.append(os.path.basename(xml_path))
+    with open(xml_path) as f:
+        name = f.read()
+    if not name:
+        raise ValueError("Not a valid xml file")
+    return {'name': name, 'family': name[:3]}
+
+
+@pytest.fixture
+def xml_dir(tmpdir):
+    """Directory of (fake) xml files and index directory"""
+    xml_dir = tmpdir.mkdir("xmls")
+    xml_dir.join("a.xml").write("MSP430")
+    xml_dir.join("b.xml").write("MSP432")
+    xml_dir.join("c.xml").write("")
+    xml_dir.join("readme.txt").write("not indexed")
+    parse_name.parsed = list()
+
+    yield (str(xml_dir), str(tmpdir.join("index")))
+
+    targetdb.clear_index(str(tmpdir.join("index")))
+
+
+class TestTargetDB():
+
+    def test_index_lookups(self, xml_dir):
+        (directory, index_dir) = xml_dir
+        index = targetdb.get_index(directory, parse_name, "test",
+                                   index_dir=index_dir)
+
+        assert index.xml_names() == ["a.xml", "b.xml"]
+        assert index.values('name') == ["MSP430", "MSP432"]
+        assert index.find_one('name', "MSP432") == "b.xml"
+        assert index.find('family', "MSP") == ["a.xml", "b.xml"]
+        assert index.find_one('name', "CC2640") is None
+        assert index.path("c.xml") == os.path.join(directory, "c.xml")
+        assert index.path("d.xml") is None
+
+    def test_index_is_reused(self, xml_dir):
+        (directory, index_dir) = xml_dir
+        targetdb.get_index(directory, parse_name, "test", index_dir=index_dir)
+        assert sorted(parse_name.parsed) == ["a.xml", "b.xml", "c.xml"]
+
+        # In-process memo and index file are reused (nothing parsed)
+        parse_name.parsed = list()
+        targetdb.get_index(directory, parse_name, "test", index_dir=index_dir)
+        targetdb.clear_index(index_dir)
+        index = targetdb.get_index(directory, parse_name, "test",
+                                   index_dir=index_dir)
+
+        assert parse_name.parsed == []
+        assert index.values('name') == ["MSP430", "MSP432"]
+
+    def test_index_incremental_refresh(self, xml_dir):
+        (directory, index_dir) = xml_dir
+        targetdb.get_index(directory, parse_name, "test", index_dir=index_dir)
+
+        # Install new xml file (only new file is parsed)
+        parse_name.parsed = list()
+        with open(os.path.join(directory, "d.xml"), 'w') as f:
+            f.write("CC2640")
+        os.utime(directory, (0, 0))     # ensure directory mtime changed
+        index = targetdb.get_index(directory, parse_name, "test",
+                                   index_dir=index_dir)
+
+        assert parse_name.parsed == ["d.xml"]
+        assert index.find_one('name', "CC2640") == "d.xml"
+
+    def test_index_refresh_rewritten_xml(self, xml_dir):
+        (directory, index_dir) = xml_dir
+        targetdb.get_index(directory, parse_name, "test", index_dir=index_dir)
+
+        # Rewrite xml file in place (directory mtime does not change)
+        dir_stat = os.stat(directory)
+        with open(os.path.join(directory, "a.xml"), 'w') as f:
+            f.write("MSP430FR")
+        os.utime(directory, (dir_stat.st_atime, dir_stat.st_mtime))
+
+        parse_name.parsed = list()
+        targetdb.clear_index(index_dir)
+        index = targetdb.get_index(directory, parse_name, "test",
+                                   index_dir=index_dir)
+
+        assert parse_name.parsed == ["a.xml"]
+        assert index.values('name') == ["MSP430FR", "MSP432"]
+
+    def test_index_parallel_build(self, xml_dir, monkeypatch):
+        (directory, index_dir) = xml_dir
+        monkeypatch.setattr(targetdb, "PARALLEL_MIN_FILES", 1)
+        monkeypatch.setattr(targetdb, "CHUNK_SIZE", 1)
+        events = list()
+        index = targetdb.get_index(directory, parse_name, "test",
+                                   index_dir=index_dir, progress=events.append,
+                                   processes=2)
+
+        assert index.values('name') == ["MSP430", "MSP432"]
+        assert index.record("c.xml") is None
+        assert [e['status'] for e in events] == \
+            ["start", "running", "running", "running", "done"]
+        assert events[-1]['done'] == events[-1]['total'] == 3
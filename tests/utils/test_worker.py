@@ -0,0 +1,41 @@
+import os
+import platform
+import pytest
+
+from tiflash.utils import dss
+from tiflash.utils.worker import DSSWorker, DSSWorkerError
+
+
+if platform.system() == 'Windows':
+    eclipsec = 'eclipsec.exe'
+elif platform.system() == 'Darwin':
+    eclipsec = "Ccstudio.app/Contents/MacOS/ccstudio"
+else:
+    eclipsec = 'ccstudio'
+
+
+class TestDSSWorker():
+
+    def test_worker_run_multiple_commands(self, t_env):
+        expected = (True, '')
+        dss_path = os.path.normpath(t_env['CCS_PATH'] + "/eclipse/" + eclipsec)
+
+        with DSSWorker(dss_path) as worker:
+            for i in range(3):
+                (code, envelope) = worker.run([], deadline=60)
+                result = dss.decode_result(code, envelope)[:2]
+
+                assert result == expected
+
+    def test_worker_stop(self, t_env):
+        dss_path = os.path.normpath(t_env['CCS_PATH'] + "/eclipse/" + eclipsec)
+
+        worker = DSSWorker(dss_path)
+        worker.start()
+        assert worker.is_alive() is True
+
+        worker.stop()
+        assert worker.is_alive() is False
+
+        with pytest.raises(DSSWorkerError):
+            worker.run([])
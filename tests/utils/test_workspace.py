@@ -0,0 +1,50 @@
+import os
+
+from tiflash.utils.workspace import allocate_workspace, cleanup_workspaces
+
+
+class TestWorkspace():
+    """Test suite for testing workspace allocation"""
+
+    def test_allocate_unique_workspaces(self, tmpdir):
+        root = str(tmpdir)
+
+        ws1 = allocate_workspace(root=root)
+        ws2 = allocate_workspace(root=root)
+
+        assert ws1.path != ws2.path
+        assert os.path.isdir(ws1.path)
+        assert os.path.isdir(ws2.path)
+
+        ws1.release()
+        ws2.release()
+
+    def test_reuse_released_workspace(self, tmpdir):
+        root = str(tmpdir)
+
+        with allocate_workspace(root=root) as ws:
+            path = ws.path
+
+        with allocate_workspace(root=root) as ws:
+            assert ws.path == path
+
+    def test_named_workspace(self, tmpdir):
+        root = str(tmpdir)
+
+        with allocate_workspace(name="L1000000", root=root) as ws:
+            assert os.path.basename(ws.path).startswith("L1000000")
+
+    def test_cleanup_workspaces(self, tmpdir):
+        root = str(tmpdir)
+
+        in_use = allocate_workspace(root=root)
+        with allocate_workspace(root=root) as ws:
+            unused_path = ws.path
+
+        removed = cleanup_workspaces(root=root)
+
+        assert unused_path in removed
+        assert in_use.path not in removed
+        assert os.path.isdir(in_use.path)
+
+        in_use.release()
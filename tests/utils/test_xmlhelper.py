@@ -0,0 +1,67 @@
+import pytest
+
+from tiflash.utils import xmlhelper
+
+DEVICE_XML = """<?xml version="1.0"?>
+<device id="MSP432P401R" partnum="MSP432P401R">
+  <instance href="connections/TIXDS110_Connection.xml" id="Connection"/>
+  <cpu id="CORTEX_M4_0" isa="CORTEX_M4">
+    <property id="ResetOnConnect" Type="choicelist"/>
+  </cpu>
+  <property id="DefaultConnection" Value="TIXDS110_Connection"/>
+  <property id="Other" Value="x"/>
+</device>
+"""
+
+
+@pytest.fixture
+def device_xml(tmpdir):
+    """Path to (fake) device xml file"""
+    xml = tmpdir.join("device.xml")
+    xml.write(DEVICE_XML)
+
+    return str(xml)
+
+
+class TestXMLHelper():
+
+    def test_find_elements(self, device_xml):
+        """Tests finding elements returns complete elements and root"""
+        (root, found) = xmlhelper.find_elements(device_xml, {
+            'cpu': ('cpu', None),
+            'connection': ('property', {'id': 'DefaultConnection'}),
+            'missing': ('property', {'id': 'Missing'})})
+
+        assert root.get('partnum') == "MSP432P401R"
+        assert found['cpu'].get('isa') == "CORTEX_M4"
+        assert found['cpu'].find('property').get('id') == "ResetOnConnect"
+        assert found['connection'].get('Value') == "TIXDS110_Connection"
+        assert 'missing' not in found
+
+    def test_find_element(self, device_xml):
+        """Tests finding a single element"""
+        element = xmlhelper.find_element(device_xml, 'property',
+                                         {'id': 'Other'})
+
+        assert element.get('Value') == "x"
+        assert xmlhelper.find_element(device_xml, 'board') is None
+
+    def test_get_xml_root_element(self, device_xml):
+        """Tests root element has attributes but no children"""
+        root = xmlhelper.get_xml_root_element(device_xml)
+
+        assert root.tag == "device"
+        assert root.get('id') == "MSP432P401R"
+        assert len(root) == 0
+
+    def test_iter_elements(self, device_xml):
+        """Tests iterating elements with tag (nested ones included)"""
+        ids = [e.get('id') for e in
+               xmlhelper.iter_elements(device_xml, 'property')]
+
+        assert ids == ["ResetOnConnect", "DefaultConnection", "Other"]
+
+    def test_missing_xml(self, tmpdir):
+        """Tests an Error is raised for a missing xml file"""
+        with pytest.raises(xmlhelper.XMLHelperError):
+            xmlhelper.find_element(str(tmpdir.join("missing.xml")), 'cpu')
@@ -14,19 +14,34 @@ from tiflash.core import    (   get_connections,
                                 erase,
                                 verify,
                                 flash,
+                                flash_many,
                                 memory_read,
+                                memory_read_many,
+                                memory_watch,
+                                memory_dump,
                                 memory_write,
                                 register_read,
                                 register_write,
+                                register_read_many,
+                                register_snapshot,
+                                register_write_many,
+                                register_diff,
                                 evaluate,
+                                evaluate_many,
+                                run_pipeline,
                                 attach,
                                 xds110_reset,
                                 xds110_list,
                                 xds110_upgrade,
                                 detect_devices,
                                 get_info,
+                                start_worker,
+                                start_pool,
+                                open_session,
+                                cleanup_workspaces,
 
-                                TIFlashError
+                                TIFlashError,
+                                TIFlashTimeoutError
                             )
 
 from tiflash.version import version_string as __version__
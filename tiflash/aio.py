@@ -0,0 +1,648 @@
+"""
+asyncio API for TIFlash (Python 3 only)
+
+Mirrors the tiflash API (tiflash/core/api.py) as coroutines. Commands launch
+dss with asyncio.create_subprocess_exec and receive their result on an asyncio
+server, so a single event loop can drive many devices concurrently.
+
+Example:
+    import asyncio
+    import tiflash.aio
+
+    async def flash_all(sernos, image):
+        return await asyncio.gather(
+            *[ tiflash.aio.flash(image, serno=s) for s in sernos ])
+
+    loop = asyncio.get_event_loop()
+    results = loop.run_until_complete(flash_all(["L1000000", "L2000000"],
+                                                "image.hex"))
+
+Resolving the CCS installation and ccxml file (and any helpers that only
+parse CCS files) run in the event loop's default executor; ccxml files that
+must be generated are generated with dss on the event loop.
+"""
+
+import asyncio
+import functools
+import os
+import time
+
+from tiflash.core import api
+from tiflash.core import commands
+from tiflash.core.commands import TIFlashError
+from tiflash.utils import aiodss
+from tiflash.utils import dss
+from tiflash.utils import xds110
+
+
+class AsyncTIFlash(object):
+    """Runs TIFlash commands as coroutines.
+
+    Wraps a TIFlash object (which holds the session settings) and runs its
+    commands (see tiflash.core.commands) with aiodss.call_dss (or on the
+    TIFlash object's worker, if set, in the default executor).
+    """
+
+    def __init__(self, flash):
+        """Initializes AsyncTIFlash object.
+
+        Args:
+            flash (TIFlash): TIFlash object with session settings set
+        """
+        self.tiflash = flash
+
+    async def _run_cmd(self, args, sink=None):
+        """Runs dss cmd script with given arguments (see TIFlash)
+
+        Args:
+            args (dict): argument dictionary to use
+            sink (file, optional): file object to stream data posted by the
+                command to
+
+        Returns:
+            (bool, str): returns a tuple of format (result, msg)
+        """
+        flash = self.tiflash
+        arg_list = dss.format_args(args)
+        call_timings = dict()
+        start = time.time()
+
+        try:
+            if flash.worker is not None:
+                call_result = await _run_sync(
+                    flash.worker.run, arg_list, deadline=flash.deadline,
+                    sink=sink, progress=flash.progress)
+            else:
+                call_result = await aiodss.call_dss(
+                    flash.dss_path, arg_list, workspace=flash.workspace,
+                    deadline=flash.deadline, sink=sink,
+                    progress=flash.progress, timings=call_timings,
+                    attach=bool(args.get('attach')))
+        except dss.DSSError as e:
+            call_result = e
+
+        return commands.finish_call(call_result, flash.timings, call_timings,
+                                    start)
+
+    async def _run(self, build, *args, **kwargs):
+        """Builds a command with the session args (see tiflash.core.commands)
+        in the default executor, runs it and returns its parsed result
+
+        Args:
+            build (function): command function (i.e. commands.reset)
+            *args, **kwargs: arguments of command function (besides the
+                session args)
+        """
+        command = await _run_sync(build, self.tiflash.args, *args, **kwargs)
+        if command.args is None:
+            return command.parse(True, None)
+
+        try:
+            (code, result) = await self._run_cmd(command.args,
+                                                 sink=command.sink)
+        finally:
+            command.finish()
+
+        return command.parse(code, result)
+
+    async def generate_ccxml(self, connection, devicetype, serno=None):
+        """Generates a ccxml file (see TIFlash.generate_ccxml())"""
+        return await self._run(commands.generate_ccxml, self.tiflash.ccs_path,
+                               connection, devicetype, serno)
+
+    async def reset(self, options=None):
+        """Performs a Board Reset on device (see TIFlash.reset())"""
+        return await self._run(commands.reset, options=options)
+
+    async def erase(self, options=None):
+        """Erases device (see TIFlash.erase())"""
+        return await self._run(commands.erase, options=options)
+
+    async def verify(self, image, binary=False, address=None, options=None):
+        """Verifies device (see TIFlash.verify())"""
+        return await self._run(commands.verify, image, binary=binary,
+                               address=address, options=options)
+
+    async def flash(self, image, binary=False, address=None, options=None):
+        """Flashes device (see TIFlash.flash())"""
+        return await self._run(commands.flash, image, binary=binary,
+                               address=address, options=options)
+
+    async def memory_read(self, address, num_bytes=1, page=0, width=8,
+                          as_bytes=False):
+        """Reads specified bytes from memory (see TIFlash.memory_read())"""
+        return await self._run(commands.memory_read, address, num_bytes, page,
+                               width, as_bytes)
+
+    async def memory_read_many(self, regions, width=8):
+        """Reads many memory regions in a single dss invocation (see
+        TIFlash.memory_read_many())"""
+        return await self._run(commands.memory_read_many, self.pipeline(),
+                               regions, width)
+
+    async def memory_watch(self, address, num_bytes=1, interval=0.1,
+                           count=None, page=0, width=8):
+        """Samples a memory region periodically (async generator, see
+        Session.memory_watch()). Run on an AsyncTIFlash with a worker set
+        (see tiflash.aio.memory_watch()) so samples do not launch dss.
+
+        Yields:
+            (float, value): tuple of (timestamp, values) of each sample
+        """
+        taken = 0
+        next_sample = time.time()
+        while count is None or taken < count:
+            delay = next_sample - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            values = await self.memory_read(address, num_bytes, page,
+                                            width=width, as_bytes=True)
+            yield (time.time(), values)
+            taken += 1
+
+            # Keep a fixed rate; skip missed samples if reads fall behind
+            next_sample += interval
+            if next_sample < time.time():
+                next_sample = time.time()
+
+    async def memory_dump(self, address, num_bytes, out_path, page=0,
+                          sha256=False, width=8):
+        """Dumps memory to a binary file (see TIFlash.memory_dump())"""
+        return await self._run(commands.memory_dump, address, num_bytes,
+                               out_path, page, sha256, width)
+
+    async def memory_write(self, address, data, page=0, width=8):
+        """Writes specified data to memory (see TIFlash.memory_write())"""
+        await self._run(commands.memory_write, address, data, page, width)
+
+    async def register_read(self, regname):
+        """Reads specified register (see TIFlash.register_read())"""
+        return await self._run(commands.register_read, regname)
+
+    async def register_write(self, regname, value):
+        """Writes value to specified register (see TIFlash.register_write())
+        """
+        await self._run(commands.register_write, regname, value)
+
+    async def register_read_many(self, regnames):
+        """Reads many registers (see TIFlash.register_read_many())"""
+        return await self._run(commands.register_read_many, regnames)
+
+    async def register_snapshot(self, regnames=None):
+        """Reads a snapshot of the device's registers (see
+        TIFlash.register_snapshot())"""
+        return await self._run(commands.register_snapshot, regnames)
+
+    async def register_write_many(self, values):
+        """Writes many registers (see TIFlash.register_write_many())"""
+        await self._run(commands.register_write_many, values)
+
+    async def evaluate(self, expr, symbol_file=None):
+        """Evaluates the given C/GEL expression (see TIFlash.evaluate())"""
+        return await self._run(commands.evaluate, expr,
+                               symbol_file=symbol_file)
+
+    async def evaluate_many(self, exprs, symbol_file=None):
+        """Evaluates many C/GEL expressions (see TIFlash.evaluate_many())"""
+        return await self._run(commands.evaluate_many, exprs,
+                               symbol_file=symbol_file)
+
+    def pipeline(self):
+        """Returns a new (empty) Pipeline; run it with run_pipeline() (see
+        TIFlash.pipeline())"""
+        return self.tiflash.pipeline()
+
+    async def run_pipeline(self, pipeline):
+        """Runs all steps of the pipeline in a single dss invocation (see
+        TIFlash.run_pipeline())"""
+        return await self._run(commands.run_pipeline, pipeline)
+
+    async def print_options(self, option_id=None):
+        """Prints device options (see TIFlash.print_options())"""
+        return await self._run(commands.print_options, option_id)
+
+    async def get_option(self, option_id, pre_operation=None):
+        """Gets the value of an option (see TIFlash.get_option())"""
+        return await self._run(commands.get_option, option_id, pre_operation)
+
+    async def nop(self):
+        """No-op command (see TIFlash.nop())"""
+        await self._run(commands.nop)
+
+
+async def _run_sync(func, *args, **kwargs):
+    """PRIVATE FUNCTION: Runs blocking function in the default executor"""
+    loop = asyncio.get_event_loop()
+
+    return await loop.run_in_executor(None,
+                                      functools.partial(func, *args, **kwargs))
+
+
+async def _handle_ccs(ccs):
+    """PRIVATE FUNCTION: Returns path to ccs installation (see api)"""
+    return await _run_sync(api.resolve_ccs, ccs)
+
+
+async def _handle_session(ccs, **session_args):
+    """PRIVATE FUNCTION: Returns AsyncTIFlash object with given session
+    settings (see api)
+    """
+    ccs_path = await _handle_ccs(ccs)
+    flash = await _make_session(ccs_path, **session_args)
+
+    return AsyncTIFlash(flash)
+
+
+async def _make_session(ccs_path, ccxml=None, serno=None, devicetype=None,
+                        connection=None, fresh=False, debug=False,
+                        worker=None, workspace=None, **session_args):
+    """PRIVATE FUNCTION: Returns TIFlash object with given session settings
+    (see api.make_session()). A ccxml file that must be generated is
+    generated with aiodss, the rest runs in the default executor.
+    """
+    (ccxml_path, ccxml_args) = await _run_sync(
+        api.find_ccxml, ccs_path, ccxml=ccxml, serno=serno,
+        devicetype=devicetype, connection=connection, fresh=fresh)
+
+    if ccxml_path is None:
+        generator = await _run_sync(api.make_ccxml_generator, ccs_path,
+                                    ccxml_args, debug=debug, worker=worker,
+                                    workspace=workspace)
+        ccxml_path = await AsyncTIFlash(generator).generate_ccxml(
+            ccxml_args['connection'], ccxml_args['devicetype'],
+            ccxml_args['serno'])
+
+    return await _run_sync(api.make_ccxml_session, ccs_path, ccxml_path,
+                           debug=debug, worker=worker, workspace=workspace,
+                           **session_args)
+
+
+async def get_connections(ccs=None, search=None, progress=None):
+    """Gets list of all connections installed on machine (see
+    tiflash.get_connections())
+    """
+    return await _run_sync(api.get_connections, ccs=ccs, search=search,
+                           progress=progress)
+
+
+async def get_devicetypes(ccs=None, search=None, progress=None):
+    """Gets list of all devicetypes installed on machine (see
+    tiflash.get_devicetypes())
+    """
+    return await _run_sync(api.get_devicetypes, ccs=ccs, search=search,
+                           progress=progress)
+
+
+async def get_cpus(ccs=None, search=None, progress=None):
+    """Gets list of all cpus installed on machine (see tiflash.get_cpus())
+    """
+    return await _run_sync(api.get_cpus, ccs=ccs, search=search,
+                           progress=progress)
+
+
+async def list_options(option_id=None, ccs=None, **session_args):
+    """Gets all options for the session device (see tiflash.list_options())
+    """
+    return await _run_sync(api.list_options, option_id=option_id, ccs=ccs,
+                           **session_args)
+
+
+async def print_options(option_id=None, ccs=None, **session_args):
+    """Prints all available options for the session device (see
+    tiflash.print_options())
+    """
+    flash = await _handle_session(ccs, **session_args)
+
+    await flash.print_options(option_id=option_id)
+
+
+async def get_bool_option(option_id, pre_operation=None, ccs=None,
+                          **session_args):
+    """Reads and returns the boolean value of the option_id (see
+    tiflash.get_bool_option())
+    """
+    option_val = await get_option(option_id, pre_operation=pre_operation,
+                                  ccs=ccs, **session_args)
+
+    return dss.parse_response_bool(option_val)
+
+
+async def get_float_option(option_id, pre_operation=None, ccs=None,
+                           **session_args):
+    """Reads and returns the float value of the option_id (see
+    tiflash.get_float_option())
+    """
+    option_val = await get_option(option_id, pre_operation=pre_operation,
+                                  ccs=ccs, **session_args)
+
+    return dss.parse_response_float(option_val)
+
+
+async def get_option(option_id, pre_operation=None, ccs=None,
+                     **session_args):
+    """Reads and returns the value of the option_id (see
+    tiflash.get_option())
+    """
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.get_option(option_id, pre_operation)
+
+
+async def set_option(option_id, option_val, post_operation=None, ccs=None,
+                     **session_args):
+    """Sets the value of the option_id (see tiflash.set_option())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    if post_operation is not None:
+        flash.tiflash.set_operation(post_operation)
+
+    flash.tiflash.set_option(option_id, option_val)
+
+    await flash.nop()   # Just set option and operation and run
+
+
+async def reset(options=None, ccs=None, **session_args):
+    """Performs a Board Reset on device (see tiflash.reset())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.reset(options)
+
+
+async def erase(options=None, ccs=None, **session_args):
+    """Erases device (see tiflash.erase())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.erase(options)
+
+
+async def verify(image, binary=False, address=None, options=None, ccs=None,
+                 **session_args):
+    """Verifies image on device (see tiflash.verify())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.verify(image, binary=binary, address=address,
+                              options=options)
+
+
+async def flash(image, binary=False, address=None, options=None, ccs=None,
+                **session_args):
+    """Flashes image to device (see tiflash.flash())"""
+    async_flash = await _handle_session(ccs, **session_args)
+
+    return await async_flash.flash(image, binary=binary, address=address,
+                                   options=options)
+
+
+async def memory_read(address, num_bytes=1, page=0, width=8, as_bytes=False,
+                      ccs=None, **session_args):
+    """Reads specified bytes from memory (see tiflash.memory_read())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.memory_read(address, num_bytes, page, width=width,
+                                   as_bytes=as_bytes)
+
+
+async def flash_many(image, sernos, max_workers=api.FLASH_MANY_MAX_WORKERS,
+                     binary=False, address=None, options=None, ccs=None,
+                     **session_args):
+    """Flashes image to multiple devices concurrently (see
+    tiflash.flash_many())
+    """
+    max_workers = api.check_flash_many_args(sernos, max_workers,
+                                            session_args)
+    ccs_path = await _handle_ccs(ccs)
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def flash_board(serno):
+        async with semaphore:
+            return await _flash_board(ccs_path, image, serno, binary=binary,
+                                      address=address, options=options,
+                                      **session_args)
+
+    return await asyncio.gather(*[flash_board(s) for s in sernos])
+
+
+async def _flash_board(ccs_path, image, serno, binary=False, address=None,
+                       options=None, **session_args):
+    """PRIVATE FUNCTION: Flashes a single device for flash_many() and
+    returns its result dict (see api)
+    """
+    board_result = {'serno': serno, 'success': False, 'error': None,
+                    'duration': None, 'timings': dict()}
+    start = time.time()
+
+    # dss workspaces can not be shared (see api)
+    workspace = session_args.pop('workspace', None)
+    if workspace:
+        workspace = workspace + os.sep + serno
+
+    try:
+        flash = await _make_session(ccs_path, serno=serno,
+                                    workspace=workspace,
+                                    timings=board_result['timings'],
+                                    **session_args)
+        board_result['success'] = await AsyncTIFlash(flash).flash(
+            image, binary=binary, address=address, options=options)
+    except Exception as e:
+        board_result['error'] = str(e)
+
+    board_result['duration'] = time.time() - start
+
+    return board_result
+
+
+async def memory_read_many(regions, width=8, ccs=None, **session_args):
+    """Reads many memory regions in a single dss invocation (see
+    tiflash.memory_read_many())
+    """
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.memory_read_many(regions, width=width)
+
+
+async def memory_watch(address, num_bytes=1, interval=0.1, count=None, page=0,
+                       width=8, ccs=None, **session_args):
+    """Samples a memory region periodically on a single open session (async
+    generator, see tiflash.memory_watch()). The session is closed when the
+    generator completes or is closed.
+
+    Example:
+        async for (timestamp, values) in tiflash.aio.memory_watch(
+                0x20000000, 4, count=10, serno="L1000000"):
+            print(timestamp, list(values))
+    """
+    session = await _run_sync(api.open_session, ccs=ccs, **session_args)
+    try:
+        flash = AsyncTIFlash(session.tiflash)
+        async for sample in flash.memory_watch(address, num_bytes,
+                                               interval=interval,
+                                               count=count, page=page,
+                                               width=width):
+            yield sample
+    finally:
+        await _run_sync(session.close)
+
+
+async def memory_dump(address, num_bytes, out_path, page=0, sha256=False,
+                      width=8, ccs=None, **session_args):
+    """Dumps memory to a binary file (see tiflash.memory_dump())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.memory_dump(address, num_bytes, out_path, page=page,
+                                   sha256=sha256, width=width)
+
+
+async def memory_write(address, data, page=0, width=8, ccs=None,
+                       **session_args):
+    """Writes specified data to memory (see tiflash.memory_write())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    await flash.memory_write(address, data, page=page, width=width)
+
+
+async def register_read(regname, ccs=None, **session_args):
+    """Reads specified register of device (see tiflash.register_read())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.register_read(regname)
+
+
+async def register_write(regname, value, ccs=None, **session_args):
+    """Writes value to specified register of device (see
+    tiflash.register_write())
+    """
+    flash = await _handle_session(ccs, **session_args)
+
+    await flash.register_write(regname, value)
+
+
+async def register_read_many(regnames, ccs=None, **session_args):
+    """Reads many registers of device (see tiflash.register_read_many())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.register_read_many(regnames)
+
+
+async def register_snapshot(regnames=None, ccs=None, **session_args):
+    """Reads a snapshot of the device's registers (see
+    tiflash.register_snapshot())
+    """
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.register_snapshot(regnames)
+
+
+async def register_write_many(values, ccs=None, **session_args):
+    """Writes many registers of device (see tiflash.register_write_many())
+    """
+    flash = await _handle_session(ccs, **session_args)
+
+    await flash.register_write_many(values)
+
+
+async def evaluate(expr, symbol_file=None, ccs=None, **session_args):
+    """Evaluates the given C/GEL expression (see tiflash.evaluate())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.evaluate(expr, symbol_file=symbol_file)
+
+
+async def evaluate_many(exprs, symbol_file=None, ccs=None, **session_args):
+    """Evaluates many C/GEL expressions (see tiflash.evaluate_many())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    return await flash.evaluate_many(exprs, symbol_file=symbol_file)
+
+
+async def run_pipeline(steps, ccs=None, **session_args):
+    """Runs an ordered list of commands in a single dss invocation (see
+    tiflash.run_pipeline())
+    """
+    flash = await _handle_session(ccs, **session_args)
+    pipeline = api.build_pipeline(flash.tiflash, steps)
+
+    return await flash.run_pipeline(pipeline)
+
+
+async def attach(ccs=None, **session_args):
+    """Opens a CCS session and attaches to device (see tiflash.attach())"""
+    session_args['attach'] = True
+
+    flash = await _handle_session(ccs, **session_args)
+
+    await flash.nop()
+
+
+async def nop(ccs=None, **session_args):
+    """No-op command (see tiflash.nop())"""
+    flash = await _handle_session(ccs, **session_args)
+
+    await flash.nop()
+
+
+async def xds110_reset(ccs=None, **session_args):
+    """Calls xds110reset command on specified serno (see
+    tiflash.xds110_reset())
+    """
+    ccs_path = await _handle_ccs(ccs)
+
+    ccxml_args = await _run_sync(api.resolve_ccxml_args, ccs_path,
+                                 **session_args)
+
+    if ccxml_args['serno'] is None:
+        raise TIFlashError("Must provide 'serno' to call xds110_reset")
+
+    xds_exe = [xds110.get_xds110_exe_path(ccs_path, 'xds110reset'),
+               '-s', ccxml_args['serno']]
+
+    (ret, out) = await _run_exe(xds_exe)
+
+    if ret != 0:
+        raise xds110.XDS110Error(out)
+
+    return True
+
+
+async def xds110_list(ccs=None, **session_args):
+    """Returns list of sernos and xds110 version numbers of connected XDS110
+    devices (see tiflash.xds110_list())
+    """
+    ccs_path = await _handle_ccs(ccs)
+
+    xds_exe = [xds110.get_xds110_exe_path(ccs_path, 'xdsdfu'), '-e']
+
+    (ret, out) = await _run_exe(xds_exe)
+
+    if ret != 0:
+        raise xds110.XDS110Error(out)
+
+    return xds110.parse_xds110_list(out)
+
+
+async def xds110_upgrade(ccs=None, **session_args):
+    """Upgrades/Flashes XDS110 firmware on board (see
+    tiflash.xds110_upgrade())
+    """
+    return await _run_sync(api.xds110_upgrade, ccs=ccs, **session_args)
+
+
+async def detect_devices(ccs=None, **session_args):
+    """Detect devices connected to machine (see tiflash.detect_devices())"""
+    return await _run_sync(api.detect_devices, ccs=ccs, **session_args)
+
+
+async def get_info(ccs=None, **session_args):
+    """Returns dict of information regarding tiflash environment (see
+    tiflash.get_info())
+    """
+    return await _run_sync(api.get_info, ccs=ccs, **session_args)
+
+
+async def _run_exe(cmd):
+    """PRIVATE FUNCTION: Runs executable and returns (returncode, stdout)"""
+    proc = await asyncio.create_subprocess_exec(*cmd,
+                                                stdout=asyncio.subprocess.PIPE)
+    out, err = await proc.communicate()
+
+    return (proc.returncode, out)
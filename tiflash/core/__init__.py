@@ -1,4 +1,4 @@
-from tiflash.core.core import TIFlashError  #, TIFlash
+from tiflash.core.commands import TIFlashError, TIFlashTimeoutError  #, TIFlash
 from tiflash.core.api import(   get_connections,
                                 get_devicetypes,
                                 get_cpus,
@@ -12,18 +12,33 @@ from tiflash.core.api import(   get_connections,
                                 erase,
                                 verify,
                                 flash,
+                                flash_many,
                                 memory_read,
+                                memory_read_many,
+                                memory_watch,
+                                memory_dump,
                                 memory_write,
                                 register_read,
                                 register_write,
+                                register_read_many,
+                                register_snapshot,
+                                register_write_many,
+                                register_diff,
                                 evaluate,
+                                evaluate_many,
+                                run_pipeline,
                                 attach,
                                 xds110_reset,
                                 xds110_list,
                                 xds110_upgrade,
                                 detect_devices,
                                 get_info,
+                                start_worker,
+                                start_pool,
+                                open_session,
+                                cleanup_workspaces,
                             )
 # Remove anything that shouldn't be included at api level
 del core
+del commands
 del api
@@ -1,4 +1,6 @@
 import argparse
+import json
+import sys
 from platform import python_version
 from pprint import pprint
 
@@ -14,10 +16,16 @@ from tiflash.core.args import (
     VerifyParser,
     FlashParser,
     MemoryReadParser,
+    MemoryReadManyParser,
+    MemoryWatchParser,
+    MemoryDumpParser,
     MemoryWriteParser,
     RegisterReadParser,
     RegisterWriteParser,
+    RegisterDumpParser,
     ExpressionParser,
+    ExpressionManyParser,
+    RunParser,
     AttachParser,
     XDS110ResetParser,
     XDS110UpgradeParser,
@@ -25,9 +33,11 @@ from tiflash.core.args import (
     DetectParser,
     InfoParser,
 
-    get_session_args
+    get_session_args,
+    print_timings
 )
 
+
 def __exit_with_error(e):
     """Helper function for printing Exception message and exiting with non-zero
     exit number
@@ -37,15 +47,18 @@ def __exit_with_error(e):
     """
     raise SystemExit(e)
 
+
 def generate_parser():
     """Generates an argument parser
 
     Returns:
         argparse.ArgumentParser
     """
-    full_version = "tiflash: %s - python: %s" % (tiflash.__version__, python_version())
+    full_version = "tiflash: %s - python: %s" % (tiflash.__version__,
+                                                 python_version())
 
-    main_parser = argparse.ArgumentParser(prog="tiflash", parents=[SessionParser],
+    main_parser = argparse.ArgumentParser(prog="tiflash",
+        parents=[SessionParser],
         usage="tiflash [session arguments] <command> [command arguments]")
     main_parser._positionals.title = "commands"
     main_parser._optionals.title = "session arguments"
@@ -63,7 +76,8 @@ def generate_parser():
         usage="tiflash [Session Arguments] options-get <optionID> [optionals]",
         description="Get value of a device option.")
     sub_parsers.add_parser('options-set', parents=[OptionsSetParser],
-        usage="tiflash [Session Arguments] options-set <optionID> <optionVal> [optionals]",
+        usage="tiflash [Session Arguments] options-set <optionID> <optionVal> "
+              "[optionals]",
         description="Set value of a device option.")
     sub_parsers.add_parser('options-list', parents=[OptionsListParser],
         usage="tiflash [Session Arguments] options-list [optionID]",
@@ -98,22 +112,52 @@ def generate_parser():
     sub_parsers.add_parser('memory-read', parents=[MemoryReadParser],
         usage="tiflash [Session Arguments] memory-read <address> [optionals]",
         description="Read from memory location on a device.")
+    sub_parsers.add_parser('memory-read-many', parents=[MemoryReadManyParser],
+        usage="tiflash [Session Arguments] memory-read-many <regions> "
+              "[optionals]",
+        description="Read many memory regions of a device in a single "
+                    "session.")
+    sub_parsers.add_parser('memory-watch', parents=[MemoryWatchParser],
+        usage="tiflash [Session Arguments] memory-watch --address <address> "
+              "[optionals]",
+        description="Sample a memory region periodically (as CSV) on a "
+                    "single session.")
+    sub_parsers.add_parser('memory-dump', parents=[MemoryDumpParser],
+        usage="tiflash [Session Arguments] memory-dump <address> <length> "
+              "-o <file> [optionals]",
+        description="Dump a region of a device's memory to a binary file.")
     sub_parsers.add_parser('memory-write', parents=[MemoryWriteParser],
         usage="tiflash [Session Arguments] memory-write <address> [optionals]",
         description="Write to memory location on a device.")
 
     # Register
     sub_parsers.add_parser('register-read', parents=[RegisterReadParser],
-        usage="tiflash [Session Arguments] register-read <regname> [optionals]",
+        usage="tiflash [Session Arguments] register-read <regname> "
+              "[optionals]",
         description="Read from register on a device.")
     sub_parsers.add_parser('register-write', parents=[RegisterWriteParser],
         usage="tiflash [Session Arguments] register-write <reganame> <value>",
         description="Write value to register on a device.")
+    sub_parsers.add_parser('register-dump', parents=[RegisterDumpParser],
+        usage="tiflash [Session Arguments] register-dump [regnames] "
+              "[optionals]",
+        description="Dump a snapshot of a device's registers (as JSON).")
 
     # Evaluate
     sub_parsers.add_parser('evaluate', parents=[ExpressionParser],
         usage="tiflash [Session Arguments] evaluate <expression> [optionals]",
         description="Evaluate a C/GEL expression on a device.")
+    sub_parsers.add_parser('evaluate-many', parents=[ExpressionManyParser],
+        usage="tiflash [Session Arguments] evaluate-many <expressions> "
+              "[optionals]",
+        description="Evaluate C/GEL expressions listed in a file on a device "
+                    "(in a single session).")
+
+    # Run
+    sub_parsers.add_parser('run', parents=[RunParser],
+        usage="tiflash [Session Arguments] run <plan>",
+        description="Run an ordered list of commands (plan) in a single "
+                    "session.")
 
     # Attach
     sub_parsers.add_parser('attach', parents=[AttachParser],
@@ -166,8 +210,9 @@ def handle_options(args):
     # Get Option
     if args.cmd == 'options-get':
         try:
-            value = tiflash.get_option(args.optionID, pre_operation=args.operation,
-                                   **session_args)
+            value = tiflash.get_option(args.optionID,
+                                       pre_operation=args.operation,
+                                       **session_args)
             print(value)
         except Exception as e:
             __exit_with_error(e)
@@ -183,7 +228,8 @@ def handle_options(args):
     # Display Option Information
     elif args.cmd == 'options-list':
         options = tiflash.list_options(option_id=args.optionID, **session_args)
-        header = "Options (%s):" % args.optionID if args.optionID else "Options:"
+        header = "Options (%s):" % args.optionID if args.optionID \
+            else "Options:"
         print(header)
         print("-" * len(header))
         __print_options(options)
@@ -222,11 +268,14 @@ def handle_list(args):
     results = []
     session_args = get_session_args(args)
     if args.devicetypes:
-        results = tiflash.get_devicetypes(args.ccs, search=args.search)
+        results = tiflash.get_devicetypes(args.ccs, search=args.search,
+                                progress=session_args.get('progress'))
     elif args.connections:
-        results = tiflash.get_connections(args.ccs, search=args.search)
+        results = tiflash.get_connections(args.ccs, search=args.search,
+                                progress=session_args.get('progress'))
     elif args.cpus:
-        results = tiflash.get_cpus(args.ccs, search=args.search)
+        results = tiflash.get_cpus(args.ccs, search=args.search,
+                                progress=session_args.get('progress'))
     elif args.options:
         # tiflash.print_options(**session_args)
         results = tiflash.list_options(**session_args)
@@ -296,7 +345,8 @@ def handle_verify(args):
 
     # TODO: Add multi image verifying
     try:
-        result = tiflash.verify(args.image[0], options=options, binary=args.bin, **session_args)
+        result = tiflash.verify(args.image[0], options=options,
+                                binary=args.bin, **session_args)
         print(result)
     except Exception as e:
         __exit_with_error(e)
@@ -321,6 +371,11 @@ def handle_flash(args):
     if len(options) == 0:
         options = None
 
+    # Flash multiple devices in parallel
+    if args.sernos:
+        __flash_many(args, images[0], options, session_args)
+        return
+
     # TODO: Add multi image flashing
     try:
         result = tiflash.flash(images[0], binary=args.bin, options=options,
@@ -330,26 +385,136 @@ def handle_flash(args):
         __exit_with_error(e)
 
 
+def __flash_many(args, image, options, session_args):
+    """Helper function for flashing multiple devices ('flash' command)"""
+    sernos = list()
+    if 'serno' in session_args.keys():
+        sernos.append(session_args.pop('serno'))
+    sernos.extend(args.sernos)
+
+    if args.jobs:
+        session_args['max_workers'] = args.jobs
+
+    try:
+        results = tiflash.flash_many(image, sernos, binary=args.bin,
+                                     options=options, address=args.address,
+                                     **session_args)
+    except Exception as e:
+        __exit_with_error(e)
+
+    failed = False
+    print("%-12s %-8s %s" % ("serno", "duration", "result"))
+    for board in results:
+        if board['success']:
+            result = "True"
+        else:
+            failed = True
+            result = "FAILED (%s)" % board['error'] if board['error'] \
+                else "False"
+        print("%-12s %-8s %s" % (board['serno'],
+                                 "%.1fs" % board['duration'], result))
+
+    if failed:
+        __exit_with_error("Failed to flash %d of %d devices" %
+                          (len([b for b in results if not b['success']]),
+                           len(results)))
+
+
 def handle_memory(args):
     """Helper function for handling 'memory' command"""
     session_args = get_session_args(args)
 
     if args.cmd == 'memory-read':
         try:
-            result = tiflash.memory_read(args.address, args.num_bytes, args.page,
-                **session_args)
+            result = tiflash.memory_read(args.address, args.num_bytes,
+                args.page, width=args.width, **session_args)
             if args.hex:
                 result = [ hex(h) for h in result ]
             print(result)
         except Exception as e:
             __exit_with_error(e)
-    elif args.cmd == 'memory-write':
+    elif args.cmd == 'memory-read-many':
         try:
-            result = tiflash.memory_write(args.address, args.data, args.page,
+            regions = __read_regions(args.regions)
+            results = tiflash.memory_read_many(regions, width=args.width,
                 **session_args)
         except Exception as e:
             __exit_with_error(e)
 
+        for (address, num_bytes, page) in regions:
+            result = results[address]
+            if args.hex:
+                result = [hex(h) for h in result]
+            print("0x%08X: %s" % (address, result))
+    elif args.cmd == 'memory-watch':
+        __watch_memory(args, session_args)
+    elif args.cmd == 'memory-dump':
+        try:
+            result = tiflash.memory_dump(args.address, args.num_bytes,
+                args.output, page=args.page, sha256=args.sha256,
+                width=args.width, **session_args)
+            if args.sha256:
+                print(result)
+        except Exception as e:
+            __exit_with_error(e)
+    elif args.cmd == 'memory-write':
+        try:
+            data = [int(d, 0) for d in args.data]
+            result = tiflash.memory_write(args.address, data, args.page,
+                width=args.width, **session_args)
+        except Exception as e:
+            __exit_with_error(e)
+
+
+def __watch_memory(args, session_args):
+    """Helper function for sampling memory to CSV ('memory-watch' command)"""
+    out = open(args.out, 'w') if args.out else sys.stdout
+    samples = tiflash.memory_watch(args.address, args.num_bytes,
+                                   interval=args.interval, count=args.count,
+                                   page=args.page, width=args.width,
+                                   **session_args)
+    try:
+        num_values = args.num_bytes // (args.width // 8)
+        header = ["timestamp"] + ["value%d" % i for i in range(num_values)]
+        out.write(",".join(header) + "\n")
+
+        for (timestamp, values) in samples:
+            if args.width == 8:
+                values = bytearray(values)  # ints on python 2 & 3
+            row = ["%.3f" % timestamp] + [str(v) for v in values]
+            out.write(",".join(row) + "\n")
+            out.flush()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        __exit_with_error(e)
+    finally:
+        samples.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+def __read_regions(path):
+    """Helper function for reading a memory regions file
+    ('memory-read-many' command)
+
+    Returns:
+        list: list of (address, num_bytes, page) tuples
+    """
+    regions = list()
+    with open(path) as f:
+        for line in f:
+            line = line.split('#')[0].strip()
+            if line:
+                values = [int(v, 0) for v in line.split()]
+                if len(values) == 2:
+                    values.append(0)
+                if len(values) != 3:
+                    raise ValueError("Invalid memory region: %s" % line)
+                regions.append(tuple(values))
+
+    return regions
+
 
 def handle_register(args):
     """Helper function for handling 'register' command"""
@@ -369,6 +534,21 @@ def handle_register(args):
                 **session_args)
         except Exception as e:
             __exit_with_error(e)
+    elif args.cmd == 'register-dump':
+        try:
+            result = tiflash.register_snapshot(args.regnames or None,
+                **session_args)
+        except Exception as e:
+            __exit_with_error(e)
+
+        if args.hex:
+            result = dict((r, hex(v)) for (r, v) in result.items())
+        output = json.dumps(result, indent=2, sort_keys=True)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(output + "\n")
+        else:
+            print(output)
 
 
 def handle_expression(args):
@@ -383,6 +563,57 @@ def handle_expression(args):
         __exit_with_error(e)
 
 
+def handle_expression_many(args):
+    """Helper function for handling 'evaluate-many' command"""
+    session_args = get_session_args(args)
+
+    try:
+        with open(args.expressions) as f:
+            exprs = [line.strip() for line in f]
+        exprs = [e for e in exprs if e and not e.startswith('#')]
+
+        results = tiflash.evaluate_many(exprs, symbol_file=args.symbols,
+                                        **session_args)
+    except Exception as e:
+        __exit_with_error(e)
+
+    failed = 0
+    for r in results:
+        if r['success']:
+            print("%s = %s" % (r['expression'], r['result']))
+        else:
+            print("%s: Error: %s" % (r['expression'], r['error']))
+            failed += 1
+
+    if failed:
+        __exit_with_error("%d of %d expressions failed" %
+                          (failed, len(results)))
+
+
+def handle_run(args):
+    """Helper function for handling 'run' command"""
+    session_args = get_session_args(args)
+
+    try:
+        with open(args.plan) as f:
+            steps = json.load(f)
+
+        results = tiflash.run_pipeline(steps, **session_args)
+    except Exception as e:
+        __exit_with_error(e)
+
+    failed = False
+    for step in results:
+        if step['success']:
+            print("%s: %s" % (step['command'], step['result']))
+        else:
+            failed = True
+            print("%s: FAILED (%s)" % (step['command'], step['error']))
+
+    if failed:
+        __exit_with_error("Plan did not complete successfully")
+
+
 def handle_attach(args):
     """Helper function for handling 'attach' command"""
     session_args = get_session_args(args)
@@ -438,13 +669,15 @@ def handle_detect(args):
     except Exception as e:
         __exit_with_error(e)
 
+
 def handle_info(args):
     """Helper function for handling 'info' command"""
     session_args = get_session_args(args)
 
     info_dict = tiflash.get_info(**session_args)
     ordered_keys = ['tiflash version', 'release date', 'python version',
-                    'ccs version', 'ccs prefix', 'ccs location', 'device drivers']
+                    'ccs version', 'ccs prefix', 'ccs location',
+                    'device drivers']
     for k in ordered_keys:
         print("{key:<20}{val}".format(key=(k+':'), val=info_dict[k]))
 
@@ -459,6 +692,19 @@ def main(args=None):
     if not args:
         args = parse_args()
 
+    # Timings of the command are collected in this dict (see TIFlash.timings)
+    if getattr(args, 'timings', False):
+        args.timings = dict()
+
+    try:
+        __run_cmd(args)
+    finally:
+        if getattr(args, 'timings', False):
+            print_timings(args.timings)
+
+
+def __run_cmd(args):
+    """Helper function for running the command given by 'args.cmd'"""
     # Options
     if args.cmd == 'options-get' \
         or args.cmd == 'options-set' \
@@ -487,17 +733,27 @@ def main(args=None):
 
     # Memory
     elif args.cmd == 'memory-read' \
+        or args.cmd == 'memory-read-many' \
+        or args.cmd == 'memory-watch' \
+        or args.cmd == 'memory-dump' \
         or args.cmd == 'memory-write':
         handle_memory(args)
 
     # Register
     elif args.cmd == 'register-read' \
-        or args.cmd == 'register-write':
+            or args.cmd == 'register-write' \
+            or args.cmd == 'register-dump':
         handle_register(args)
 
     # Expression
     elif args.cmd == 'evaluate':
         handle_expression(args)
+    elif args.cmd == 'evaluate-many':
+        handle_expression_many(args)
+
+    # Run
+    elif args.cmd == 'run':
+        handle_run(args)
 
     # Attach
     elif args.cmd == 'attach':
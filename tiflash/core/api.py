@@ -1,4 +1,6 @@
 import os
+import threading
+import time
 from platform import python_version
 
 from tiflash.version import version_string as __version__, release_date
@@ -7,7 +9,7 @@ from tiflash.utils.ccxml import (CCXMLError, get_device_xml,
                                 get_devicetype, get_connection, get_serno,
                                  get_connection_xml, get_ccxml_path)
 from tiflash.utils.ccs import (find_ccs, get_workspace_dir, FindCCSError,
-                                get_ccs_version, get_ccs_prefix, get_ccs_pf_filters)
+                               get_ccs_installation, get_ccs_prefix)
 from tiflash.utils import flash_properties
 from tiflash.utils import cpus
 from tiflash.utils import connections
@@ -15,6 +17,18 @@ from tiflash.utils import devices
 from tiflash.utils import dss
 from tiflash.utils import xds110
 from tiflash.utils import detect
+from tiflash.utils import workspace as ws
+from tiflash.utils.worker import DSSWorker
+from tiflash.utils.pool import DSSWorkerPool, DEFAULT_POOL_SIZE
+from tiflash.core.session import Session
+
+
+FLASH_MANY_MAX_WORKERS = 4    # default number of boards to flash at once
+
+PIPELINE_COMMANDS = ('reset', 'erase', 'verify', 'flash', 'memory_read',
+                     'memory_write', 'register_read', 'register_write',
+                     'register_read_many', 'register_write_many',
+                     'evaluate')
 
 
 class TIFlashAPIError(TIFlashError):
@@ -33,12 +47,12 @@ def __get_cpu_from_ccxml(ccxml_path, ccs_path):
         str: returns cpu name
     """
     device_xml = get_device_xml(ccxml_path, ccs_path)
-    cpu = devices.get_cpu(device_xml)
+    cpu = devices.get_cpu(device_xml, ccs_path)
 
     return cpu
 
 
-def __handle_ccs(ccs):
+def resolve_ccs(ccs):
     """Takes either ccs version number or path to custom ccs installation and
     verifies and returns the path to the ccs installation
 
@@ -76,37 +90,44 @@ def __handle_ccs(ccs):
 
     return ccs_path
 
-def __generate_ccxml(ccs_path, serno=None,
-                   devicetype=None, connection=None, debug=False):
-    """Helper function for generating ccxml files using the provided
-    information.
+
+def make_ccxml_generator(ccs_path, ccxml_args, debug=False, worker=None,
+                         workspace=None):
+    """Returns a TIFlash object for generating a ccxml file with the given
+    ccxml args (see find_ccxml()). Generate the file by calling its
+    generate_ccxml() with the connection, devicetype and serno of ccxml_args.
 
     Args:
         ccs_path (str): path to ccs installation
-        connection type (str, optional): connection type to use when
-            generating new ccxml file
-        devicetype (str, optional): devicetype to use when generating new
-            ccxml file
-        serno (str, optional): serial number to use when creating new
-            ccxml file
+        ccxml_args (dict): ccxml args (see resolve_ccxml_args())
         debug (bool): option to display all output when running
+        worker (DSSWorker, optional): persistent dss worker to run on
+        workspace (str, optional): workspace to use for dss
+
+    Returns:
+        core.TIFlash: TIFlash object to generate ccxml file with
+
+    Raises:
+        TIFlashError: raises error if devicetype or connection could not be
+            determined
     """
-    devicexml = None
     flash = TIFlash(ccs_path)
     flash.set_debug(on=debug)
+    flash.set_worker(worker)
+    if workspace:
+        flash.set_workspace(workspace)
 
-    if devicetype is None:
+    if ccxml_args['devicetype'] is None:
         raise TIFlashError("Could not determine devicetype to use.")
 
-    if connection is None:
+    if ccxml_args['connection'] is None:
         raise TIFlashError("Could not determine connection type to use.")
 
+    return flash
 
-    ccxml_path = flash.generate_ccxml(connection, devicetype, serno)
-    return ccxml_path
 
-def __handle_ccxml_args(ccs_path, ccxml=None, serno=None,
-                   devicetype=None, connection=None, **ignored):
+def resolve_ccxml_args(ccs_path, ccxml=None, serno=None, devicetype=None,
+                       connection=None, **ignored):
     """Takes ccxml arguments and returns a dictionary containing serno,
     devicetype, connection, and ccxml_path.
 
@@ -133,7 +154,6 @@ def __handle_ccxml_args(ccs_path, ccxml=None, serno=None,
         'ccxml_path' : None,
     }
 
-
     # GET CCXML
     if ccxml:
         if os.path.exists(ccxml):
@@ -164,7 +184,8 @@ def __handle_ccxml_args(ccs_path, ccxml=None, serno=None,
     elif ccxml_args['ccxml_path'] is not None:
         ccxml_args['devicetype']  = get_devicetype(ccxml_args['ccxml_path'])
     elif serno:
-        ccxml_args['devicetype'] = devices.get_device_from_serno(serno, ccs_path)
+        ccxml_args['devicetype'] = devices.get_device_from_serno(serno,
+                                                                 ccs_path)
 
     # GET CONNECTION
     if connection:
@@ -173,19 +194,22 @@ def __handle_ccxml_args(ccs_path, ccxml=None, serno=None,
         ccxml_args['connection']  = get_connection(ccxml_args['ccxml_path'])
     elif ccxml_args['devicetype'] is not None:
         try:
-            device_xml = devices.get_device_xml_from_devicetype(ccxml_args['devicetype'], ccs_path)
-            connection_xml = devices.get_default_connection_xml(device_xml, ccs_path)
-            ccxml_args['connection'] = connections.get_connection_name(connection_xml)
+            device_xml = devices.get_device_xml_from_devicetype(
+                ccxml_args['devicetype'], ccs_path)
+            connection_xml = devices.get_default_connection_xml(device_xml,
+                                                                ccs_path)
+            ccxml_args['connection'] = connections.get_connection_name(
+                connection_xml, ccs_path)
         except Exception:
             pass    # Not all device xml will have default connection
 
     return ccxml_args
 
 
-
-def __handle_ccxml(ccs_path, ccxml=None, serno=None, devicetype=None,
-                    connection=None, fresh=False, debug=False):
-    """Takes ccxml args and returns a corresponding ccxml file.
+def find_ccxml(ccs_path, ccxml=None, serno=None, devicetype=None,
+               connection=None, fresh=False):
+    """Takes ccxml args and returns the corresponding ccxml file, if it
+    already exists and does not need to be (re)generated.
 
     CCXML args can be an existing ccxml file path itself or the necessary
     components to create a ccxml file. If a serial number or devicetype
@@ -206,18 +230,21 @@ def __handle_ccxml(ccs_path, ccxml=None, serno=None, devicetype=None,
         serno (str, optional): serial number to use when creating new
             ccxml file
         fresh (bool): option to force a new (fresh) ccxml file to be generated
-        debug (bool): option to display all output when running
 
     Returns:
-        str: full path to ccxml file
+        (str, dict): tuple of (ccxml_path, ccxml_args); ccxml_path is the
+        full path to the ccxml file (None if the ccxml file must be
+        generated, see make_ccxml_generator()) and ccxml_args the resolved
+        ccxml args (see resolve_ccxml_args())
     """
     ccxml_path = None
     default_devicetype = None
     default_connection = None
     default_serno = None
 
-    ccxml_args = __handle_ccxml_args(ccs_path, ccxml=ccxml, serno=serno,
-                            devicetype=devicetype, connection=connection)
+    ccxml_args = resolve_ccxml_args(ccs_path, ccxml=ccxml, serno=serno,
+                                    devicetype=devicetype,
+                                    connection=connection)
     ccxml_path = ccxml_args['ccxml_path']
 
     if ccxml and ccxml_path is None:
@@ -231,28 +258,59 @@ def __handle_ccxml(ccs_path, ccxml=None, serno=None, devicetype=None,
         except Exception:
             pass    # Device may not use serial numbers
 
-        if devicetype is not None and ccxml_args['devicetype'] != default_devicetype:
+        if devicetype is not None and \
+                ccxml_args['devicetype'] != default_devicetype:
             fresh = True
 
-        if connection is not None and ccxml_args['connection'] != default_connection:
+        if connection is not None and \
+                ccxml_args['connection'] != default_connection:
             fresh = True
 
         if serno is not None and ccxml_args['serno'] != default_serno:
             fresh = True
 
-    if fresh or ccxml_path is None:
+    if fresh:
+        ccxml_path = None
+
+    return (ccxml_path, ccxml_args)
+
+
+def __handle_ccxml(ccs_path, ccxml=None, serno=None, devicetype=None,
+                   connection=None, fresh=False, debug=False, worker=None,
+                   workspace=None):
+    """Takes ccxml args and returns a corresponding ccxml file, generating
+    it if needed (see find_ccxml()).
+
+    Args:
+        ccs_path (str): path to ccs installation
+        ccxml, serno, devicetype, connection, fresh: ccxml args (see
+            find_ccxml())
+        debug (bool): option to display all output when running
+        worker (DSSWorker, optional): persistent dss worker to run on
+        workspace (str, optional): workspace to use for dss
+
+    Returns:
+        str: full path to ccxml file
+    """
+    (ccxml_path, ccxml_args) = find_ccxml(ccs_path, ccxml=ccxml, serno=serno,
+                                          devicetype=devicetype,
+                                          connection=connection, fresh=fresh)
+
+    if ccxml_path is None:
         # Generate ccxml
-        ccxml_path = __generate_ccxml(ccs_path, serno=ccxml_args['serno'],
-                                     devicetype=ccxml_args['devicetype'],
-                                     connection=ccxml_args['connection'],
-                                     debug=debug)
+        flash = make_ccxml_generator(ccs_path, ccxml_args, debug=debug,
+                                     worker=worker, workspace=workspace)
+        ccxml_path = flash.generate_ccxml(ccxml_args['connection'],
+                                          ccxml_args['devicetype'],
+                                          ccxml_args['serno'])
 
     return ccxml_path
 
 
-def __handle_session(ccs_path, chip=None, timeout=None, devicetype=None,
-                     ccxml=None, connection=None, serno=None, debug=False,
-                     fresh=False, attach=False):
+def make_session(ccs_path, chip=None, timeout=None, devicetype=None,
+                 ccxml=None, connection=None, serno=None, debug=False,
+                 fresh=False, attach=False, worker=None, workspace=None,
+                 progress=None, timings=None, deadline=None):
     """Takes session args and returns a TIFlash object with given session
     settings
 
@@ -264,7 +322,8 @@ def __handle_session(ccs_path, chip=None, timeout=None, devicetype=None,
     Args:
         ccs_path (str): path to ccs installation
         chip (str, optional): chip/cpu name to use when starting a DS session
-        timeout (float, optional): timeout value to give command
+        timeout (float, optional): timeout value to give each DSS call of
+            a command
         ccxml (str): name (full path) to ccxml file to use (only arg needed if
             ccxml already exists).
         devicetype (str): devicetype to use when generating new ccxml file
@@ -276,7 +335,16 @@ def __handle_session(ccs_path, chip=None, timeout=None, devicetype=None,
             or not)
         attach (bool): option to attach CCS session to device after completing
             an action
-
+        worker (DSSWorker, optional): persistent dss worker (or pool of
+            workers) to run commands on (see start_worker()/start_pool())
+        workspace (str, optional): workspace to use for dss (by default a
+            free workspace is allocated for each dss process)
+        progress (callable, optional): callback called with progress events
+            of long running commands (see TIFlash.set_progress())
+        timings (dict, optional): dict that is filled with the per-phase
+            timings of the command (see TIFlash.timings)
+        deadline (float, optional): wall-clock limit (seconds) of a whole
+            command (see TIFlash.set_deadline())
 
     Returns:
         core.TIFlash: returns a TIFlash object with given session settings
@@ -286,15 +354,40 @@ def __handle_session(ccs_path, chip=None, timeout=None, devicetype=None,
     """
     ccxml_path = __handle_ccxml(ccs_path, ccxml=ccxml, devicetype=devicetype,
                             connection=connection, serno=serno, fresh=fresh,
-                            debug=debug)
+                            debug=debug, worker=worker, workspace=workspace)
+
+    return make_ccxml_session(ccs_path, ccxml_path, chip=chip,
+                              timeout=timeout, debug=debug, attach=attach,
+                              worker=worker, workspace=workspace,
+                              progress=progress, timings=timings,
+                              deadline=deadline)
 
+
+def make_ccxml_session(ccs_path, ccxml_path, chip=None, timeout=None,
+                       debug=False, attach=False, worker=None, workspace=None,
+                       progress=None, timings=None, deadline=None):
+    """Returns a TIFlash object with given session settings using an
+    existing ccxml file (see make_session() for the session args)
+
+    Args:
+        ccs_path (str): path to ccs installation
+        ccxml_path (str): full path to ccxml file to use
+
+    Returns:
+        core.TIFlash: returns a TIFlash object with given session settings
+    """
     chip = chip or __get_cpu_from_ccxml(ccxml_path, ccs_path)
 
     flash = TIFlash(ccs_path)
     flash.set_debug(on=debug)
     flash.set_session(ccxml_path, chip)
     flash.set_timeout(timeout)
+    flash.set_deadline(deadline)
     flash.set_attach(attach)
+    flash.set_worker(worker)
+    flash.set_progress(progress)
+    if timings is not None:
+        flash.timings = timings
     if attach:
         workspace = os.path.basename(ccxml_path)
         workspace = os.path.splitext(workspace)[0]
@@ -305,15 +398,149 @@ def __handle_session(ccs_path, chip=None, timeout=None, devicetype=None,
 
         flash.set_workspace(workspace_path)
 
+    if workspace:
+        flash.set_workspace(workspace)
+
     return flash
 
 
-def get_connections(ccs=None, search=None):
+def start_worker(ccs=None, debug=False):
+    """Starts a persistent dss worker.
+
+    The returned worker can be passed as the 'worker' session arg to any
+    function that takes session args. Commands are then run on the already
+    running worker instead of launching a new ccstudio process per command.
+    The worker should be stopped (worker.stop()) when no longer needed, or
+    used as a context manager.
+
+    Args:
+        ccs (str): version number of CCS to use or path to custom installation
+        debug (bool): option to display debug messages
+
+    Returns:
+        DSSWorker: started dss worker
+
+    Raises:
+        DSSWorkerError: raises if worker fails to start
+    """
+    ccs_path = resolve_ccs(ccs)
+
+    worker = DSSWorker(dss.find_dss(ccs_path), debug=debug)
+    worker.start()
+
+    return worker
+
+
+def start_pool(ccs=None, size=DEFAULT_POOL_SIZE, max_size=None,
+               idle_timeout=None, debug=False):
+    """Starts a warm pool of dss workers.
+
+    Workers are started in the background and kept idle until needed. Each
+    command is run on an already started worker while a replacement worker
+    is started in the background. The pool can be passed as the 'worker'
+    session arg to any function that takes session args. The pool should be
+    stopped (pool.stop()) when no longer needed, or used as a context manager.
+
+    Args:
+        ccs (str): version number of CCS to use or path to custom installation
+        size (int): number of idle workers to keep started
+        max_size (int, optional): max number of workers to run at once
+        idle_timeout (float, optional): stop workers idle for this many
+            seconds (trades startup latency for memory)
+        debug (bool): option to display debug messages
+
+    Returns:
+        DSSWorkerPool: started pool of dss workers
+
+    Raises:
+        DSSWorkerPoolError: raises if pool settings are invalid
+    """
+    ccs_path = resolve_ccs(ccs)
+
+    pool = DSSWorkerPool(dss.find_dss(ccs_path), size=size,
+                         max_size=max_size, idle_timeout=idle_timeout,
+                         debug=debug)
+    pool.start()
+
+    return pool
+
+
+def open_session(ccs=None, **session_args):
+    """Opens a debug session that keeps the device connected across commands.
+
+    CCS installation, ccxml and chip are resolved once. All commands run on
+    the returned Session reuse the same connected debug session until the
+    session is closed. Use as a context manager to close automatically.
+
+    Example:
+        with tiflash.open_session(serno="L1000000") as s:
+            s.erase()
+            s.flash("image.hex")
+            s.reset()
+
+    Args:
+        ccs (str): version number of CCS to use or path to custom installation
+        session_args (**dict): keyword arguments containing settings for
+            the device connection
+
+    Returns:
+        Session: open debug session
+
+    Raises:
+        TIFlashError: raises error if session could not be opened or if
+            'worker' or 'attach' session args are given
+    """
+    for arg in ('worker', 'attach'):
+        if arg in session_args:
+            raise TIFlashError("'%s' session arg can not be used with "
+                               "open_session" % arg)
+
+    ccs_path = resolve_ccs(ccs)
+
+    flash = make_session(ccs_path, **session_args)
+
+    # Worker allocates its own workspace (allows for multiple sessions)
+    worker = DSSWorker(flash.dss_path,
+                       workspace=session_args.get('workspace'),
+                       debug=session_args.get('debug', False))
+    worker.start()
+
+    session = Session(flash, worker)
+
+    # Connect to device
+    try:
+        flash.nop()
+    except Exception:
+        session.close()
+        raise
+
+    return session
+
+
+def cleanup_workspaces(keep=0):
+    """Removes dss workspaces not currently in use by any tiflash process.
+
+    A free workspace is allocated (and reused) for each dss process. This
+    removes those workspaces (i.e. to free up disk space).
+
+    Args:
+        keep (int): number of unused workspaces to keep for reuse
+
+    Returns:
+        list: list of workspace paths removed
+    """
+    return ws.cleanup_workspaces(keep=keep)
+
+
+def get_connections(ccs=None, search=None, progress=None):
     """Gets list of all connections installed on machine (ccs installation)
 
     Args:
         search (str): String to filter connections by
         ccs (str): version number of CCS to use or path to custom installation
+        progress (callable, optional): called with progress events while
+            the connection xmls are parsed (only when not cached yet, see
+            TIFlash.set_progress())
 
     Returns:
         list: list of connection types installed in ccs
@@ -321,9 +548,9 @@ def get_connections(ccs=None, search=None):
     Raises:
         FindCCSError: raises exception if cannot find ccs installation
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    connection_list = connections.get_connections(ccs_path)
+    connection_list = connections.get_connections(ccs_path, progress)
 
     if search:
         connection_list = [ connection for connection in connection_list \
@@ -332,12 +559,15 @@ def get_connections(ccs=None, search=None):
     return connection_list
 
 
-def get_devicetypes(ccs=None, search=None):
+def get_devicetypes(ccs=None, search=None, progress=None):
     """Gets list of all devicetypes installed on machine (ccs installation)
 
     Args:
         search (str): String to filter devices by
         ccs (str): version number of CCS to use or path to custom installation
+        progress (callable, optional): called with progress events while
+            the device xmls are parsed (only when not cached yet, see
+            TIFlash.set_progress())
 
     Returns:
         list: list of device types installed in ccs
@@ -345,9 +575,9 @@ def get_devicetypes(ccs=None, search=None):
     Raises:
         FindCCSError: raises exception if cannot find ccs installation
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    device_list = devices.get_devicetypes(ccs_path)
+    device_list = devices.get_devicetypes(ccs_path, progress)
 
     if search:
         device_list = [ dev for dev in device_list if search in dev ]
@@ -355,12 +585,15 @@ def get_devicetypes(ccs=None, search=None):
     return device_list
 
 
-def get_cpus(ccs=None, search=None):
+def get_cpus(ccs=None, search=None, progress=None):
     """Gets list of all cpus installed on machine (ccs installation)
 
     Args:
         search (str): String to filter cpus by
         ccs (str): version number of CCS to use or path to custom installation
+        progress (callable, optional): called with progress events while
+            the cpu xmls are parsed (only when not cached yet, see
+            TIFlash.set_progress())
 
     Returns:
         list: list of cpus types installed in ccs
@@ -368,9 +601,9 @@ def get_cpus(ccs=None, search=None):
     Raises:
         FindCCSError: raises exception if cannot find ccs installation
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    cpu_list = cpus.get_cpus(ccs_path)
+    cpu_list = cpus.get_cpus(ccs_path, progress)
 
     if search:
         cpu_list = [ cpu for cpu in cpu_list if search in cpu ]
@@ -388,9 +621,9 @@ def list_options(option_id=None, ccs=None, **session_args):
     Returns:
         list(dict): list of option dictionaries
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    ccxml_args = __handle_ccxml_args(ccs_path, **session_args)
+    ccxml_args = resolve_ccxml_args(ccs_path, **session_args)
 
     # Check we received a valid devicetype
     if ccxml_args['devicetype'] is None:
@@ -399,11 +632,13 @@ def list_options(option_id=None, ccs=None, **session_args):
     # Get devicetype for retrieving properties xml
     devicetype = ccxml_args['devicetype']
 
-    dev_prop_xml = flash_properties.get_device_properties_xml(devicetype, ccs_path)
+    dev_prop_xml = flash_properties.get_device_properties_xml(devicetype,
+                                                              ccs_path)
     gen_prop_xml = flash_properties.get_generic_properties_xml(ccs_path)
 
     property_elements = flash_properties.get_property_elements(dev_prop_xml)
-    property_elements.extend(flash_properties.get_property_elements(gen_prop_xml, target="generic"))
+    property_elements.extend(flash_properties.get_property_elements(
+        gen_prop_xml, target="generic"))
 
     # Convert elements to dictionaries
     options = dict()
@@ -429,9 +664,9 @@ def print_options(option_id=None, ccs=None, **session_args):
         ccs (str): version number of CCS to use or path to custom installation
 
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     flash.print_options(option_id=option_id)
 
@@ -508,9 +743,9 @@ def get_option(option_id, pre_operation=None, ccs=None,
     Raises:
         TIFlashError: raises error if option does not exist
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     option_val = flash.get_option(option_id, pre_operation)
 
@@ -533,9 +768,9 @@ def set_option(option_id, option_val, post_operation=None, ccs=None,
     Raises:
         TIFlashError: raises error if option does not exist
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     if post_operation is not None:
         flash.set_operation(post_operation)
@@ -545,7 +780,6 @@ def set_option(option_id, option_val, post_operation=None, ccs=None,
     flash.nop() # Just set option and operation and run
 
 
-
 def reset(options=None, ccs=None, **session_args):
     """Performs a Board Reset on device
 
@@ -553,16 +787,17 @@ def reset(options=None, ccs=None, **session_args):
           options (dict): dictionary of options in the format
               {option_id: option_val}; These options are set first before
               calling reset function.
-          ccs (str): version number of CCS to use or path to custom installation
+          ccs (str): version number of CCS to use or path to custom
+              installation
           session_args (**dict): keyword arguments containing settings for
               the device connection
 
       Returns:
           bool: True if reset was successful; False otherwise
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     return flash.reset(options)
 
@@ -574,7 +809,8 @@ def erase(options=None, ccs=None, **session_args):
           options (dict): dictionary of options in the format
               {option_id: option_val}; These options are set first before
               calling erase function.
-          ccs (str): version number of CCS to use or path to custom installation
+          ccs (str): version number of CCS to use or path to custom
+              installation
           session_args (**dict): keyword arguments containing settings for
               the device connection
 
@@ -584,9 +820,9 @@ def erase(options=None, ccs=None, **session_args):
       Raises:
           TIFlashError: raises error if option invalid
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     return flash.erase(options)
 
@@ -612,9 +848,9 @@ def verify(image, binary=False, address=None, options=None, ccs=None,
     Raises:
         TIFlashError: raises error if option invalid
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     return flash.verify(image, binary=binary, address=address, options=options)
 
@@ -640,41 +876,285 @@ def flash(image, binary=False, address=None, options=None, ccs=None,
     Raises:
         TIFlashError: raises error if option invalid
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     return flash.flash(image, binary=binary, address=address, options=options)
 
 
-def memory_read(address, num_bytes=1, page=0, ccs=None, **session_args):
+def flash_many(image, sernos, max_workers=FLASH_MANY_MAX_WORKERS,
+               binary=False, address=None, options=None, ccs=None,
+               **session_args):
+    """Flashes image to multiple devices concurrently
+
+    Up to 'max_workers' devices are flashed at once. Each device uses its own
+    ccxml file and dss workspace, so devices do not interfere with each
+    other. A failure on one device does not stop the other devices from being
+    flashed.
+
+    Args:
+        image (str): path to image to use for flashing
+        sernos (list): serial numbers of devices to flash
+        max_workers (int): max number of devices to flash at once
+        binary (bool): flashes image as binary if True
+        address(int): offset address to flash image
+        options (dict): dictionary of options in the format
+            {option_id: option_val}; These options are set first before
+            calling flash function.
+        ccs (str): version number of CCS to use or path to custom installation
+        session_args (**dict): keyword arguments containing settings for
+            the device connections ('serno' and 'ccxml' are not allowed)
+
+    Returns:
+        list: list of result dicts (one per serno, in order of 'sernos') of
+        format {'serno': str, 'success': bool, 'error': str or None,
+        'duration': float (seconds), 'timings': dict (see TIFlash.timings)}
+
+    Raises:
+        TIFlashError: raises error if arguments are invalid (i.e. a serno is
+            given more than once)
+    """
+    max_workers = check_flash_many_args(sernos, max_workers, session_args)
+
+    ccs_path = resolve_ccs(ccs)
+
+    results = [None] * len(sernos)
+    pending = list(enumerate(sernos))
+    pending_lock = threading.Lock()
+
+    def flash_boards():
+        while True:
+            with pending_lock:
+                if not pending:
+                    return
+                (i, serno) = pending.pop(0)
+
+            results[i] = __flash_board(ccs_path, image, serno, binary=binary,
+                                       address=address, options=options,
+                                       **session_args)
+
+    threads = list()
+    for i in range(min(max_workers, len(sernos))):
+        t = threading.Thread(target=flash_boards)
+        t.daemon = True
+        t.start()
+        threads.append(t)
+
+    for t in threads:
+        t.join()
+
+    return results
+
+
+def check_flash_many_args(sernos, max_workers, session_args):
+    """Checks the arguments of flash_many() and returns the number of
+    devices to flash at once. Session args that do not apply to flashing
+    many devices ('attach', 'timings') are removed from session_args.
+
+    Args:
+        sernos (list): serial numbers of devices to flash
+        max_workers (int): max number of devices to flash at once
+        session_args (dict): settings for the device connections
+
+    Returns:
+        int: max number of devices to flash at once
+
+    Raises:
+        TIFlashError: raises error if arguments are invalid
+    """
+    if not sernos:
+        raise TIFlashError("Must provide at least one serno to flash")
+
+    if 'serno' in session_args or 'ccxml' in session_args:
+        raise TIFlashError("'serno' and 'ccxml' session args can not be used "
+                           "with flash_many (use 'sernos' instead)")
+
+    # Each serno gets its own ccxml file and probe connection; flashing the
+    # same serno twice at once would race on both
+    duplicates = sorted(set(s for s in sernos if list(sernos).count(s) > 1))
+    if duplicates:
+        raise TIFlashError("Duplicate sernos given to flash_many: %s" %
+                           ", ".join(str(s) for s in duplicates))
+
+    if max_workers is None or max_workers < 1:
+        max_workers = len(sernos)
+
+    session_args.pop('attach', None)
+    session_args.pop('timings', None)   # timings are returned per device
+
+    return max_workers
+
+
+def __flash_board(ccs_path, image, serno, binary=False, address=None,
+                  options=None, **session_args):
+    """Flashes a single device for flash_many() and returns its result dict
+
+    Args:
+        ccs_path (str): path to ccs installation
+        image (str): path to image to use for flashing
+        serno (str): serial number of device to flash
+
+    Returns:
+        dict: result dict of format {'serno': str, 'success': bool,
+        'error': str or None, 'duration': float (seconds), 'timings': dict}
+    """
+    board_result = {'serno': serno, 'success': False, 'error': None,
+                    'duration': None, 'timings': dict()}
+    start = time.time()
+
+    # Use device specific workspace if one was given (dss workspaces can not
+    # be shared); otherwise each dss call allocates a free workspace
+    workspace = session_args.pop('workspace', None)
+    if workspace:
+        workspace = workspace + os.sep + serno
+
+    try:
+        flash = make_session(ccs_path, serno=serno, workspace=workspace,
+                             timings=board_result['timings'],
+                             **session_args)
+        board_result['success'] = flash.flash(image, binary=binary,
+                                              address=address,
+                                              options=options)
+    except Exception as e:
+        board_result['error'] = str(e)
+
+    board_result['duration'] = time.time() - start
+
+    return board_result
+
+
+def memory_read(address, num_bytes=1, page=0, width=8, as_bytes=False,
+                ccs=None, **session_args):
     """Reads specified bytes from memory
 
     Args:
         address (long): memory address to read from
-        num_bytes (int): number of bytes to read
+        num_bytes (int): number of bytes to read (multiple of width / 8)
+        page (int, optional): page number to read memory from
+        width (int, optional): access width in bits (8, 16 or 32)
+        as_bytes (bool, optional): return memory as bytes (8 bit width) or
+            array.array of values (16/32 bit width) instead of a list (see
+            TIFlash.memory_read())
+        ccs (str): version number of CCS to use or path to custom installation
+        session_args (**dict): keyword arguments containing settings for
+            the device connection
+
+    Returns:
+        list: Returns list of values read from memory (bytes or array.array
+        if as_bytes is set; see TIFlash.memory_read() for the order of values)
+    """
+    ccs_path = resolve_ccs(ccs)
+
+    flash = make_session(ccs_path, **session_args)
+
+    return flash.memory_read(address, num_bytes, page, width=width,
+                             as_bytes=as_bytes)
+
+
+def memory_read_many(regions, width=8, ccs=None, **session_args):
+    """Reads many memory regions in a single session (see
+    TIFlash.memory_read_many())
+
+    Example:
+        values = tiflash.memory_read_many([(0x20000000, 4), (0x20001000, 64)],
+                                          serno="L1000000")
+        status = values[0x20000000]
+
+    Args:
+        regions (list): list of regions to read; each region is a tuple of
+            (address, num_bytes) or (address, num_bytes, page). Each region
+            must start at a different address.
+        width (int, optional): access width in bits (8, 16 or 32)
+        ccs (str): version number of CCS to use or path to custom installation
+        session_args (**dict): keyword arguments containing settings for
+            the device connection
+
+    Returns:
+        dict: dict of address (int) to list of values read from region
+
+    Raises:
+        TIFlashError: raises error if two regions start at the same address
+            or a region could not be read
+    """
+    ccs_path = resolve_ccs(ccs)
+
+    flash = make_session(ccs_path, **session_args)
+
+    return flash.memory_read_many(regions, width=width)
+
+
+def memory_watch(address, num_bytes=1, interval=0.1, count=None, page=0,
+                 width=8, ccs=None, **session_args):
+    """Samples a memory region periodically on a single open session
+    (generator, see Session.memory_watch()). The session is closed when the
+    generator completes or is closed.
+
+    Example:
+        for (timestamp, values) in tiflash.memory_watch(0x20000000, 4,
+                                        interval=0.1, serno="L1000000"):
+            print(timestamp, list(values))
+
+    Args:
+        address (long): memory address to sample
+        num_bytes (int, optional): number of bytes to sample
+        interval (float, optional): time between samples (seconds)
+        count (int, optional): number of samples to take (None = sample until
+            the generator is closed)
         page (int, optional): page number to read memory from
+        width (int, optional): access width in bits (8, 16 or 32)
+        ccs (str): version number of CCS to use or path to custom installation
+        session_args (**dict): keyword arguments containing settings for
+            the device connection
+
+    Yields:
+        (float, value): tuple of (timestamp, values) of each sample
+    """
+    session = open_session(ccs=ccs, **session_args)
+    try:
+        for sample in session.memory_watch(address, num_bytes,
+                                           interval=interval, count=count,
+                                           page=page, width=width):
+            yield sample
+    finally:
+        session.close()
+
+
+def memory_dump(address, num_bytes, out_path, page=0, sha256=False, width=8,
+                ccs=None, **session_args):
+    """Dumps memory to a binary file (see TIFlash.memory_dump())
+
+    Args:
+        address (long): memory address to dump from
+        num_bytes (int): number of bytes to dump
+        out_path (str): path of file to write (raw) bytes to
+        page (int, optional): page number to dump memory from
+        sha256 (bool, optional): compute SHA-256 of dumped bytes
+        width (int, optional): access width in bits (8, 16 or 32)
         ccs (str): version number of CCS to use or path to custom installation
         session_args (**dict): keyword arguments containing settings for
             the device connection
 
     Returns:
-        list: Returns list of bytes read from memory
+        str: SHA-256 hex digest of dumped bytes (None if sha256 is False)
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
-    return flash.memory_read(address, num_bytes, page)
+    return flash.memory_dump(address, num_bytes, out_path, page=page,
+                             sha256=sha256, width=width)
 
 
-def memory_write(address, data, page=0, ccs=None, **session_args):
+def memory_write(address, data, page=0, width=8, ccs=None, **session_args):
     """Writes specified data to memory
 
     Args:
         address (long): memory address to read from
-        data (list): list of bytes to write to memory
+        data (list): list of values (of width bits) to write to memory, or
+            bytes-like object of values packed little endian
         page (int, optional): page number to read memory from
+        width (int, optional): access width in bits (8, 16 or 32)
         ccs (str): version number of CCS to use or path to custom installation
         session_args (**dict): keyword arguments containing settings for
             the device connection
@@ -682,11 +1162,11 @@ def memory_write(address, data, page=0, ccs=None, **session_args):
     Raises:
         TIFlashError: raises error when memory read error received
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
-    flash.memory_write(address, data, page=0)
+    flash.memory_write(address, data, page=page, width=width)
 
 
 def register_read(regname, ccs=None, **session_args):
@@ -704,9 +1184,9 @@ def register_read(regname, ccs=None, **session_args):
     Raises:
         TIFlashError: raised if regname is invalid
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     return flash.register_read(regname)
 
@@ -724,13 +1204,110 @@ def register_write(regname, value, ccs=None, **session_args):
     Raises:
         TIFlashError: raised if regname is invalid
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     return flash.register_write(regname, value)
 
 
+def register_read_many(regnames, ccs=None, **session_args):
+    """Reads many registers of device in a single session
+
+    Args:
+        regnames (list): list of register names to read
+        ccs (str): version number of CCS to use or path to custom installation
+        session_args (**dict): keyword arguments containing settings for
+            the device connection
+
+    Returns:
+        dict: dict of register name to register value
+
+    Raises:
+        TIFlashError: raised if a regname is invalid
+    """
+    ccs_path = resolve_ccs(ccs)
+
+    flash = make_session(ccs_path, **session_args)
+
+    return flash.register_read_many(regnames)
+
+
+def register_snapshot(regnames=None, ccs=None, **session_args):
+    """Reads a snapshot of the device's registers in a single session
+
+    When no register names are given, the core registers of the supported
+    device families are read; registers the device does not have are left
+    out of the snapshot.
+
+    Args:
+        regnames (list, optional): list of register names to read
+        ccs (str): version number of CCS to use or path to custom installation
+        session_args (**dict): keyword arguments containing settings for
+            the device connection
+
+    Returns:
+        dict: dict of register name to register value
+
+    Raises:
+        TIFlashError: raises error if a register could not be read (other
+            than it not existing) or none of the registers exist
+    """
+    ccs_path = resolve_ccs(ccs)
+
+    flash = make_session(ccs_path, **session_args)
+
+    return flash.register_snapshot(regnames)
+
+
+def register_write_many(values, ccs=None, **session_args):
+    """Writes many registers of device in a single session
+
+    Args:
+        values (dict): dict of register name to value to write (i.e. a
+            snapshot returned by register_snapshot())
+        ccs (str): version number of CCS to use or path to custom installation
+        session_args (**dict): keyword arguments containing settings for
+            the device connection
+
+    Raises:
+        TIFlashError: raised if a regname is invalid
+    """
+    ccs_path = resolve_ccs(ccs)
+
+    flash = make_session(ccs_path, **session_args)
+
+    flash.register_write_many(values)
+
+
+def register_diff(before, after):
+    """Compares two register snapshots (see register_snapshot())
+
+    Example:
+        before = tiflash.register_snapshot(serno="L1000000")
+        ...
+        after = tiflash.register_snapshot(serno="L1000000")
+        for (name, (old, new)) in tiflash.register_diff(before, after).items():
+            print("%s: 0x%X -> 0x%X" % (name, old, new))
+
+    Args:
+        before (dict): previous snapshot of format {regname: value}
+        after (dict): current snapshot of format {regname: value}
+
+    Returns:
+        dict: dict of changed registers of format {regname: (old, new)};
+        registers only found in one snapshot have None as the missing value
+    """
+    diff = dict()
+    for regname in set(before) | set(after):
+        old = before.get(regname)
+        new = after.get(regname)
+        if old != new:
+            diff[regname] = (old, new)
+
+    return diff
+
+
 def evaluate(expr, symbol_file=None, ccs=None, **session_args):
     """Evaluates the given C/GEL expression
 
@@ -747,13 +1324,118 @@ def evaluate(expr, symbol_file=None, ccs=None, **session_args):
     Raises:
         TIFlashError: raises error when expression error is raised
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     return flash.evaluate(expr, symbol_file=symbol_file)
 
 
+def evaluate_many(exprs, symbol_file=None, ccs=None, **session_args):
+    """Evaluates many C/GEL expressions in a single session. The symbol file
+    is only loaded once for all expressions.
+
+    Example:
+        results = tiflash.evaluate_many(["counter", "state"],
+                                        symbol_file="app.out",
+                                        serno="L1000000")
+        for r in results:
+            print(r['expression'], r['result'] if r['success'] else r['error'])
+
+    Args:
+        exprs (list): list of C or GEL expressions
+        symbol_file (str): .out or GEL symbol file to load before evaluating
+        ccs (str): version number of CCS to use or path to custom installation
+        session_args (**dict): keyword arguments containing settings for
+            the device connection
+
+    Returns:
+        list: list of expression result dicts (one per expression, in order)
+        of format {'expression': str, 'success': bool, 'result': str or None,
+        'error': str or None}
+
+    Raises:
+        TIFlashError: raises error if the session could not be started or the
+            symbol file could not be loaded
+    """
+    ccs_path = resolve_ccs(ccs)
+
+    flash = make_session(ccs_path, **session_args)
+
+    return flash.evaluate_many(exprs, symbol_file=symbol_file)
+
+
+def run_pipeline(steps, ccs=None, **session_args):
+    """Runs an ordered list of commands in a single dss invocation
+
+    Each step is a dict containing the 'command' to run along with the
+    keyword arguments of that command. Supported commands are: reset, erase,
+    verify, flash, memory_read, memory_write, register_read, register_write,
+    register_read_many, register_write_many and evaluate (keyword arguments
+    match the function of the same name).
+    Steps are run in order, stopping on the first step that fails.
+
+    Example:
+        steps = [   {'command': 'erase'},
+                    {'command': 'flash', 'image': 'image.hex'},
+                    {'command': 'verify', 'image': 'image.hex'},
+                    {'command': 'reset'},
+                    {'command': 'memory_read', 'address': 0x20000000,
+                        'num_bytes': 4}  ]
+
+    Args:
+        steps (list): list of step dicts
+        ccs (str): version number of CCS to use or path to custom installation
+        session_args (**dict): keyword arguments containing settings for
+            the device connection
+
+    Returns:
+        list: list of step result dicts (one per step) of format
+        {'command': str, 'success': bool, 'result': value,
+        'error': str or None}
+
+    Raises:
+        TIFlashError: raises error if a step is invalid or the session could
+            not be started
+    """
+    ccs_path = resolve_ccs(ccs)
+
+    flash = make_session(ccs_path, **session_args)
+
+    return build_pipeline(flash, steps).run()
+
+
+def build_pipeline(flash, steps):
+    """Returns a Pipeline of flash with the given steps added (see
+    run_pipeline())
+
+    Args:
+        flash (TIFlash): TIFlash object (with session set) to run pipeline on
+        steps (list): list of step dicts
+
+    Returns:
+        Pipeline: pipeline with steps added
+
+    Raises:
+        TIFlashError: raises error if a step is invalid
+    """
+    pipeline = flash.pipeline()
+    for step in steps:
+        step = dict(step)
+        command = str(step.pop('command', '')).replace('-', '_')
+
+        if command not in PIPELINE_COMMANDS:
+            raise TIFlashError("Invalid pipeline command: %s" % command)
+
+        try:
+            getattr(pipeline, command)(**step)
+        except TypeError as e:
+            raise TIFlashError("Invalid arguments for '%s' step: %s" %
+                               (command, e))
+
+    return pipeline
+
+
 def attach(ccs=None, **session_args):
     """Attach command; opens a CCS session and attaches to device.
 
@@ -768,9 +1450,9 @@ def attach(ccs=None, **session_args):
     # Set attach for session args
     session_args['attach'] = True
 
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     flash.nop()
 
@@ -787,9 +1469,9 @@ def nop(ccs=None, **session_args):
     Raises:
         TIFlashError: raises error when expression error is raised
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    flash = __handle_session(ccs_path, **session_args)
+    flash = make_session(ccs_path, **session_args)
 
     flash.nop()
 
@@ -809,9 +1491,9 @@ def xds110_reset(ccs=None, **session_args):
         TIFlashError: raises if serno not set
         XDS110Error: raises if xds110_reset fails
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    ccxml_args = __handle_ccxml_args(ccs_path, **session_args)
+    ccxml_args = resolve_ccxml_args(ccs_path, **session_args)
 
     if ccxml_args['serno'] is None :
         raise TIFlashError("Must provide 'serno' to call xds110_reset")
@@ -819,9 +1501,9 @@ def xds110_reset(ccs=None, **session_args):
     return xds110.xds110_reset(ccs_path, serno=ccxml_args['serno'])
 
 
-
 def xds110_list(ccs=None, **session_args):
-    """Returns list of sernos and xds110 version numbers of connected XDS110 devices.
+    """Returns list of sernos and xds110 version numbers of connected XDS110
+    devices.
 
     Args:
         ccs (str): version number of CCS to use or path to custom installation
@@ -834,7 +1516,7 @@ def xds110_list(ccs=None, **session_args):
     Raises:
         XDS110Error: raises if xdsdfu does not exist or fails
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
     return xds110.xds110_list(ccs_path)
 
@@ -858,22 +1540,23 @@ def xds110_upgrade(ccs=None, **session_args):
         XDS110Error: raises if xds110 firmware update fails
     """
 
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
-    ccxml_args = __handle_ccxml_args(ccs_path, **session_args)
+    ccxml_args = resolve_ccxml_args(ccs_path, **session_args)
 
     if ccxml_args['serno'] is None :
         raise TIFlashError("Must provide 'serno' to call xds110_upgrade")
 
     return xds110.xds110_upgrade(ccs_path, serno=ccxml_args['serno'])
 
+
 def detect_devices(ccs=None, **session_args):
     """Detect devices connected to machine.
 
     Returns:
         list: list of dictionaries describing connected devices
     """
-    ccs_path = __handle_ccs(ccs)
+    ccs_path = resolve_ccs(ccs)
 
     device_list = list()
     detected_devices = detect.detect_devices()
@@ -882,14 +1565,15 @@ def detect_devices(ccs=None, **session_args):
         try:
             connection_xml = connections.get_connection_xml_from_vidpid(
                 vid, pid, ccs_path)
-            connection = connections.get_connection_name(connection_xml)
+            connection = connections.get_connection_name(connection_xml,
+                                                         ccs_path)
         except connections.ConnectionsError:
             continue # only include TI Devices
 
         try:
             devicetype_xml = devices.get_device_xml_from_serno(
                                                     serno, ccs_path)
-            devicetype = devices.get_devicetype(devicetype_xml)
+            devicetype = devices.get_devicetype(devicetype_xml, ccs_path)
         except devices.DeviceError:
             devicetype = None
 
@@ -901,6 +1585,7 @@ def detect_devices(ccs=None, **session_args):
 
     return device_list
 
+
 def get_info(ccs=None, **session_args):
     """Returns dict of information regarding tiflash environment
 
@@ -912,17 +1597,23 @@ def get_info(ccs=None, **session_args):
     """
     info_dict = dict()
     try:
-        ccs_path = __handle_ccs(ccs)
+        ccs_path = resolve_ccs(ccs)
     except:
         ccs_path = None
 
+    # Version and drivers come from the (cached) ccs installation index
+    installation = None
+    if ccs_path is not None:
+        installation = get_ccs_installation(ccs_path)
+
     info_dict['tiflash version'] = __version__
     info_dict['release date'] = release_date
     info_dict['python version'] = python_version()
-    info_dict['ccs version'] = get_ccs_version(ccs_path) if ccs_path is not None else "N/A"
+    info_dict['ccs version'] = installation['version'] \
+        if installation is not None else "N/A"
     info_dict['ccs location'] = ccs_path if ccs_path is not None else "N/A"
     info_dict['ccs prefix'] = get_ccs_prefix()
-    info_dict['device drivers'] = ','.join(get_ccs_pf_filters(ccs_path)) if ccs_path is not None else "N/A"
+    info_dict['device drivers'] = ','.join(installation['pf_filters']) \
+        if installation is not None else "N/A"
 
     return info_dict
-
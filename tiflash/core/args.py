@@ -1,4 +1,5 @@
 import argparse
+import sys
 
 
 def get_session_args(args):
@@ -19,6 +20,8 @@ def get_session_args(args):
         session_args['ccxml'] = args.ccxml
     if args.timeout:
         session_args['timeout'] = args.timeout
+    if args.deadline:
+        session_args['deadline'] = args.deadline
     if args.devicetype:
         session_args['devicetype'] = args.devicetype
     if args.connection:
@@ -33,9 +36,48 @@ def get_session_args(args):
         session_args['fresh'] = args.fresh
     if args.attach:
         session_args['attach'] = args.attach
+    if args.progress:
+        session_args['progress'] = print_progress
+    if isinstance(args.timings, dict):
+        session_args['timings'] = args.timings
 
     return session_args
 
+
+def print_progress(event):
+    """Renders a progress event (see TIFlash.set_progress()) on a single,
+    updating line of stderr.
+
+    Args:
+        event (dict): progress event
+    """
+    line = "%-8s %6.1fs" % (event['phase'], event['elapsed'])
+    if event.get('total'):
+        line += "  %d/%d %s (%d%%)" % (event['done'], event['total'],
+                                       event.get('unit', "bytes"),
+                                       100 * event['done'] / event['total'])
+
+    end = "\n" if event['status'] == 'done' else ""
+    sys.stderr.write("\r%-60s%s" % (line, end))
+    sys.stderr.flush()
+
+
+def print_timings(timings):
+    """Prints per-phase timings (see TIFlash.timings) of the last command to
+    stderr, slowest phase first.
+
+    Args:
+        timings (dict): dict of phase name to time (seconds)
+    """
+    if not timings:
+        return
+
+    sys.stderr.write("%-14s %s\n" % ("phase", "time"))
+    for phase in sorted(timings, key=timings.get, reverse=True):
+        sys.stderr.write("%-14s %.3fs\n" % (phase, timings[phase]))
+    sys.stderr.flush()
+
+
 def set_subparser_arg_titles(parser, positionals=None, optionals=None):
     parser._positionals.title = positionals or "Command Arguments"
     parser._optionals.title = optionals or "Command Arguments"
@@ -52,13 +94,19 @@ SessionParser.add_argument('--connection', default=None,
                            help='Connection type to use for device')
 SessionParser.add_argument('--chip', help='Device core to use')
 SessionParser.add_argument('-t', '--timeout', default=None, type=float,
-                           help='Timeout to use for command (seconds)')
+                           help='Timeout to use for each DSS call (seconds)')
+SessionParser.add_argument('--deadline', default=None, type=float,
+                           help='Time limit of whole command (seconds)')
 SessionParser.add_argument('-F', '--fresh', action='store_true',
                            help='Generate new (fresh) ccxml')
 SessionParser.add_argument('-D', '--debug', action='store_true',
                            help='Display debugging output')
 SessionParser.add_argument('-A', '--attach', action='store_true',
                            help='Attach CCS to Device after performing action')
+SessionParser.add_argument('-P', '--progress', action='store_true',
+                           help='Display progress of flash/erase/verify/list')
+SessionParser.add_argument('--timings', action='store_true',
+                           help='Display time spent in each phase of command')
 
 
 # Option Parser - used for getting/setting options
@@ -134,6 +182,13 @@ FlashParser.add_argument('-a', '--address', metavar='address',
 FlashParser.add_argument('-o', '--option', nargs=2, action='append',
                          dest='options', metavar=('optionID', 'optionValue'),
                          help='sets an option before running flash cmd')
+FlashParser.add_argument('-s', '--serno', action='append', dest='sernos',
+                         metavar='serno', help='''Serial number of device to
+                         flash. Repeat to flash multiple devices in
+                         parallel''')
+FlashParser.add_argument('-j', '--jobs', type=int, default=None,
+                         help='''Max number of devices to flash at once (when
+                         flashing multiple devices)''')
 
 # Memory Read Parser
 MemoryReadParser = argparse.ArgumentParser(add_help=False)
@@ -144,6 +199,57 @@ MemoryReadParser.add_argument('-n', '--num', dest='num_bytes', default=1,
                             help="Number of bytes to read")
 MemoryReadParser.add_argument('--hex', action='store_true',
                             help="Displays output in hex")
+MemoryReadParser.add_argument('-w', '--width', type=int, default=8,
+                            choices=(8, 16, 32),
+                            help="Access width in bits (default: 8)")
+
+# Memory Read Many Parser
+MemoryReadManyParser = argparse.ArgumentParser(add_help=False)
+MemoryReadManyParser.add_argument('regions', help="""File listing the memory
+                            regions to read, one region per line as
+                            '<address> <num_bytes> [page]' (lines starting
+                            with '#' are ignored)""")
+MemoryReadManyParser.add_argument('--hex', action='store_true',
+                            help="Displays output in hex")
+MemoryReadManyParser.add_argument('-w', '--width', type=int, default=8,
+                            choices=(8, 16, 32),
+                            help="Access width in bits (default: 8)")
+
+# Memory Watch Parser
+MemoryWatchParser = argparse.ArgumentParser(add_help=False)
+MemoryWatchParser.add_argument('-a', '--address', required=True,
+                            help="Address in memory to sample")
+MemoryWatchParser.add_argument('-n', '--num-bytes', dest='num_bytes', type=int,
+                            default=1, help="Number of bytes to sample")
+MemoryWatchParser.add_argument('-i', '--interval', type=float, default=0.1,
+                            help="Time between samples (seconds)")
+MemoryWatchParser.add_argument('-c', '--count', type=int, default=None,
+                            help="Number of samples to take (default: until "
+                            "interrupted)")
+MemoryWatchParser.add_argument('-o', '--out', default=None,
+                            help="CSV file to write samples to (default: "
+                            "stdout)")
+MemoryWatchParser.add_argument('-p', '--page', default=0,
+                            help="Page number in memory to access address")
+MemoryWatchParser.add_argument('-w', '--width', type=int, default=8,
+                            choices=(8, 16, 32),
+                            help="Access width in bits (default: 8)")
+
+# Memory Dump Parser
+MemoryDumpParser = argparse.ArgumentParser(add_help=False)
+MemoryDumpParser.add_argument('address', help="Address in memory to dump from")
+MemoryDumpParser.add_argument('num_bytes', metavar='length',
+                            type=lambda s: int(s, 0),
+                            help="Number of bytes to dump")
+MemoryDumpParser.add_argument('-o', '--output', required=True,
+                            help="File to write (raw) bytes to")
+MemoryDumpParser.add_argument('-p', '--page', default=0,
+                            help="Page number in memory to access address")
+MemoryDumpParser.add_argument('--sha256', action='store_true',
+                            help="Displays SHA-256 of dumped bytes")
+MemoryDumpParser.add_argument('-w', '--width', type=int, default=8,
+                            choices=(8, 16, 32),
+                            help="Access width in bits (default: 8)")
 
 # Memory Write Parser
 MemoryWriteParser = argparse.ArgumentParser(add_help=False)
@@ -151,8 +257,12 @@ MemoryWriteParser.add_argument('address', help="Address in memory to write to")
 MemoryWriteParser.add_argument('-p', '--page', default=0,
                             help="Page number in memory to access address")
 MemoryWriteParser.add_argument('-d', '--data', nargs='+', required=True,
-                            help="""Bytes (hex) to write to memory.
-                            Each byte separated by a space""")
+                            help="""Values (bytes unless --width is given)
+                            to write to memory. Each value separated by a
+                            space""")
+MemoryWriteParser.add_argument('-w', '--width', type=int, default=8,
+                            choices=(8, 16, 32),
+                            help="Access width in bits (default: 8)")
 
 # Register Read Parser
 RegisterReadParser = argparse.ArgumentParser(add_help=False)
@@ -166,6 +276,17 @@ RegisterWriteParser.add_argument('regname', help="Name of register to read.")
 RegisterWriteParser.add_argument('value',
                             help="Value (32bit hex) to write to register.")
 
+# Register Dump Parser
+RegisterDumpParser = argparse.ArgumentParser(add_help=False)
+RegisterDumpParser.add_argument('regnames', nargs='*',
+                            help="""Names of registers to dump (default: core
+                            registers of the device)""")
+RegisterDumpParser.add_argument('--hex', action='store_true',
+                            help="Displays values in hex")
+RegisterDumpParser.add_argument('-o', '--output',
+                            help="JSON file to write snapshot to (default: "
+                            "stdout)")
+
 # Expression Parser
 ExpressionParser = argparse.ArgumentParser(add_help=False)
 ExpressionParser.add_argument('expression',
@@ -174,6 +295,22 @@ ExpressionParser.add_argument('--symbols', required=False, default=None,
                             help=""".out or GEL symbol file to load before
                             evaluating expression.""")
 
+# Expression Many Parser
+ExpressionManyParser = argparse.ArgumentParser(add_help=False)
+ExpressionManyParser.add_argument('expressions',
+                            help="""File listing the C or GEL expressions to
+                            evaluate (one per line; blank lines and lines
+                            starting with '#' are ignored)""")
+ExpressionManyParser.add_argument('--symbols', required=False, default=None,
+                            help=""".out or GEL symbol file to load (once)
+                            before evaluating expressions.""")
+
+# Run Parser
+RunParser = argparse.ArgumentParser(add_help=False)
+RunParser.add_argument('plan', help="""JSON plan file containing list of steps
+                       to run (i.e. [{"command": "erase"}, {"command":
+                       "flash", "image": "image.hex"}])""")
+
 # Attach Parser
 AttachParser = argparse.ArgumentParser(add_help=False)
 
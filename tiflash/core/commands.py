@@ -0,0 +1,805 @@
+"""
+Builds the dss arguments of TIFlash commands and parses their results.
+
+Shared by TIFlash (tiflash/core/core.py) and AsyncTIFlash (tiflash/aio.py).
+Each command function takes the session args (TIFlash.args) and returns a
+Command holding the arguments to run and how to parse the result, so the two
+only differ in how they run the arguments with dss.
+"""
+
+import os
+import io
+import sys
+import copy
+import json
+import array
+import struct
+import binascii
+import hashlib
+import functools
+import time
+import tempfile
+
+from tiflash.utils import dss
+from tiflash.utils import ccxml
+
+# struct formats/array typecodes of memory values for each access width
+MEMORY_FORMATS = {8: 'B', 16: 'H', 32: 'I'}
+MEMORY_TYPECODES = {8: 'B', 16: 'H',
+                    32: 'I' if array.array('I').itemsize == 4 else 'L'}
+
+# registers read by register_snapshot() when no register names are given
+# (core registers of the supported device families; registers the device's
+# core does not have are skipped)
+SNAPSHOT_REGISTERS = sum([
+    # ARM (Cortex-M/R/A)
+    ['R%d' % i for i in range(13)], ['SP', 'LR', 'PC', 'XPSR'],
+    # MSP430 (R0-R2 are PC, SP and SR)
+    ['SR', 'R13', 'R14', 'R15'],
+    # C28x
+    ['ACC', 'XT', 'P', 'DP', 'RPC', 'ST0', 'ST1', 'IER', 'IFR'],
+    ['XAR%d' % i for i in range(8)],
+], [])
+
+
+class TIFlashError(Exception):
+    """Generic TI Flash error"""
+    pass
+
+
+class TIFlashTimeoutError(TIFlashError):
+    """Command did not complete before its deadline (the dss process was
+    killed).
+
+    Attributes:
+        output (str): last output of the dss process before it was killed
+    """
+    def __init__(self, message, output=None):
+        super(TIFlashTimeoutError, self).__init__(message)
+        self.output = output
+
+
+class DumpWriter(object):
+    """File wrapper used as sink of memory dumps; counts the bytes written
+    and (optionally) hashes them.
+
+    Args:
+        f (file): binary file to write dumped data to
+        digest (hashlib hash, optional): hash to update with dumped data
+    """
+
+    def __init__(self, f, digest=None):
+        self.f = f
+        self.digest = digest
+        self.size = 0
+
+    def write(self, data):
+        self.f.write(data)
+        self.size += len(data)
+        if self.digest is not None:
+            self.digest.update(data)
+
+
+class Command(object):
+    """dss command of a TIFlash operation and how to parse its result.
+
+    Run a command by running args with dss, calling finish() and then
+    parse() with the (code, result) of the dss call.
+
+    Args:
+        args (dict): argument dictionary to run (None if there is nothing to
+            run; the result of the operation is then parse(True, None))
+        parse (function): returns the result of the operation given the
+            (code, result) of the dss call; raises TIFlashError if it failed
+        sink (file, optional): file object to stream data posted by the
+            command to (i.e. memory dumps)
+        cleanup (function, optional): called by finish() (i.e. to close or
+            remove files used by the command)
+    """
+
+    def __init__(self, args, parse, sink=None, cleanup=None):
+        self.args = args
+        self.parse = parse
+        self.sink = sink
+        self.cleanup = cleanup
+
+    def finish(self):
+        """Cleans up after the command ran (or failed to run)"""
+        if self.cleanup is not None:
+            self.cleanup()
+
+
+def finish_call(call_result, timings, call_timings, start):
+    """Decodes the result of a dss call and sets timings to the timings of
+    the command.
+
+    Timings are updated in place (so a dict passed by the caller, see api
+    session args, sees them).
+
+    Args:
+        call_result (tuple or DSSError): (retcode, retval) returned by the
+            dss call, or the DSSError it raised
+        timings (dict): dict to set the per-phase timings of the command in
+        call_timings (dict): timings measured on the python side
+        start (float): time the command was started
+
+    Returns:
+        (bool, value): tuple of format (result, value) where result is a
+        boolean based off of the success/failure of running the command and
+        'value' is the (typed) return value or error message passed by
+        javascript side.
+
+    Raises:
+        TIFlashTimeoutError: raised if command did not complete before
+            the deadline
+    """
+    if isinstance(call_result, dss.DSSTimeoutError):
+        raise TIFlashTimeoutError(str(call_result),
+                                  output=call_result.output)
+    if isinstance(call_result, dss.DSSError):
+        return (False, str(call_result))
+
+    (retcode, retval, envelope) = dss.decode_result(*call_result)
+
+    timings.clear()
+    if envelope is not None:
+        timings.update(envelope.get('timings') or {})
+    timings.update(call_timings)
+    timings['total'] = time.time() - start
+
+    return (retcode, retval)
+
+
+def command_args(args, command, command_args=True, options=None):
+    """Returns a copy of args with the given command (and options) added.
+
+    Args:
+        args (dict): session args (see TIFlash.args)
+        command (str): name of command to add (i.e. 'flash', 'reset')
+        command_args (dict or bool): arguments of command (True if
+            command takes no arguments)
+        options (dict, optional): dictionary of options in the format
+            {option_id: option_val}; These options are set first before
+            running the command (and do not persist).
+
+    Returns:
+        dict: argument dictionary to run
+    """
+    # Make a copy of args so we are not modifying directly
+    args = copy.deepcopy(args)
+
+    if options is not None:
+        if 'setoption' not in args.keys():
+            args['setoption'] = dict()
+        args['setoption'].update(options)
+
+    args[command] = command_args
+
+    return args
+
+
+def flash_args(image, binary=False, address=None):
+    """Returns arguments for 'flash' command"""
+    flash_args = {'image': os.path.abspath(image)}
+    if binary:
+        flash_args['binary'] = True
+    if address:
+        flash_args['address'] = str(address)
+
+    return flash_args
+
+
+def verify_args(image, binary=False, address=None):
+    """Returns arguments for 'verify' command"""
+    verify_args = {'image': os.path.abspath(image)}
+    if binary:
+        verify_args['bin'] = True
+    if address:
+        verify_args['address'] = str(address)
+
+    return verify_args
+
+
+def parse_num_bytes(num_bytes):
+    """Returns num_bytes as an int (may be given as string, i.e. '0x10')"""
+    try:
+        return int(str(num_bytes), 0)
+    except ValueError:
+        raise TIFlashError("Invalid number of bytes: %s" % num_bytes)
+
+
+def check_width(num_bytes, width):
+    """Raises error if width is not a valid access width for num_bytes"""
+    if width not in MEMORY_FORMATS:
+        raise TIFlashError("Invalid access width: %s (must be 8, 16 or "
+                           "32)" % width)
+
+    if num_bytes % (width // 8):
+        raise TIFlashError("Number of bytes (%s) must be a multiple of "
+                           "the access width (%d bits)" %
+                           (num_bytes, width))
+
+
+def memory_read_args(address, num_bytes=1, page=0, width=8):
+    """Returns arguments for 'memory' read command"""
+    num_bytes = parse_num_bytes(num_bytes)
+    check_width(num_bytes, width)
+
+    memory_args = {'read': True}
+    memory_args['address'] = str(address)
+    memory_args['numBytes'] = str(num_bytes)
+    memory_args['page'] = str(page)
+    memory_args['width'] = str(width)
+
+    return memory_args
+
+
+def memory_dump_args(address, num_bytes, page=0, width=8):
+    """Returns arguments for 'memory' dump command"""
+    num_bytes = parse_num_bytes(num_bytes)
+    check_width(num_bytes, width)
+
+    memory_args = {'dump': True}
+    memory_args['address'] = str(address)
+    memory_args['numBytes'] = str(num_bytes)
+    memory_args['page'] = str(page)
+    memory_args['width'] = str(width)
+
+    return memory_args
+
+
+def memory_write_args(address, data, page=0, width=8):
+    """Returns arguments for 'memory' write command"""
+    raw = pack_memory_data(data, width)
+    check_width(len(raw), width)
+
+    memory_args = {'write': True}
+    memory_args['address'] = str(address)
+    memory_args['hex'] = binascii.hexlify(raw).decode('ascii')
+    memory_args['page'] = str(page)
+    memory_args['width'] = str(width)
+
+    return memory_args
+
+
+def pack_memory_data(data, width):
+    """Returns data to write as bytes (values packed little endian).
+    Bytes-like data is taken as already packed."""
+    if width not in MEMORY_FORMATS:
+        raise TIFlashError("Invalid access width: %s (must be 8, 16 or "
+                           "32)" % width)
+
+    try:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytes(bytearray(data))
+
+        data = list(data)
+        return struct.pack("<%d%s" % (len(data), MEMORY_FORMATS[width]),
+                           *data)
+    except (TypeError, ValueError, struct.error) as e:
+        raise TIFlashError("Invalid memory data (must be %d bit values): "
+                           "%s" % (width, e))
+
+
+def unpack_memory_data(raw, width):
+    """Returns raw memory (values packed little endian) as bytes (8 bit
+    width) or an array of values (16/32 bit width)"""
+    if width == 8:
+        return raw
+
+    values = array.array(MEMORY_TYPECODES[width])
+    if hasattr(values, 'frombytes'):
+        values.frombytes(raw)
+    else:
+        values.fromstring(raw)
+    if sys.byteorder == 'big':
+        values.byteswap()
+
+    return values
+
+
+def parse_region(region):
+    """Returns (address, num_bytes, page) of a memory region tuple
+    (address may be given as string, i.e. '0x20000000')"""
+    try:
+        region = list(region)
+        if len(region) not in (2, 3):
+            raise ValueError("must be (address, num_bytes[, page])")
+        if len(region) == 2:
+            region.append(0)
+        (address, num_bytes, page) = [int(v, 0) if hasattr(v, 'lower')
+                                      else int(v) for v in region]
+    except (TypeError, ValueError) as e:
+        raise TIFlashError("Invalid memory region %r: %s" % (region, e))
+
+    return (address, num_bytes, page)
+
+
+def register_read_args(regname):
+    """Returns arguments for 'register' read command"""
+    register_args = {'read': True}
+    register_args['regname'] = str(regname)
+
+    return register_args
+
+
+def register_write_args(regname, value):
+    """Returns arguments for 'register' write command"""
+    register_args = {'write': True}
+    register_args['regname'] = str(regname)
+    register_args['value'] = str(value)
+
+    return register_args
+
+
+def register_read_many_args(regnames, skip_missing=False):
+    """Returns arguments for 'register' read many command"""
+    register_args = {'readmany': True}
+    register_args['names'] = " ".join(str(r) for r in regnames)
+    if skip_missing:
+        register_args['skipmissing'] = True
+
+    return register_args
+
+
+def register_write_many_args(values):
+    """Returns arguments for 'register' write many command"""
+    register_args = {'writemany': True}
+    register_args['values'] = " ".join("%s=%s" % (r, values[r])
+                                       for r in values)
+
+    return register_args
+
+
+def evaluate_args(expr, symbol_file=None):
+    """Returns arguments for 'evaluate' command"""
+    expression_args = {'expression': expr}
+
+    if symbol_file is not None:
+        expression_args['symbols'] = symbol_file
+
+    return expression_args
+
+
+def evaluate_many_args(exprs_path, symbol_file=None):
+    """Returns arguments for 'evaluate' many command (exprs_path is a
+    JSON file listing the expressions, see write_expressions_file())"""
+    expression_args = {'file': exprs_path}
+
+    if symbol_file is not None:
+        expression_args['symbols'] = symbol_file
+
+    return expression_args
+
+
+def write_expressions_file(exprs):
+    """Writes expressions to a temporary JSON file (expressions may
+    contain characters that can not be passed on dss's command line).
+    Caller is responsible for removing the file.
+
+    Returns:
+        str: path to expressions file
+    """
+    (fd, exprs_path) = tempfile.mkstemp(prefix="tiflash-exprs-",
+                                        suffix=".json")
+    with os.fdopen(fd, 'w') as f:
+        json.dump(list(exprs), f)
+
+    return exprs_path
+
+
+def write_plan_file(pipeline):
+    """Writes the formatted args of each step of the pipeline to a
+    temporary JSON file (read by js/plan.js) and returns its path; the
+    caller removes the file"""
+    plan = [dss.format_args(step['args']) for step in pipeline.steps]
+
+    (fd, plan_path) = tempfile.mkstemp(prefix="tiflash-plan-",
+                                       suffix=".json")
+    with os.fdopen(fd, 'w') as f:
+        json.dump([[str(a) for a in step] for step in plan], f)
+
+    return plan_path
+
+
+def parse_bool_result(code, result):
+    """Returns True if command succeeded. Raises error message if command
+    failed with an error message, otherwise returns False.
+    """
+    if not code:
+        if result:
+            raise TIFlashError(result)
+        return False
+    else:
+        return True
+
+
+def parse_no_result(code, result):
+    """Raises error message if command failed"""
+    if not code:
+        raise TIFlashError(result)
+
+
+def parse_string_result(code, result):
+    """Returns result string. Raises error message if command failed"""
+    if not code:
+        raise TIFlashError(result)
+
+    return dss.format_value(result)
+
+
+def parse_memory_result(code, result, width=8):
+    """Returns list of values read (bytes are in reverse address order,
+    wider values in address order). Raises error message if command
+    failed
+    """
+    if not code:
+        raise TIFlashError(result)
+    else:
+        parsed_result = list(result)
+        if width == 8:
+            parsed_result.reverse()  # Reverse order
+        return parsed_result
+
+
+def parse_dump_result(code, result, num_bytes, writer):
+    """Returns SHA-256 hex digest of dumped data (None if not hashed).
+    Raises error message if command failed or dump is incomplete"""
+    if not code:
+        raise TIFlashError(result)
+
+    if writer.size != num_bytes:
+        raise TIFlashError("Memory dump incomplete (%d of %d bytes)" %
+                           (writer.size, num_bytes))
+
+    return writer.digest.hexdigest() if writer.digest else None
+
+
+def parse_raw_memory_result(code, result, num_bytes, writer, width):
+    """Returns memory read into writer (see unpack_memory_data()).
+    Raises error message if command failed"""
+    parse_dump_result(code, result, num_bytes, writer)
+
+    return unpack_memory_data(writer.f.getvalue(), width)
+
+
+def parse_register_result(code, result):
+    """Returns register value. Raises error message if command failed"""
+    if not code:
+        raise TIFlashError(result)
+    else:
+        parsed_result = dss.parse_response_number(result)
+        return parsed_result
+
+
+def parse_registers_result(code, result):
+    """Returns dict of register values. Raises error message if command
+    failed"""
+    if not code:
+        raise TIFlashError(result)
+    else:
+        return dict((str(r), int(result[r])) for r in result)
+
+
+def parse_expressions_result(code, result, exprs):
+    """Returns list of expression result dicts (one per expression).
+    Raises error message if command failed"""
+    if not code or type(result) is not list:
+        raise TIFlashError(result or "Could not evaluate expressions")
+
+    results = list()
+    for (expr, response) in zip(exprs, result):
+        results.append({'expression': expr,
+                        'success': response['error'] is None,
+                        'result': None if response['error'] is not None
+                        else dss.format_value(response['value']),
+                        'error': response['error']})
+
+    return results
+
+
+def parse_pipeline_result(pipeline, code, result):
+    """Returns list of step result dicts (see TIFlash.run_pipeline())"""
+    if not code or type(result) is not list:
+        raise TIFlashError(result or "Could not run pipeline")
+
+    step_responses = result
+
+    results = list()
+    for i, step in enumerate(pipeline.steps):
+        step_result = {'command': step['command'], 'success': False,
+                       'result': None, 'error': None, 'timings': {}}
+
+        if i >= len(step_responses):
+            step_result['error'] = "Skipped (previous step failed)"
+            results.append(step_result)
+            continue
+
+        (step_code, step_value) = dss.decode_envelope(step_responses[i])
+        step_result['timings'] = step_responses[i].get('timings') or {}
+        try:
+            step_result['result'] = step['parse'](step_code, step_value)
+            step_result['success'] = step_result['result'] is not False
+        except TIFlashError as e:
+            step_result['error'] = str(e)
+
+        results.append(step_result)
+
+    return results
+
+
+def parse_memory_read_many_result(addresses, step_results):
+    """Returns dict of address to values read (see
+    TIFlash.memory_read_many())"""
+    values = dict()
+    for address, step in zip(addresses, step_results):
+        if not step['success']:
+            raise TIFlashError("Could not read memory at 0x%X: %s" %
+                               (address, step['error']))
+        values[address] = step['result']
+
+    return values
+
+
+def generate_ccxml(args, ccs_path, connection, devicetype, serno=None):
+    """Returns Command generating a ccxml (see TIFlash.generate_ccxml())"""
+    genccxml_args = dict()
+
+    # Add ccxml directory
+    ccxml_directory = ccxml.get_ccxml_directory()
+    genccxml_args.update({'directory': ccxml_directory})
+
+    # Add ccxml name
+    ccxml_name = "%s.ccxml" % (serno or devicetype)
+    genccxml_args.update({'ccxml': ccxml_name})
+
+    # Add connection
+    genccxml_args.update({'connection': connection})
+
+    # Add devicetype
+    genccxml_args.update({'devicetype': devicetype})
+
+    ccxml_path = "%s/%s" % (ccxml_directory, ccxml_name)
+    ccxml_path = os.path.normpath(ccxml_path)
+
+    def parse(code, msg):
+        if not code or not os.path.exists(ccxml_path):
+            raise TIFlashError(msg)
+
+        # Add serial number to ccxml file
+        if serno:
+            ccxml.add_serno(ccxml_path, serno, ccs_path)
+
+        return ccxml_path
+
+    return Command(command_args(args, 'genccxml', genccxml_args), parse)
+
+
+def get_list(args, list_type):
+    """Returns Command getting a list of 'list_type' elements (see
+    TIFlash.get_list())"""
+    def parse(code, vals):
+        if not code:
+            raise TIFlashError("Could not get %s list" % list_type)
+
+        return dss.parse_response_list(vals)
+
+    return Command(command_args(args, 'list', list_type), parse)
+
+
+def print_options(args, option_id=None):
+    """Returns Command printing device options (see
+    TIFlash.print_options())"""
+    option_args = {'id': option_id} if option_id else True
+
+    def parse(code, vals):
+        if not code:
+            raise TIFlashError("Could not print options")
+
+        return True
+
+    return Command(command_args(args, 'printoptions', option_args), parse)
+
+
+def get_option(args, option_id, pre_operation=None):
+    """Returns Command getting the value of an option (see
+    TIFlash.get_option())"""
+    args = copy.deepcopy(args)
+    if pre_operation:
+        args['operation'] = {'opcode': pre_operation}
+
+    def parse(code, response):
+        if not code:
+            raise TIFlashError("Could not get option: %s" % option_id)
+
+        return dss.format_value(response)
+
+    return Command(command_args(args, 'getoption', {'id': option_id}), parse)
+
+
+def nop(args):
+    """Returns Command running the session args only (see TIFlash.nop())"""
+    return Command(copy.deepcopy(args), parse_no_result)
+
+
+def reset(args, options=None):
+    """Returns Command performing a Board Reset (see TIFlash.reset())"""
+    return Command(command_args(args, 'reset', options=options),
+                   parse_bool_result)
+
+
+def erase(args, options=None):
+    """Returns Command erasing device (see TIFlash.erase())"""
+    return Command(command_args(args, 'erase', options=options),
+                   parse_bool_result)
+
+
+def verify(args, image, binary=False, address=None, options=None):
+    """Returns Command verifying image (see TIFlash.verify())"""
+    return Command(command_args(args, 'verify',
+                                verify_args(image, binary=binary,
+                                            address=address),
+                                options=options),
+                   parse_bool_result)
+
+
+def flash(args, image, binary=False, address=None, options=None):
+    """Returns Command flashing image (see TIFlash.flash())"""
+    return Command(command_args(args, 'flash',
+                                flash_args(image, binary=binary,
+                                           address=address),
+                                options=options),
+                   parse_bool_result)
+
+
+def memory_read(args, address, num_bytes=1, page=0, width=8,
+                as_bytes=False):
+    """Returns Command reading memory (see TIFlash.memory_read())"""
+    if as_bytes:
+        # Memory is streamed like a dump
+        num_bytes = parse_num_bytes(num_bytes)
+        memory_args = memory_dump_args(address, num_bytes, page, width)
+        writer = DumpWriter(io.BytesIO())
+        parse = functools.partial(parse_raw_memory_result,
+                                  num_bytes=num_bytes, writer=writer,
+                                  width=width)
+
+        return Command(command_args(args, 'memory', memory_args), parse,
+                       sink=writer)
+
+    memory_args = memory_read_args(address, num_bytes, page, width)
+    parse = functools.partial(parse_memory_result, width=width)
+
+    return Command(command_args(args, 'memory', memory_args), parse)
+
+
+def memory_read_many(args, pipeline, regions, width=8):
+    """Returns Command reading many memory regions by adding a memory read
+    step for each region to the (empty) pipeline (see
+    TIFlash.memory_read_many())"""
+    addresses = list()
+    for region in regions:
+        (address, num_bytes, page) = parse_region(region)
+        if address in addresses:
+            # Results are keyed by address; one read would be lost
+            raise TIFlashError("Duplicate memory region address: 0x%X" %
+                               address)
+        pipeline.memory_read(address, num_bytes, page, width)
+        addresses.append(address)
+
+    if not addresses:
+        return Command(None, lambda code, result: dict())
+
+    command = run_pipeline(args, pipeline)
+    parse_steps = command.parse
+
+    def parse(code, result):
+        return parse_memory_read_many_result(addresses,
+                                             parse_steps(code, result))
+    command.parse = parse
+
+    return command
+
+
+def memory_dump(args, address, num_bytes, out_path, page=0, sha256=False,
+                width=8):
+    """Returns Command dumping memory to a binary file (see
+    TIFlash.memory_dump())"""
+    num_bytes = parse_num_bytes(num_bytes)
+    memory_args = memory_dump_args(address, num_bytes, page, width)
+
+    f = open(out_path, 'wb')
+    writer = DumpWriter(f, hashlib.sha256() if sha256 else None)
+    parse = functools.partial(parse_dump_result, num_bytes=num_bytes,
+                              writer=writer)
+
+    return Command(command_args(args, 'memory', memory_args), parse,
+                   sink=writer, cleanup=f.close)
+
+
+def memory_write(args, address, data, page=0, width=8):
+    """Returns Command writing memory (see TIFlash.memory_write())"""
+    memory_args = memory_write_args(address, data, page, width)
+
+    return Command(command_args(args, 'memory', memory_args),
+                   parse_no_result)
+
+
+def register_read(args, regname):
+    """Returns Command reading a register (see TIFlash.register_read())"""
+    return Command(command_args(args, 'register',
+                                register_read_args(regname)),
+                   parse_register_result)
+
+
+def register_write(args, regname, value):
+    """Returns Command writing a register (see TIFlash.register_write())"""
+    return Command(command_args(args, 'register',
+                                register_write_args(regname, value)),
+                   parse_no_result)
+
+
+def register_read_many(args, regnames):
+    """Returns Command reading many registers (see
+    TIFlash.register_read_many())"""
+    if not regnames:
+        return Command(None, lambda code, result: dict())
+
+    return Command(command_args(args, 'register',
+                                register_read_many_args(regnames)),
+                   parse_registers_result)
+
+
+def register_snapshot(args, regnames=None):
+    """Returns Command reading a snapshot of the device's registers (see
+    TIFlash.register_snapshot())"""
+    if regnames is None:
+        regnames = SNAPSHOT_REGISTERS
+
+    register_args = register_read_many_args(regnames, skip_missing=True)
+
+    return Command(command_args(args, 'register', register_args),
+                   parse_registers_result)
+
+
+def register_write_many(args, values):
+    """Returns Command writing many registers (see
+    TIFlash.register_write_many())"""
+    if not values:
+        return Command(None, parse_no_result)
+
+    return Command(command_args(args, 'register',
+                                register_write_many_args(values)),
+                   parse_no_result)
+
+
+def evaluate(args, expr, symbol_file=None):
+    """Returns Command evaluating an expression (see TIFlash.evaluate())"""
+    return Command(command_args(args, 'evaluate',
+                                evaluate_args(expr, symbol_file=symbol_file)),
+                   parse_string_result)
+
+
+def evaluate_many(args, exprs, symbol_file=None):
+    """Returns Command evaluating many expressions (see
+    TIFlash.evaluate_many())"""
+    exprs = list(exprs)
+    if not exprs:
+        return Command(None, lambda code, result: list())
+
+    exprs_path = write_expressions_file(exprs)
+    expression_args = evaluate_many_args(exprs_path, symbol_file=symbol_file)
+    parse = functools.partial(parse_expressions_result, exprs=exprs)
+
+    return Command(command_args(args, 'evaluate', expression_args), parse,
+                   cleanup=functools.partial(os.remove, exprs_path))
+
+
+def run_pipeline(args, pipeline):
+    """Returns Command running all steps of the pipeline (see
+    TIFlash.run_pipeline())"""
+    plan_path = write_plan_file(pipeline)
+
+    return Command(command_args(args, 'plan', {'file': plan_path}),
+                   functools.partial(parse_pipeline_result, pipeline),
+                   cleanup=functools.partial(os.remove, plan_path))
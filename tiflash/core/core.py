@@ -1,14 +1,13 @@
 import os
+import functools
+import time
 
 from tiflash.utils import dss
-from tiflash.utils import ccxml
-from tiflash.utils import ccs
+from tiflash.core import commands
+from tiflash.core.commands import TIFlashError
 
 CMD_DEFAULT_TIMEOUT = 60
-
-class TIFlashError(Exception):
-    """Generic TI Flash error"""
-    pass
+CMD_DEFAULT_DEADLINE = None     # no limit on the whole command by default
 
 
 class TIFlash(object):
@@ -24,11 +23,15 @@ class TIFlash(object):
         self.ccxml = None   # path to ccxml file
         self.chip = None    # chip name to use when starting a session
         self.attach = False
-        self.workspace = ccs.get_workspace_dir()
+        self.workspace = None   # None = allocate free workspace per command
         self.timeout = CMD_DEFAULT_TIMEOUT
+        self.deadline = CMD_DEFAULT_DEADLINE
+        self.worker = None  # persistent dss worker to run commands on
+        self.progress = None    # callback for progress events
+        self.timings = dict()   # per-phase times (seconds) of last command
         self.args = dict()
 
-    def __run_cmd(self, args):
+    def __run_cmd(self, args, sink=None):
         """PRIVATE FUNCTION: Runs dss cmd script with given arguments
 
         This function should be called by wrapper functions that are specific
@@ -37,20 +40,64 @@ class TIFlash(object):
         Args:
             args (dict): argument dictionary to use (often a copy of self.args
             with function specific args added)
+            sink (file, optional): file object to stream data posted by the
+                command to (i.e. memory dumps)
 
         Returns:
-            (bool, str): returns a tuple of format (result, msg) where result
-            is a boolean based off of the success/failure of running the
-            command and 'msg' is a string that represents any return value or
-            error message passed by javascript side.
+            (bool, value): returns a tuple of format (result, value) where
+            result is a boolean based off of the success/failure of running
+            the command and 'value' is the (typed) return value or error
+            message passed by javascript side.
+
+        Raises:
+            TIFlashTimeoutError: raised if command did not complete before
+                the deadline
         """
         arg_list = dss.format_args(args)
+        call_timings = dict()
+        start = time.time()
+
+        try:
+            if self.worker is not None:
+                call_result = self.worker.run(arg_list,
+                                              deadline=self.deadline,
+                                              sink=sink,
+                                              progress=self.progress)
+            else:
+                call_result = dss.call_dss(self.dss_path, arg_list,
+                                           workspace=self.workspace,
+                                           sink=sink, progress=self.progress,
+                                           timings=call_timings,
+                                           deadline=self.deadline,
+                                           attach=bool(args.get('attach')))
+        except dss.DSSError as e:
+            call_result = e
+
+        return commands.finish_call(call_result, self.timings,
+                                    call_timings, start)
+
+    def __run(self, command):
+        """PRIVATE FUNCTION: Runs a command (see tiflash.core.commands) and
+        returns its parsed result
+
+        Args:
+            command (Command): command to run
+
+        Returns:
+            value: result of command's parse function
+
+        Raises:
+            TIFlashError: raised if command failed
+        """
+        if command.args is None:
+            return command.parse(True, None)
 
-        (retcode, retval) = dss.call_dss(self.dss_path, arg_list,
-                                        workspace=self.workspace,
-                                        timeout=self.timeout)
+        try:
+            (code, result) = self.__run_cmd(command.args, sink=command.sink)
+        finally:
+            command.finish()
 
-        return (retcode, retval)
+        return command.parse(code, result)
 
     def set_debug(self, on=True):
         """Turns debug mode on/off for dss calls.
@@ -81,6 +128,62 @@ class TIFlash(object):
         elif 'attach' in self.args.keys():
             self.args.pop('attach')
 
+    def set_keep_session(self, keep=True):
+        """Keeps the debug session connected after a command completes.
+
+        Only has an effect when running commands on a worker (see
+        set_worker()). The next command with the same session settings reuses
+        the connected session instead of starting a new one.
+
+        Args:
+            keep (bool): True = keep session; False = end session after
+                each command
+        """
+        if keep:
+            self.args['keepsession'] = True
+
+        elif 'keepsession' in self.args.keys():
+            self.args.pop('keepsession')
+
+    def set_worker(self, worker):
+        """Sets a persistent dss worker to run commands on.
+
+        When a worker is set, commands are sent to the already running worker
+        instead of launching a new dss process for each command.
+
+        Args:
+            worker (DSSWorker): started worker to use (None = launch a new
+                dss process for each command)
+        """
+        self.worker = worker
+
+    def set_progress(self, callback):
+        """Sets a callback to receive progress events of long running
+        commands (session start, flash, erase, verify).
+
+        The callback is called with a dict of format {'phase': str,
+        'status': str, 'done': int, 'total': int, 'elapsed': float} when a
+        phase starts ('start'), about every second while it runs ('running')
+        and when it completes ('done'). 'done' and 'total' are in bytes
+        ('total' is 0 if unknown) and 'elapsed' is the time (seconds) since
+        the phase started. DSS does not report progress from within a
+        flash, erase or verify, so their 'running' events leave out 'done'
+        and 'total' (they only show the phase is still alive); memory dumps
+        report the bytes dumped so far. The callback may be called from
+        another thread and should return quickly.
+
+        Args:
+            callback (callable): function to call with each progress event
+                (None = no progress events)
+        """
+        self.progress = callback
+
+        if callback is not None:
+            self.args['progress'] = True
+
+        elif 'progress' in self.args.keys():
+            self.args.pop('progress')
+
     def set_ccs_path(self, ccs_path):
         """Explicitly sets the ccs_path and updates the dss_path automatically
         """
@@ -122,10 +225,12 @@ class TIFlash(object):
         self.args['session']['chip'] = chip
 
     def set_workspace(self, workspace):
-        """Explicitly set workspace to use when starting a Debug Server Session.
+        """Explicitly set workspace to use when starting a Debug Server
+        Session.
 
         Args:
-            workspace (str): workspace name to use
+            workspace (str): workspace name to use (None = allocate a free
+                workspace for each command)
         """
 
         # Set workspace
@@ -150,6 +255,20 @@ class TIFlash(object):
         # Adjust timeout for javascript side to be in seconds (default in ms)
         self.args['session']['timeout'] = int(self.timeout * 1000)
 
+    def set_deadline(self, deadline):
+        """Set the wall-clock limit of a whole command.
+
+        The timeout (see set_timeout()) limits each DSS call of a command;
+        the deadline limits the whole command (jvm startup, connecting,
+        loading the program, ...). The dss process and its children are
+        killed and TIFlashTimeoutError is raised when it passes.
+
+        Args:
+            deadline (float): time (seconds) a command may take (None = no
+                deadline)
+        """
+        self.deadline = deadline
+
     def set_session(self, ccxml_path, chip):
         """Sets the session information (ccxml file to use and chip to use)
 
@@ -174,40 +293,9 @@ class TIFlash(object):
             devicetype (str): device type to use in ccxml
             serno (str, optional): serial number of device to use for ccxml
         """
-        genccxml_args = dict()
-
-        # Add ccxml directory
-        ccxml_directory = ccxml.get_ccxml_directory()
-        genccxml_args.update({'directory': ccxml_directory})
-
-        # Add ccxml name
-        ccxml_name = "%s.ccxml" % (serno or devicetype)
-        genccxml_args.update({'ccxml': ccxml_name})
-
-        # Add connection
-        genccxml_args.update({'connection': connection})
-
-        # Add devicetype
-        genccxml_args.update({'devicetype': devicetype})
-
-        ccxml_path = "%s/%s" % (ccxml_directory, ccxml_name)
-        ccxml_path = os.path.normpath(ccxml_path)
-
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        # Add genccxml args to self.args
-        args.update({'genccxml': genccxml_args})
-
-        (code, msg) = self.__run_cmd(args)
-        if not code or not os.path.exists(ccxml_path):
-            raise TIFlashError(msg)
-            #raise TIFlashError("Could not successfully generate ccxml file")
-
-        # Add serial number to ccxml file
-        if serno:
-            ccxml.add_serno(ccxml_path, serno, self.ccs_path)
-
-        return ccxml_path
+        return self.__run(commands.generate_ccxml(self.args, self.ccs_path,
+                                                  connection, devicetype,
+                                                  serno))
 
     def get_connections(self):
         """Returns a list of possible connections.
@@ -266,19 +354,7 @@ class TIFlash(object):
             (list): A list of possible 'list_types' options based off the
             drivers installed in CCS
         """
-        list_args = {'list': list_type}
-
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        args.update(list_args)
-
-        (code, vals) = self.__run_cmd(args)
-
-        if not code:
-            raise TIFlashError("Could not get %s list" % list_type)
-        else:
-            parsed_vals = dss.parse_response_list(vals)
-            return parsed_vals
+        return self.__run(commands.get_list(self.args, list_type))
 
     def set_operation(self, operation):
         """Sets device specifc operation to perform
@@ -294,19 +370,7 @@ class TIFlash(object):
         self.args['operation'] = op_args
 
     def print_options(self, option_id=None):
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        if option_id:
-            args.update({'printoptions': {'id': option_id}})
-        else:
-            args.update({'printoptions': True})
-
-        (code, vals) = self.__run_cmd(args)
-
-        if not code:
-            raise TIFlashError("Could not print options")
-        else:
-            return True
+        return self.__run(commands.print_options(self.args, option_id))
 
     def get_option(self, option_id, pre_operation=None):
         """Get the value of an option.
@@ -322,22 +386,8 @@ class TIFlash(object):
         Raises:
             (TIFlashError): Raises error if option does not exist
         """
-        operation_args = {'opcode': pre_operation}
-        option_args = {'id': option_id}
-
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        if pre_operation:
-            args.update({'operation': operation_args})
-
-        args.update({'getoption': option_args})
-
-        (code, response) = self.__run_cmd(args)
-
-        if not code:
-            raise TIFlashError("Could not get option: %s" % option_id)
-
-        return response
+        return self.__run(commands.get_option(self.args, option_id,
+                                              pre_operation))
 
     def set_option(self, option_id, option_val):
         """Sets an option to specified value. Option will persist for all
@@ -420,27 +470,7 @@ class TIFlash(object):
             Returns:
                 bool: True if reset was successful; False otherwise
         """
-        # Set options before calling reset()
-        if options is not None:
-            self.set_options(options)
-
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        args['reset'] = True
-
-        (code, result) = self.__run_cmd(args)
-
-        # Unset options so they do not persist
-        if options is not None:
-            self.unset_options(options)
-
-        if not code:
-            if result:
-                # raise TIFlashError("Could not reset device")
-                raise TIFlashError(result)
-            return False
-        else:
-            return True
+        return self.__run(commands.reset(self.args, options=options))
 
     def erase(self, options=None):
         """Erases device; setting 'options' before erasing device
@@ -456,29 +486,7 @@ class TIFlash(object):
         Raises:
             TIFlashError: raises error if option invalid
         """
-
-        # Set options before calling erase()
-        if options is not None:
-            self.set_options(options)
-
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        args['erase'] = True
-
-        # call erase()
-        (code, result) = self.__run_cmd(args)
-
-        # Unset options so they do not persist
-        if options is not None:
-            self.unset_options(options)
-
-        if not code:
-            if result:
-                # raise TIFlashError("Could not erase device")
-                raise TIFlashError(result)
-            return False
-        else:
-            return True
+        return self.__run(commands.erase(self.args, options=options))
 
     def verify(self, image, binary=False, address=None, options=None):
         """Verifies device; setting 'options' before erasing device
@@ -497,35 +505,8 @@ class TIFlash(object):
         Raises:
             TIFlashError: raises error if option invalid
         """
-
-        verify_args = {'image': os.path.abspath(image)}
-        if binary:
-            verify_args['bin'] = True
-        if address:
-            verify_args['address'] = str(address)
-
-        # Set options before calling verify()
-        if options is not None:
-            self.set_options(options)
-
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        args['verify'] = verify_args
-
-        # call verify()
-        (code, result) = self.__run_cmd(args)
-
-        # Unset options so they do not persist
-        if options is not None:
-            self.unset_options(options)
-
-        if not code:
-            if result:
-                # raise TIFlashError("Could not verify device")
-                raise TIFlashError(result)
-            return False
-        else:
-            return True
+        return self.__run(commands.verify(self.args, image, binary=binary,
+                                          address=address, options=options))
 
     def flash(self, image, binary=False, address=None, options=None):
         """Flashes device; setting 'options' before flashing device
@@ -544,94 +525,97 @@ class TIFlash(object):
         Raises:
             TIFlashError: raises error if option invalid
         """
-        flash_args = {'image': os.path.abspath(image)}
-        if binary:
-            flash_args['binary'] = True
-        if address:
-            flash_args['address'] = str(address)
-
-        # Set options before calling flash()
-        if options is not None:
-            self.set_options(options)
-
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        args['flash'] = flash_args
+        return self.__run(commands.flash(self.args, image, binary=binary,
+                                         address=address, options=options))
 
-        # call flash()
-        (code, result) = self.__run_cmd(args)
-
-        # Unset options so they do not persist
-        if options is not None:
-            self.unset_options(options)
-
-        if not code:
-            if result:
-                # raise TIFlashError("Could not flash device")
-                raise TIFlashError(result)
-            return False
-        else:
-            return True
-
-    def memory_read(self, address, num_bytes=1, page=0):
+    def memory_read(self, address, num_bytes=1, page=0, width=8,
+                    as_bytes=False):
         """Reads specified bytes from memory
 
         Args:
             address (long): memory address to read from
-            num_bytes (int): number of bytes to read
+            num_bytes (int): number of bytes to read (multiple of width / 8)
             page (int, optional): page number to read memory from
+            width (int, optional): access width in bits (8, 16 or 32); wider
+                accesses read num_bytes in fewer transactions
+            as_bytes (bool, optional): return memory (in address order) as
+                bytes (8 bit width) or as an array.array of values (16/32
+                bit width) instead of a list. Memory is transferred raw, with
+                no per-value python objects.
 
         Returns:
-            list: Returns list of bytes read from memory
+            list: Returns list of values (bytes for 8 bit width) read from
+            memory (bytes or array.array if as_bytes is set). A list of
+            bytes is in reverse address order (as it always has been); a list
+            of 16/32 bit values, bytes and array.array are in address order.
         """
-        memory_args = {'read': True}
-        memory_args['address'] = str(address)
-        memory_args['numBytes'] = str(num_bytes)
-        memory_args['page'] = str(page)
+        return self.__run(commands.memory_read(self.args, address, num_bytes,
+                                               page, width, as_bytes))
 
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        args['memory'] = memory_args
+    def memory_read_many(self, regions, width=8):
+        """Reads many memory regions in a single dss invocation (the device
+        is only connected once for all regions, see Pipeline).
 
-        # call memory_read
-        (code, result) = self.__run_cmd(args)
+        Args:
+            regions (list): list of regions to read; each region is a tuple
+                of (address, num_bytes) or (address, num_bytes, page). Each
+                region must start at a different address.
+            width (int, optional): access width in bits (8, 16 or 32)
 
-        if not code:
-            raise TIFlashError(result)
-        else:
-            parsed_result = dss.parse_response_list(result)
-            parsed_result.reverse() # Reverse order
-            parsed_result = [ int(e) for e in parsed_result ]
-            return parsed_result
+        Returns:
+            dict: dict of address (int) to list of values read from region
+            (see memory_read())
 
+        Raises:
+            TIFlashError: raises error if a region is invalid, two regions
+                start at the same address or a region could not be read
+        """
+        return self.__run(commands.memory_read_many(self.args, self.pipeline(),
+                                                    regions, width))
 
-    def memory_write(self, address, data, page=0):
-        """Writes specified data to memory
+    def memory_dump(self, address, num_bytes, out_path, page=0,
+                    sha256=False, width=8):
+        """Dumps memory to a binary file
+
+        Memory is read in chunks and streamed straight to the file, so memory
+        use does not depend on the size of the region.
 
         Args:
-            address (long): memory address to read from
-            data (list): list of bytes to write to memory
-            page (int, optional): page number to read memory from
+            address (long): memory address to dump from
+            num_bytes (int): number of bytes to dump
+            out_path (str): path of file to write (raw) bytes to
+            page (int, optional): page number to dump memory from
+            sha256 (bool, optional): compute SHA-256 of dumped bytes
+            width (int, optional): access width in bits (8, 16 or 32); values
+                are written little endian
+
+        Returns:
+            str: SHA-256 hex digest of dumped bytes (None if sha256 is False)
 
         Raises:
-            TIFlashError: raises error when memory read error received
+            TIFlashError: raises error when memory dump fails
         """
-        memory_args = {'write': True}
-        memory_args['address'] = str(address)
-        data = [ str(e) for e in list(data) ]
-        memory_args['data'] = ' '.join(data)
-        memory_args['page'] = str(page)
+        return self.__run(commands.memory_dump(self.args, address, num_bytes,
+                                               out_path, page, sha256, width))
 
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        args['memory'] = memory_args
+    def memory_write(self, address, data, page=0, width=8):
+        """Writes specified data to memory
 
-        # call memory_write
-        (code, result) = self.__run_cmd(args)
+        Large writes are practical: data is passed to dss hex encoded (in a
+        temporary file if too large for the command line).
 
-        if not code:
-            raise TIFlashError(result)
+        Args:
+            address (long): memory address to read from
+            data (list): list of values (of width bits) to write to memory,
+                or bytes-like object of values packed little endian
+            page (int, optional): page number to read memory from
+            width (int, optional): access width in bits (8, 16 or 32)
 
+        Raises:
+            TIFlashError: raises error when memory read error received
+        """
+        self.__run(commands.memory_write(self.args, address, data, page,
+                                         width))
 
     def register_read(self, regname):
         """Reads specified register of device
@@ -645,22 +629,7 @@ class TIFlash(object):
         Raises:
             TIFlashError: raised if regname is invalid
         """
-        register_args = {'read': True}
-        register_args['regname'] = str(regname)
-
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        args['register'] = register_args
-
-        # call register_read
-        (code, result) = self.__run_cmd(args)
-
-        if not code:
-            raise TIFlashError(result)
-        else:
-            parsed_result = dss.parse_response_number(result)
-            return parsed_result
-
+        return self.__run(commands.register_read(self.args, regname))
 
     def register_write(self, regname, value):
         """Writes a value to specified register of device
@@ -672,27 +641,63 @@ class TIFlash(object):
         Raises:
             TIFlashError: raised if regname is invalid
         """
-        register_args = {'write': True}
-        register_args['regname'] = str(regname)
-        register_args['value'] = str(value)
+        self.__run(commands.register_write(self.args, regname, value))
 
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        args['register'] = register_args
+    def register_read_many(self, regnames):
+        """Reads many registers of device in a single command
+
+        Args:
+            regnames (list): list of register names to read
 
-        # call register_read
-        (code, result) = self.__run_cmd(args)
+        Returns:
+            dict: dict of register name to register value
 
-        if not code:
-            raise TIFlashError(result)
+        Raises:
+            TIFlashError: raised if a regname is invalid
+        """
+        return self.__run(commands.register_read_many(self.args, regnames))
 
+    def register_snapshot(self, regnames=None):
+        """Reads a snapshot of the device's registers in a single command
+
+        DSS can not list the registers of a device, so by default the core
+        registers of the supported device families
+        (commands.SNAPSHOT_REGISTERS) are read and the ones the device does
+        not have are left out.
+
+        Args:
+            regnames (list, optional): list of register names to read
+                (registers the device does not have are left out)
+
+        Returns:
+            dict: dict of register name to register value
+
+        Raises:
+            TIFlashError: raises error if a register could not be read for
+                any other reason (i.e. target running, probe error) or if
+                none of the registers exist
+        """
+        return self.__run(commands.register_snapshot(self.args, regnames))
+
+    def register_write_many(self, values):
+        """Writes many registers of device in a single command
+
+        Args:
+            values (dict): dict of register name to value to write (i.e. a
+                snapshot returned by register_snapshot())
+
+        Raises:
+            TIFlashError: raised if a regname is invalid
+        """
+        self.__run(commands.register_write_many(self.args, values))
 
     def evaluate(self, expr, symbol_file=None):
         """Evaluates the given C/GEL expression
 
         Args:
             expr (str): C or GEL expression
-            symbol_file (str): .out or GEL symbol file to load before evaluating
+            symbol_file (str): .out or GEL symbol file to load before
+                evaluating
 
         Returns:
             str: String result from evaluating expression
@@ -700,22 +705,62 @@ class TIFlash(object):
         Raises:
             TIFlashError: raises error when expression error is raised
         """
-        expression_args = {'expression': expr}
+        return self.__run(commands.evaluate(self.args, expr,
+                                            symbol_file=symbol_file))
 
-        if symbol_file is not None:
-            expression_args['symbols'] = symbol_file
+    def evaluate_many(self, exprs, symbol_file=None):
+        """Evaluates many C/GEL expressions in a single dss invocation. The
+        symbol file is only loaded once for all expressions.
 
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
-        args['evaluate'] = expression_args
+        An expression that fails does not stop the remaining expressions
+        from being evaluated.
 
-        # call expression
-        (code, result) = self.__run_cmd(args)
+        Args:
+            exprs (list): list of C or GEL expressions
+            symbol_file (str): .out or GEL symbol file to load before
+                evaluating expressions
 
-        if not code:
-            raise TIFlashError(result)
+        Returns:
+            list: list of expression result dicts (one per expression, in
+            order) of format {'expression': str, 'success': bool,
+            'result': str or None, 'error': str or None}
 
-        return result
+        Raises:
+            TIFlashError: raises error if the session could not be started or
+                the symbol file could not be loaded
+        """
+        return self.__run(commands.evaluate_many(self.args, exprs,
+                                                 symbol_file=symbol_file))
+
+    def pipeline(self):
+        """Returns a new (empty) Pipeline for this TIFlash object.
+
+        Commands added to the pipeline are run in order in a single dss
+        invocation (see Pipeline).
+
+        Returns:
+            Pipeline: empty pipeline
+        """
+        return Pipeline(self)
+
+    def run_pipeline(self, pipeline):
+        """Runs all steps of the pipeline in a single dss invocation.
+
+        Steps are run in order. Running stops on the first step that fails;
+        any remaining steps are marked as skipped.
+
+        Args:
+            pipeline (Pipeline): pipeline to run
+
+        Returns:
+            list: list of step result dicts (one per step) of format
+            {'command': str, 'success': bool, 'result': value,
+            'error': str or None, 'timings': dict}
+
+        Raises:
+            TIFlashError: raises error if session could not be started
+        """
+        return self.__run(commands.run_pipeline(self.args, pipeline))
 
     def nop(self):
         """No-op command. This essentially just calls the dss script with the
@@ -724,14 +769,127 @@ class TIFlash(object):
         Raises:
             TIFlashError: raises error when expression error is raised
         """
-        # Make a copy of self.args so we are not modifying directly
-        args = self.args.copy()
+        # No return on a no-op
+        self.__run(commands.nop(self.args))
 
-        # call dss
-        (code, result) = self.__run_cmd(args)
 
-        if not code:
-            raise TIFlashError(result)
+class Pipeline(object):
+    """Ordered list of commands to run on a device in a single dss
+    invocation.
 
-        # No return on a no-op
-        #return result
+    Commands are added by calling the command methods (each returns the
+    pipeline so calls can be chained) and run by calling run().
+
+    Example:
+        results = flash.pipeline().erase().flash(image).verify(image)\
+                    .reset().run()
+    """
+
+    def __init__(self, tiflash):
+        """Initializes an empty Pipeline.
+
+        Args:
+            tiflash (TIFlash): TIFlash object (with session set) to run
+                pipeline on
+        """
+        self.tiflash = tiflash
+        self.steps = list()
+
+    def __add_step(self, command, command_args, parse, options=None):
+        """PRIVATE FUNCTION: Adds a step to the pipeline
+
+        Args:
+            command (str): name of step (i.e. 'flash', 'memory_read')
+            command_args (dict): argument dictionary of step
+            parse (function): function for parsing (code, result) of step
+            options (dict, optional): options to set before running step
+        """
+        step_args = dict()
+        if options is not None:
+            step_args['setoption'] = dict(options)
+        step_args.update(command_args)
+
+        self.steps.append({'command': command, 'args': step_args,
+                           'parse': parse})
+
+        return self
+
+    def reset(self, options=None):
+        """Adds a Board Reset step"""
+        return self.__add_step('reset', {'reset': True},
+                               commands.parse_bool_result, options)
+
+    def erase(self, options=None):
+        """Adds an erase step"""
+        return self.__add_step('erase', {'erase': True},
+                               commands.parse_bool_result, options)
+
+    def verify(self, image, binary=False, address=None, options=None):
+        """Adds a verify step (see TIFlash.verify())"""
+        verify_args = commands.verify_args(image, binary=binary,
+                                           address=address)
+        return self.__add_step('verify', {'verify': verify_args},
+                               commands.parse_bool_result, options)
+
+    def flash(self, image, binary=False, address=None, options=None):
+        """Adds a flash step (see TIFlash.flash())"""
+        flash_args = commands.flash_args(image, binary=binary,
+                                         address=address)
+        return self.__add_step('flash', {'flash': flash_args},
+                               commands.parse_bool_result, options)
+
+    def memory_read(self, address, num_bytes=1, page=0, width=8):
+        """Adds a memory read step (see TIFlash.memory_read())"""
+        memory_args = commands.memory_read_args(address, num_bytes, page,
+                                                width)
+        parse = functools.partial(commands.parse_memory_result, width=width)
+        return self.__add_step('memory_read', {'memory': memory_args}, parse)
+
+    def memory_write(self, address, data, page=0, width=8):
+        """Adds a memory write step (see TIFlash.memory_write())"""
+        memory_args = commands.memory_write_args(address, data, page, width)
+        return self.__add_step('memory_write', {'memory': memory_args},
+                               commands.parse_no_result)
+
+    def register_read(self, regname):
+        """Adds a register read step (see TIFlash.register_read())"""
+        register_args = commands.register_read_args(regname)
+        return self.__add_step('register_read', {'register': register_args},
+                               commands.parse_register_result)
+
+    def register_write(self, regname, value):
+        """Adds a register write step (see TIFlash.register_write())"""
+        register_args = commands.register_write_args(regname, value)
+        return self.__add_step('register_write', {'register': register_args},
+                               commands.parse_no_result)
+
+    def register_read_many(self, regnames):
+        """Adds a register read many step (see TIFlash.register_read_many())
+        """
+        register_args = commands.register_read_many_args(regnames)
+        return self.__add_step('register_read_many',
+                               {'register': register_args},
+                               commands.parse_registers_result)
+
+    def register_write_many(self, values):
+        """Adds a register write many step (see
+        TIFlash.register_write_many())"""
+        register_args = commands.register_write_many_args(values)
+        return self.__add_step('register_write_many',
+                               {'register': register_args},
+                               commands.parse_no_result)
+
+    def evaluate(self, expr, symbol_file=None):
+        """Adds an evaluate step (see TIFlash.evaluate())"""
+        expression_args = commands.evaluate_args(expr, symbol_file)
+        return self.__add_step('evaluate', {'evaluate': expression_args},
+                               commands.parse_string_result)
+
+    def run(self):
+        """Runs all steps in a single dss invocation (see
+        TIFlash.run_pipeline())
+
+        Returns:
+            list: list of step result dicts (one per step)
+        """
+        return self.tiflash.run_pipeline(self)
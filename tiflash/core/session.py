@@ -0,0 +1,235 @@
+"""
+Module for running multiple commands on a device using a single, connected
+debug session.
+"""
+import time
+
+from tiflash.core.core import TIFlashError
+
+
+class Session(object):
+    """Debug session that keeps the device connected across commands.
+
+    Use tiflash.open_session() to create a Session. Commands are run on a
+    dedicated dss worker that keeps the debug session connected, so the
+    device is only connected/disconnected once for the whole session.
+
+    Example:
+        with tiflash.open_session(serno="L1000000") as s:
+            s.flash("image.hex")
+            s.reset()
+            s.memory_read(0x20000000, 4)
+    """
+
+    def __init__(self, tiflash, worker):
+        """Initializes Session.
+
+        Args:
+            tiflash (TIFlash): TIFlash object with session settings set
+            worker (DSSWorker): started worker to run commands on
+        """
+        self.tiflash = tiflash
+        self.worker = worker
+
+        self.tiflash.set_worker(worker)
+        self.tiflash.set_keep_session(True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Disconnects from the device and ends the session."""
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+            self.tiflash.set_worker(None)
+
+    def is_open(self):
+        """Returns True if session is still open
+
+        Returns:
+            bool: True if session is open
+        """
+        return self.worker is not None and self.worker.is_alive()
+
+    @property
+    def timings(self):
+        """dict: per-phase timings (seconds) of the last command run in the
+        session (see TIFlash.timings)"""
+        return self.tiflash.timings
+
+    def __check_open(self):
+        """PRIVATE FUNCTION: Raises error if session is closed"""
+        if not self.is_open():
+            raise TIFlashError("Session is closed")
+
+    def reset(self, options=None):
+        """Performs a Board Reset on device (see tiflash.reset())"""
+        self.__check_open()
+        return self.tiflash.reset(options)
+
+    def erase(self, options=None):
+        """Erases device (see tiflash.erase())"""
+        self.__check_open()
+        return self.tiflash.erase(options)
+
+    def verify(self, image, binary=False, address=None, options=None):
+        """Verifies device (see tiflash.verify())"""
+        self.__check_open()
+        return self.tiflash.verify(image, binary=binary, address=address,
+                                 options=options)
+
+    def flash(self, image, binary=False, address=None, options=None):
+        """Flashes device (see tiflash.flash())"""
+        self.__check_open()
+        return self.tiflash.flash(image, binary=binary, address=address,
+                                options=options)
+
+    def memory_read(self, address, num_bytes=1, page=0, width=8,
+                    as_bytes=False):
+        """Reads specified bytes from memory (see tiflash.memory_read())"""
+        self.__check_open()
+        return self.tiflash.memory_read(address, num_bytes, page, width=width,
+                                        as_bytes=as_bytes)
+
+    def memory_read_many(self, regions, width=8):
+        """Reads many memory regions (see tiflash.memory_read_many())"""
+        self.__check_open()
+        return self.tiflash.memory_read_many(regions, width=width)
+
+    def memory_watch(self, address, num_bytes=1, interval=0.1, count=None,
+                     page=0, width=8):
+        """Samples a memory region periodically (generator).
+
+        Samples are taken at a fixed rate on the connected session (no dss
+        launch or device connect per sample). Each sample is a regular memory
+        read (see memory_read()); tiflash does not halt or resume the device
+        between samples.
+
+        Example:
+            with tiflash.open_session(serno="L1000000") as s:
+                for (timestamp, values) in s.memory_watch(0x20000000, 4):
+                    print(timestamp, list(values))
+
+        Args:
+            address (long): memory address to sample
+            num_bytes (int, optional): number of bytes to sample
+            interval (float, optional): time between samples (seconds)
+            count (int, optional): number of samples to take (None = sample
+                until the generator is closed)
+            page (int, optional): page number to read memory from
+            width (int, optional): access width in bits (8, 16 or 32)
+
+        Yields:
+            (float, value): tuple of (timestamp, values) where timestamp is
+            the time (time.time()) the sample was read and values are the
+            memory read (see memory_read() with as_bytes=True)
+        """
+        taken = 0
+        next_sample = time.time()
+        while count is None or taken < count:
+            delay = next_sample - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            self.__check_open()
+            values = self.tiflash.memory_read(address, num_bytes, page,
+                                              width=width, as_bytes=True)
+            yield (time.time(), values)
+            taken += 1
+
+            # Keep a fixed rate; skip missed samples if reads fall behind
+            next_sample += interval
+            if next_sample < time.time():
+                next_sample = time.time()
+
+    def memory_dump(self, address, num_bytes, out_path, page=0,
+                    sha256=False, width=8):
+        """Dumps memory to a binary file (see tiflash.memory_dump())"""
+        self.__check_open()
+        return self.tiflash.memory_dump(address, num_bytes, out_path,
+                                        page=page, sha256=sha256, width=width)
+
+    def memory_write(self, address, data, page=0, width=8):
+        """Writes specified data to memory (see tiflash.memory_write())"""
+        self.__check_open()
+        self.tiflash.memory_write(address, data, page, width=width)
+
+    def register_read(self, regname):
+        """Reads specified register of device (see tiflash.register_read())
+        """
+        self.__check_open()
+        return self.tiflash.register_read(regname)
+
+    def register_write(self, regname, value):
+        """Writes value to specified register (see tiflash.register_write())
+        """
+        self.__check_open()
+        self.tiflash.register_write(regname, value)
+
+    def register_read_many(self, regnames):
+        """Reads many registers of device (see tiflash.register_read_many())
+        """
+        self.__check_open()
+        return self.tiflash.register_read_many(regnames)
+
+    def register_snapshot(self, regnames=None):
+        """Reads a snapshot of the device's registers (see
+        tiflash.register_snapshot())
+        """
+        self.__check_open()
+        return self.tiflash.register_snapshot(regnames)
+
+    def register_write_many(self, values):
+        """Writes many registers of device (see
+        tiflash.register_write_many())
+        """
+        self.__check_open()
+        self.tiflash.register_write_many(values)
+
+    def evaluate(self, expr, symbol_file=None):
+        """Evaluates the given C/GEL expression (see tiflash.evaluate())"""
+        self.__check_open()
+        return self.tiflash.evaluate(expr, symbol_file=symbol_file)
+
+    def evaluate_many(self, exprs, symbol_file=None):
+        """Evaluates many C/GEL expressions (see tiflash.evaluate_many())
+
+        Note: symbols loaded in a session stay loaded, so only pass
+        symbol_file on the first call.
+        """
+        self.__check_open()
+        return self.tiflash.evaluate_many(exprs, symbol_file=symbol_file)
+
+    def get_option(self, option_id, pre_operation=None):
+        """Reads and returns the value of the option_id (see
+        tiflash.get_option())
+        """
+        self.__check_open()
+        return self.tiflash.get_option(option_id, pre_operation)
+
+    def set_option(self, option_id, option_val, post_operation=None):
+        """Sets the value of the option_id (see tiflash.set_option())
+
+        The option stays set for the remainder of the session.
+        """
+        self.__check_open()
+        self.tiflash.set_option(option_id, option_val)
+        if post_operation is not None:
+            self.tiflash.set_operation(post_operation)
+
+        try:
+            self.tiflash.nop()
+        finally:
+            self.tiflash.unset_option(option_id)
+            self.tiflash.args.pop('operation', None)
+
+    def pipeline(self):
+        """Returns a new (empty) Pipeline run on this session (see
+        TIFlash.pipeline())
+        """
+        self.__check_open()
+        return self.tiflash.pipeline()
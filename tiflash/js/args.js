@@ -46,3 +46,19 @@ function _create_args_obj(args, keyval)
     
     return args_json;
 }
+
+/**
+ * Reads and parses a JSON file (used for arguments too large or structured
+ * to pass on the command line)
+ *
+ * @param {path} full path to JSON file
+ *
+ * @returns {object} parsed JSON object
+ */
+function read_json_file(path)
+{
+    var bytes = java.nio.file.Files.readAllBytes(java.nio.file.Paths.get(path));
+    var contents = new java.lang.String(bytes, "UTF-8");
+
+    return JSON.parse(String(contents));
+}
@@ -25,7 +25,9 @@ function erase_entire_flash(session, scriptEnv)
         session.target.connect();
     }
 
-    session.flash.erase();
+    run_phase("erase", 0, function () {
+        session.flash.erase();
+    });
 
     return true;
 }
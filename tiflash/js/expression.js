@@ -20,3 +20,45 @@ function evaluate_expression(session, scriptEnv, eval)
 
     return retval;
 }
+
+/**
+ * Evaluates many expressions, loading the symbol file only once. An
+ * expression that fails does not stop the remaining expressions from being
+ * evaluated.
+
+ * @param {session} DSS Session object for device.
+ * @param {scriptEnv} DSS Scripting Environment object.
+ * @param {eval} evaluate arguments (file = path to JSON list of expressions,
+ *  symbols = (optional) symbol file to load)
+ *
+ * @returns {results} array of {value, error} (one per expression, in order)
+ */
+function evaluate_expressions(session, scriptEnv, eval)
+{
+    var expressions = read_json_file(eval.file.join(' '));
+    var results = [];
+
+    if (!session.target.isConnected()) {
+        session.target.connect();
+    }
+
+    //  Load Symbols (once for all expressions)
+    if (eval.symbols) {
+        time_phase("symbols", function () {
+            session.symbol.load(eval.symbols.join(' '));
+        });
+    }
+
+    time_phase("evaluate", function () {
+        for (var i = 0; i < expressions.length; i++) {
+            try {
+                var value = session.expression.evaluate(expressions[i]);
+                results.push({value: Number(value), error: null});
+            } catch (e) {
+                results.push({value: null, error: String(e)});
+            }
+        }
+    });
+
+    return results;
+}
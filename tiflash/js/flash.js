@@ -13,12 +13,14 @@ function handle_flash_cmds(session, scriptEnv, args)
     }
 
     //  Flash Image(s)
-    if (args.binary != undefined) {
-        retval = load_binary(session, scriptEnv, image, args.address);
-    //} else if (images.length == 1) {
-    } else {
-        retval = load_image(session, scriptEnv, image);
-    }
+    retval = run_phase("flash", file_size(image), function () {
+        if (args.binary != undefined) {
+            return load_binary(session, scriptEnv, image, args.address);
+        //} else if (images.length == 1) {
+        } else {
+            return load_image(session, scriptEnv, image);
+        }
+    });
     /*
     } else {
         //retval = load_multiple(session, scriptEnv, images);
@@ -12,15 +12,18 @@ port = parseInt(this.arguments[1]);
 scriptEnv = null;
 debugServer = null;
 debugSession = null;
+debugSessionKey = null;
 ccsServer = null;
 ccsSession = null;
+resultChannel = null;
+
+RESULT_VERSION = 1;     //  must match tiflash/utils/dss.py
 
 main();
 
 function main()
 {
-    var retcode = 0;
-    var result = "";
+    var mainStart = new Date().getTime();
 
     //  Setup Scripting Environment
     scriptEnv = Packages.com.ti.ccstudio.scripting.environment.ScriptingEnvironment.instance();
@@ -30,33 +33,93 @@ function main()
 
 
     load(scriptEnv.toAbsolutePath("args.js"));
+    load(scriptEnv.toAbsolutePath("result.js"));
+    load(scriptEnv.toAbsolutePath("progress.js"));
+    load(scriptEnv.toAbsolutePath("timing.js"));
     args = parse_args(this.arguments);
 
+    //  Commands too large for the command line are passed in a file
+    if (args.argsfile) {
+        args = parse_args(read_json_file(args.argsfile.join(' ')));
+    }
+
 
     //  Create Debug Server
     debugServer = scriptEnv.getServer('DebugServer.1');
 
 
+    //  Record startup timings (JVM boot and scripting environment setup)
+    var jvmStart = java.lang.management.ManagementFactory.getRuntimeMXBean()
+        .getStartTime();
+    record_timing("jvm", (mainStart - jvmStart) / 1000);
+    record_timing("setup", (new Date().getTime() - mainStart) / 1000);
+
+
     //  Set Trace Level
-    if (args.debug) {
-        scriptEnv.traceSetConsoleLevel(Packages.com.ti.ccstudio.scripting.environment.TraceLevel.ALL);
-    } else {
-        scriptEnv.traceSetConsoleLevel(Packages.com.ti.ccstudio.scripting.environment.TraceLevel.OFF);
+    set_trace_level(args);
+
+
+    //  Worker mode - keep Debug Server resident and serve requests
+    if (args.worker) {
+        load(scriptEnv.toAbsolutePath("worker.js"));
+
+        serve_worker(debugServer, scriptEnv, port);
+        quit(0);
     }
 
 
-    //  Start Session
+    //  Open result channel first so progress can be posted while running
+    resultChannel = open_channel(port);
+    set_data_channel(resultChannel.out);
+    if (args.progress) {
+        set_progress_channel(resultChannel.out);
+    }
+
+    var response = run_commands(args);
+
+    send_result(scriptEnv, port, response);
+
+    if (args.attach && !response.aborted) {
+        load(scriptEnv.toAbsolutePath("session.js"));
+
+        attach_ccs(debugSession, scriptEnv, args.session);
+    }
+
+    quit(response.retcode);
+}
+
+/**
+ * Runs all commands provided in args on the Debug Server
+
+ * @param {args} parsed command arguments
+ *
+ * @returns {response} object of format {retcode, result, aborted} where
+ *  aborted is set if a command failed before any action was performed
+ */
+function run_commands(args)
+{
+    var retcode = 0;
+    var result = "";
+
+
+    //  Start Session (reuse already open session if same configuration)
     if (args.session) {
         load(scriptEnv.toAbsolutePath("session.js"));
 
         try {
-            debugSession = start_session(debugServer, scriptEnv, args.session);
+            var key = get_session_key(args.session);
+
+            if (debugSession && debugSessionKey == key) {
+                resume_session(debugSession, scriptEnv, args.session);
+            } else {
+                end_session();
+                debugSession = run_phase("session", 0, function () {
+                    return start_session(debugServer, scriptEnv, args.session);
+                });
+                debugSessionKey = key;
+            }
         } catch (e) {
-            result = e;
-            retcode = -1;
-
-            send_result(scriptEnv, port, result);
-            quit(retcode);
+            return { retcode: -1, result: e, aborted: true };
         }
 
     }
@@ -109,11 +172,7 @@ function main()
             try {
                 set_option(debugSession, scriptEnv, id, val);
             } catch (e) {
-                result = e;
-                retcode = -1;
-
-                send_result(scriptEnv, port, result);
-                quit(retcode);
+                return { retcode: -1, result: e, aborted: true };
             }
         }
     }
@@ -126,11 +185,7 @@ function main()
         try {
             handle_operation_cmds(debugSession, scriptEnv, args.operation);
         } catch (e) {
-            result = e;
-            retcode = -1;
-
-            send_result(scriptEnv, port, result);
-            quit(retcode);
+            return { retcode: -1, result: e, aborted: true };
         }
     }
 
@@ -201,7 +256,17 @@ function main()
         if (args.memory.read) {
             try {
                 result = read_memory(debugSession, scriptEnv, args.memory.page,
-                    args.memory.address, args.memory.numBytes);
+                    args.memory.address, args.memory.numBytes,
+                    args.memory.width);
+            } catch (e) {
+                result = e;
+                retcode = -1;
+            }
+        } else if (args.memory.dump) {
+            try {
+                result = dump_memory(debugSession, scriptEnv,
+                    args.memory.page, args.memory.address,
+                    args.memory.numBytes, args.memory.width);
             } catch (e) {
                 result = e;
                 retcode = -1;
@@ -209,7 +274,8 @@ function main()
         } else if (args.memory.write) {
             try {
                 result = write_memory(debugSession, scriptEnv,
-                    args.memory.page, args.memory.address, args.memory.data)
+                    args.memory.page, args.memory.address,
+                    args.memory.hex.join(''), args.memory.width)
             } catch (e) {
                 result = e;
                 retcode = -1;
@@ -236,6 +302,23 @@ function main()
                 result = e;
                 retcode = -1;
             }
+        } else if (args.register.readmany) {
+            try {
+                result = read_registers(debugSession, scriptEnv,
+                    args.register.names.join(' '),
+                    args.register.skipmissing != undefined)
+            } catch (e) {
+                result = e;
+                retcode = -1;
+            }
+        } else if (args.register.writemany) {
+            try {
+                result = write_registers(debugSession, scriptEnv,
+                    args.register.values.join(' '))
+            } catch (e) {
+                result = e;
+                retcode = -1;
+            }
         }
     }
 
@@ -243,44 +326,134 @@ function main()
     if (args.evaluate) {
         load(scriptEnv.toAbsolutePath("expression.js"));
         try {
-            result = evaluate_expression(debugSession, scriptEnv, args.evaluate);
+            if (args.evaluate.file) {
+                result = evaluate_expressions(debugSession, scriptEnv,
+                    args.evaluate);
+            } else {
+                result = evaluate_expression(debugSession, scriptEnv,
+                    args.evaluate);
+            }
+        } catch (e) {
+            result = e;
+            retcode = -1;
+        }
+    }
+
+    //  Plan (ordered list of commands run in this session)
+    if (args.plan) {
+        load(scriptEnv.toAbsolutePath("plan.js"));
+        try {
+            result = run_plan(scriptEnv, args.plan);
         } catch (e) {
             result = e;
             retcode = -1;
         }
     }
 
+    return { retcode: retcode, result: result, aborted: false };
+}
 
-    send_result(scriptEnv, port, result);
+function set_trace_level(args)
+{
+    if (args.debug) {
+        scriptEnv.traceSetConsoleLevel(Packages.com.ti.ccstudio.scripting.environment.TraceLevel.ALL);
+    } else {
+        scriptEnv.traceSetConsoleLevel(Packages.com.ti.ccstudio.scripting.environment.TraceLevel.OFF);
+    }
+}
 
-    if (args.attach) {
-        load(scriptEnv.toAbsolutePath("session.js"));
+function send_result(scriptEnv, port, response)
+{
+    var result_str = JSON.stringify(make_envelope(response));
 
-        attach_ccs(debugSession, scriptEnv, args.session);
+    //  Post Result to Python Socket (on already open result channel)
+    set_progress_channel(null);
+    set_data_channel(null);
+    write_frame(resultChannel.out, FRAME_RESULT, result_str);
+    close_channel(resultChannel);
+    resultChannel = null;
+
+    return true;
+}
+
+/**
+ * Builds the result envelope sent to python (see dss.decode_result())
+ *
+ * @param {response} object of format {retcode, result} (see run_commands);
+ *  timings default to the phase timings recorded so far (see timing.js)
+ *
+ * @returns {envelope} object of format
+ *  {version, status, type, value, error, timings}
+ */
+function make_envelope(response)
+{
+    var envelope = {
+        version: RESULT_VERSION,
+        status: (response.retcode == 0) ? "ok" : "error",
+        type: "none",
+        value: null,
+        error: null,
+        timings: response.timings || phaseTimings
+    };
+
+    if (response.retcode != 0) {
+        envelope.error = String(response.result);
+    } else {
+        var typed = to_typed_value(response.result);
+        envelope.type = typed.type;
+        envelope.value = typed.value;
     }
 
-    quit(retcode);
+    return envelope;
 }
 
-function send_result(scriptEnv, port, result)
+/**
+ * Converts a (JS or Java) result into a JSON serializable value
+ *
+ * @param {result} result of a command
+ *
+ * @returns {typed} object of format {type, value} where type is one of
+ *  none, bool, int, float, string, list or object
+ */
+function to_typed_value(result)
 {
-    load(scriptEnv.toAbsolutePath("result.js"));
-    var result_str = String(result);
+    if (result === null || result === undefined) {
+        return { type: "none", value: null };
+    }
+
+    if (typeof result == "boolean" || result instanceof java.lang.Boolean) {
+        return { type: "bool", value: String(result) == "true" };
+    }
 
-    //  Convert to ',' deliminated string
-    if (result instanceof Array) {
-        result_str = result.join(";;");
-        //result_str = scriptEnv.arrayToString(result, ",");
+    if (typeof result == "number" || result instanceof java.lang.Number) {
+        var num = Number(result);
+        return { type: (num % 1 == 0) ? "int" : "float", value: num };
     }
 
+    if (typeof result == "string" || result instanceof java.lang.String) {
+        return { type: "string", value: String(result) };
+    }
+
+    //  JS arrays and Java arrays (i.e. long[] returned by readData)
+    var is_java_array = result.getClass && result.getClass().isArray();
+    if (result instanceof Array || is_java_array) {
+        var list = [];
+        for (var i = 0; i < result.length; i++) {
+            list.push(to_typed_value(result[i]).value);
+        }
+        return { type: "list", value: list };
+    }
 
-    //  Post Result to Python Socket
-    return post_result(port, result_str);
+    //  Other Java objects
+    if (result.getClass) {
+        return { type: "string", value: String(result) };
+    }
+
+    return { type: "object", value: result };
 }
 
-function quit(retcode)
+function end_session()
 {
-
     if (debugSession)
 	{
         //  Disconnect if connected
@@ -290,7 +463,15 @@ function quit(retcode)
 
         // Close debug session.
         debugSession.terminate();
+        debugSession = null;
+        debugSessionKey = null;
     }
+}
+
+function quit(retcode)
+{
+
+    end_session();
 
     if (debugServer)
 	{
@@ -1,8 +1,26 @@
 /**
  * memory.js - Memory include file that contains functions used
  * by main.js to write/read memory on devices.
+ *
+ * Accesses are 8, 16 or 32 bits wide (width). Raw data (dumps and writes)
+ * holds the values packed little endian, in address order.
  */
 
+DUMP_CHUNK_SIZE = 65536     //  bytes read from device per readData call
+
+/**
+ * Returns access width (in bits) given as argument (default 8)
+ */
+function parse_width(width)
+{
+    width = (width == undefined) ? 8 : Number(width);
+    if (width != 8 && width != 16 && width != 32) {
+        throw "Invalid access width: " + width;
+    }
+
+    return width;
+}
+
 /**
  * Read Memory function to read bytes in device's memory
 
@@ -11,8 +29,11 @@
  * @param {page} page in memory to read from
  * @param {address} address in memory to begin reading
  * @param {numBytes} number of bytes to read
+ * @param {width} (optional) access width in bits (8, 16 or 32)
+ *
+ * @returns {long[]} values read (numBytes / (width / 8) values)
  */
-function read_memory(session, scriptEnv, page, address, numBytes)
+function read_memory(session, scriptEnv, page, address, numBytes, width)
 {
     if (!session.target.isConnected()) {
         session.target.connect();
@@ -21,8 +42,63 @@ function read_memory(session, scriptEnv, page, address, numBytes)
     page = Number(page);
     address = Number(address);
     numBytes = Number(numBytes);
+    width = parse_width(width);
 
-    return session.memory.readData(page, address, 8, numBytes);
+    return session.memory.readData(page, address, width,
+        numBytes / (width / 8));
+}
+
+/**
+ * Dump Memory function to stream bytes of device's memory to the python side
+ * (as data frames, see result.js). Memory is read DUMP_CHUNK_SIZE bytes at a
+ * time so memory use does not depend on the size of the region.
+
+ * @param {session} DSS Session object for device.
+ * @param {scriptEnv} DSS Scripting Environment object.
+ * @param {page} page in memory to read from
+ * @param {address} address in memory to begin reading
+ * @param {numBytes} number of bytes to dump
+ * @param {width} (optional) access width in bits (8, 16 or 32)
+ *
+ * @returns {int} number of bytes dumped
+ */
+function dump_memory(session, scriptEnv, page, address, numBytes, width)
+{
+    if (!session.target.isConnected()) {
+        session.target.connect();
+    }
+
+    page = Number(page);
+    address = Number(address);
+    numBytes = Number(numBytes);
+    width = parse_width(width);
+
+    var valueSize = width / 8;
+    var buffer = java.lang.reflect.Array.newInstance(java.lang.Byte.TYPE,
+        Math.min(numBytes, DUMP_CHUNK_SIZE));
+    var start = new Date().getTime();
+    var done = 0;
+
+    return run_phase("dump", numBytes, function () {
+        while (done < numBytes) {
+            var size = Math.min(numBytes - done, DUMP_CHUNK_SIZE);
+            var values = session.memory.readData(page, address + done, width,
+                size / valueSize);
+
+            //  byte[] holds signed bytes (sign extend low 8 bits)
+            for (var i = 0; i < size; i++) {
+                var value = values[Math.floor(i / valueSize)];
+                var shift = 8 * (i % valueSize);
+                buffer[i] = ((value >>> shift) << 24) >> 24;
+            }
+            post_data(buffer, size);
+
+            done += size;
+            post_progress("dump", "running", done, numBytes, start);
+        }
+
+        return done;
+    });
 }
 
 /**
@@ -32,19 +108,33 @@ function read_memory(session, scriptEnv, page, address, numBytes)
  * @param {scriptEnv} DSS Scripting Environment object.
  * @param {page} page in memory to write to
  * @param {address} address in memory to begin writing
- * @param {data} bytes to write
+ * @param {hex} values to write (as hex string of values packed little endian)
+ * @param {width} (optional) access width in bits (8, 16 or 32)
  */
-function write_memory(session, scriptEnv, page, address, data)
+function write_memory(session, scriptEnv, page, address, hex, width)
 {
     if (!session.target.isConnected()) {
         session.target.connect();
     }
-    var data_list = Array()
 
-    for (var i = 0; i < data.length; i++) {
-        data_list.push(Number(data[i]));
+    page = Number(page);
+    address = Number(address);
+    width = parse_width(width);
+
+    //  Decode straight into a Java long[] (what writeData takes)
+    var valueSize = width / 8;
+    var numValues = hex.length / 2 / valueSize;
+    var data = java.lang.reflect.Array.newInstance(java.lang.Long.TYPE,
+        numValues);
+    for (var i = 0; i < numValues; i++) {
+        var value = 0;
+        for (var b = valueSize - 1; b >= 0; b--) {
+            var pos = 2 * (i * valueSize + b);
+            value = value * 256 + parseInt(hex.substr(pos, 2), 16);
+        }
+        data[i] = value;
     }
 
-    session.memory.writeData(page, address, data, 8);
+    session.memory.writeData(page, address, data, width);
     return true;
 }
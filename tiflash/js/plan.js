@@ -0,0 +1,43 @@
+/**
+ * plan.js - Plan include file that runs an ordered list of commands
+ * (pipeline) in a single Debug Server run
+ */
+
+/**
+ * Public function for running a plan. Each step of the plan is a list of
+ * command arguments (same format as the command line arguments passed to
+ * main.js). Steps are run in order using the already started session.
+ * Running stops on the first step that fails.
+
+ * @param {scriptEnv} DSS Scripting Environment object.
+ * @param {args} plan arguments (file = path to JSON plan file)
+ *
+ * @returns {results} array of step result envelopes (see make_envelope)
+ */
+function run_plan(scriptEnv, args)
+{
+    var steps = read_json_file(args.file.join(' '));
+    var results = [];
+    var plan_timings = phaseTimings;
+
+    for (var i = 0; i < steps.length; i++) {
+        //  Each step result carries the timings of just that step
+        phaseTimings = {};
+        var response = run_commands(parse_args(steps[i]));
+
+        results.push(make_envelope(response));
+
+        for (var name in phaseTimings) {
+            plan_timings[name] = (plan_timings[name] || 0) +
+                phaseTimings[name];
+        }
+
+        if (response.retcode != 0) {
+            break;
+        }
+    }
+
+    phaseTimings = plan_timings;
+
+    return results;
+}
@@ -0,0 +1,104 @@
+/**
+ * progress.js - Progress include file that posts progress events of long
+ * running commands (i.e. flash, erase, verify) over the result channel
+ */
+
+PROGRESS_INTERVAL = 1000    //  ms between events while a phase is running
+
+progressChannel = null;     //  DataOutputStream to post events to
+
+/**
+ * Sets the channel progress events are posted to (see result.js).
+ *
+ * @param {out} DataOutputStream of result channel (null = no events)
+ */
+function set_progress_channel(out)
+{
+    progressChannel = out;
+}
+
+/**
+ * Posts a single progress event. Does nothing if no progress channel is set.
+ *
+ * @param {phase} name of phase (i.e. 'flash')
+ * @param {status} status of phase ('start', 'running' or 'done')
+ * @param {done} number of bytes done (null = not known, left out of event)
+ * @param {total} total number of bytes of phase (0 if unknown, null = left
+ *  out of event)
+ * @param {start} start time of phase (ms)
+ */
+function post_progress(phase, status, done, total, start)
+{
+    if (!progressChannel) {
+        return;
+    }
+
+    var event = {
+        phase: phase,
+        status: status,
+        elapsed: (new Date().getTime() - start) / 1000
+    };
+    if (done != null) {
+        event.done = done;
+    }
+    if (total != null) {
+        event.total = total;
+    }
+
+    try {
+        write_frame(progressChannel, FRAME_PROGRESS, JSON.stringify(event));
+    } catch (e) {
+        //  Never fail a command because its progress could not be posted
+        progressChannel = null;
+    }
+}
+
+/**
+ * Runs func as a phase. Posts an event when the phase starts, every
+ * PROGRESS_INTERVAL while it runs and when it completes. DSS does not report
+ * progress within a call, so the 'running' events only show the phase is
+ * still alive (they carry no done/total). The run time of the phase is
+ * recorded (see timing.js).
+ *
+ * @param {phase} name of phase (i.e. 'flash')
+ * @param {total} total number of bytes of phase (0 if unknown)
+ * @param {func} function to run
+ *
+ * @returns return value of func
+ */
+function run_phase(phase, total, func)
+{
+    var start = new Date().getTime();
+    var timer = null;
+
+    post_progress(phase, "start", 0, total, start);
+
+    if (progressChannel) {
+        timer = new java.util.Timer(true);
+        timer.scheduleAtFixedRate(new JavaAdapter(java.util.TimerTask, {
+            run: function () {
+                post_progress(phase, "running", null, null, start);
+            }
+        }), PROGRESS_INTERVAL, PROGRESS_INTERVAL);
+    }
+
+    try {
+        var retval = time_phase(phase, func);
+    } finally {
+        if (timer) {
+            timer.cancel();
+        }
+    }
+
+    post_progress(phase, "done", total, total, start);
+
+    return retval;
+}
+
+/**
+ * Returns size (in bytes) of file (0 if file does not exist)
+ */
+function file_size(path)
+{
+    return Number(new java.io.File(path).length());
+}
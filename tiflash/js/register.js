@@ -36,3 +36,100 @@ function write_register(session, scriptEnv, regname, value)
     session.memory.writeRegister(regname, value);
     return true;
 }
+
+/**
+ * Read registers function to read many register values of a device in a
+ * single command
+
+ * @param {session} DSS Session object for device.
+ * @param {scriptEnv} DSS Scripting Environment object.
+ * @param {regnames} space separated register names to read
+ * @param {skipMissing} skip registers the device's core does not have
+ *  instead of failing (any other read error still fails, as does reading
+ *  none of the registers)
+ *
+ * @returns {Object} object of format {regname: value}
+ */
+function read_registers(session, scriptEnv, regnames, skipMissing)
+{
+    if (!session.target.isConnected()) {
+        session.target.connect();
+    }
+
+    var values = {};
+    var names = String(regnames).split(/\s+/);
+    var numRead = 0;
+    var numMissing = 0;
+
+    for (var i = 0; i < names.length; i++) {
+        if (!names[i]) {
+            continue;
+        }
+
+        try {
+            values[names[i]] = Number(session.memory.readRegister(names[i]));
+            numRead++;
+        } catch (e) {
+            if (!skipMissing || !is_missing_register_error(e)) {
+                throw "Could not read register " + names[i] + ": " + e;
+            }
+            numMissing++;
+        }
+    }
+
+    if (numRead == 0 && numMissing > 0) {
+        throw "Could not read any of the registers: " + regnames;
+    }
+
+    return values;
+}
+
+/**
+ * Returns true if error thrown by DSS when reading a register is because the
+ * register does not exist (as opposed to i.e. target running or probe
+ * errors)
+
+ * @param {e} error thrown by session.memory.readRegister()
+ */
+function is_missing_register_error(e)
+{
+    var msg = String(e.message != undefined ? e.message : e);
+
+    return /not found|unknown register|invalid register|no such register|does not exist/i.test(msg);
+}
+
+/**
+ * Write registers function to write many register values of a device in a
+ * single command
+
+ * @param {session} DSS Session object for device.
+ * @param {scriptEnv} DSS Scripting Environment object.
+ * @param {assignments} space separated 'regname=value' assignments (written
+ *  in order)
+ */
+function write_registers(session, scriptEnv, assignments)
+{
+    if (!session.target.isConnected()) {
+        session.target.connect();
+    }
+
+    var pairs = String(assignments).split(/\s+/);
+
+    for (var i = 0; i < pairs.length; i++) {
+        if (!pairs[i]) {
+            continue;
+        }
+
+        var pos = pairs[i].indexOf("=");
+        var name = pairs[i].slice(0, pos);
+        var value = Number(pairs[i].slice(pos + 1));
+
+        try {
+            session.memory.writeRegister(name, value);
+        } catch (e) {
+            throw "Could not write register " + name + ": " + e;
+        }
+    }
+
+    return true;
+}
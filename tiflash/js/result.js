@@ -3,22 +3,105 @@ importPackage(java.net);
 //importPackage(Packages.org.mozilla.javascript);
 
 SERVER = "localhost"
-PORT = 19876
 
-function post_result(port, result)
+/*  Frame kinds (must match tiflash/utils/result.py)
+ *
+ *  Each frame is: kind (1 byte) + payload length (4 bytes, big endian) +
+ *  payload. A connection carries any number of frames and ends with a
+ *  result frame.
+ */
+FRAME_RESULT = "R"      //  UTF-8 result string (last frame)
+FRAME_DATA = "D"        //  raw data (streamed to python side sink)
+FRAME_PROGRESS = "P"    //  UTF-8 JSON progress event (see progress.js)
+
+//  Frames may be written from more than one thread (i.e. progress events)
+channelLock = new java.util.concurrent.locks.ReentrantLock();
+
+dataChannel = null;     //  DataOutputStream data frames are posted to
+
+/**
+ * Sets the channel data frames are posted to (see post_data).
+ *
+ * @param {out} DataOutputStream of result channel (null = no channel)
+ */
+function set_data_channel(out)
 {
-    var connection = new Socket(SERVER, port);
-    var connection_out = new PrintWriter(connection.getOutputStream(), true);
-    //var connection_in = new BufferedReader(new InputStreamReader(connection.getInputStream()));
+    dataChannel = out;
+}
 
-//    var context = Context.enter();
-//    var scope = context.initStandardObjects();
-//    var json = NativeJSON.stringify(context, scope, result, null, null);
+/**
+ * Posts raw data to the python side (streamed to the command's sink).
+ *
+ * @param {bytes} Java byte[] of data
+ * @param {length} number of bytes of 'bytes' to send
+ */
+function post_data(bytes, length)
+{
+    if (!dataChannel) {
+        throw "No data channel to post data to";
+    }
+
+    write_frame(dataChannel, FRAME_DATA, bytes, length);
+}
+
+function post_result(port, result)
+{
+    var channel = open_channel(port);
 
     //  Send result then close socket
-    connection_out.println(result);
-    connection_out.close();
-    connection.close();
+    write_frame(channel.out, FRAME_RESULT, result);
+    close_channel(channel);
 
     return true;
 }
+
+/**
+ * Opens a framed channel to the python socket at port.
+ *
+ * @param {port} port of python socket to connect to
+ * @returns {Object} channel of format {connection, out}
+ */
+function open_channel(port)
+{
+    var connection = new Socket(SERVER, port);
+    var out = new DataOutputStream(
+        new BufferedOutputStream(connection.getOutputStream()));
+
+    return {connection: connection, out: out};
+}
+
+function close_channel(channel)
+{
+    channel.out.flush();
+    channel.out.close();
+    channel.connection.close();
+}
+
+/**
+ * Writes a single frame to a DataOutputStream.
+ *
+ * @param {out} DataOutputStream to write frame to
+ * @param {kind} frame kind (FRAME_*)
+ * @param {data} string (sent UTF-8 encoded) or Java byte[] payload
+ * @param {length} (optional) number of bytes of byte[] payload to send
+ */
+function write_frame(out, kind, data, length)
+{
+    var bytes = data;
+    if (typeof data == "string" || data instanceof java.lang.String) {
+        bytes = new java.lang.String(data).getBytes("UTF-8");
+    }
+    if (length == undefined) {
+        length = bytes.length;
+    }
+
+    channelLock.lock();
+    try {
+        out.writeByte(kind.charCodeAt(0));
+        out.writeInt(length);
+        out.write(bytes, 0, length);
+        out.flush();
+    } finally {
+        channelLock.unlock();
+    }
+}
@@ -17,17 +17,23 @@ importPackage(Packages.java.lang)
 function start_session(server, scriptEnv, args)
 {
     //  TODO: add check for args.session.ccxml
-    server.setConfig(args.ccxml.join(' '));
+    time_phase("config", function () {
+        server.setConfig(args.ccxml.join(' '));
+    });
 
     //  TODO: add check for args.session.chip
-    var debugSession = server.openSession(".*" + args.chip + ".*");
+    var debugSession = time_phase("open_session", function () {
+        return server.openSession(".*" + args.chip + ".*");
+    });
 
     //  Set Session Timeout
     debugSession.setScriptTimeout(Number(args.timeout));
 
 
     //  Connect to board
-    debugSession.target.connect();
+    time_phase("connect", function () {
+        debugSession.target.connect();
+    });
     /*
     //  Connect only if specified
     if (args.connect) {
@@ -38,6 +44,41 @@ function start_session(server, scriptEnv, args)
     return debugSession;
 }
 
+/**
+ * Public function for resuming an already started session
+
+ * @param {session} DSS Session object for device.
+ * @param {scriptEnv} DSS Scripting Environment object.
+ * @param {args} sesion arguments
+ *
+ * @returns {session} Debug Server Session
+ */
+function resume_session(session, scriptEnv, args)
+{
+    //  Set Session Timeout
+    session.setScriptTimeout(Number(args.timeout));
+
+    //  Reconnect to board if connection was lost
+    if (!session.target.isConnected()) {
+        session.target.connect();
+    }
+
+    return session;
+}
+
+/**
+ * Public function for getting a key identifying the session configuration
+ * (sessions with the same key can be reused)
+
+ * @param {args} sesion arguments
+ *
+ * @returns {key} session key string
+ */
+function get_session_key(args)
+{
+    return args.ccxml.join(' ') + "::" + args.chip.join(' ');
+}
+
 /**
  * Public function for attaching CCS to Debug Server Session
 
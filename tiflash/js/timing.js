@@ -0,0 +1,45 @@
+/**
+ * timing.js - Timing include file that records how long each phase of a
+ * command takes. Timings (in seconds) are returned with the result (see
+ * make_envelope in main.js).
+ */
+
+phaseTimings = {};
+
+/**
+ * Clears all recorded timings
+ */
+function reset_timings()
+{
+    phaseTimings = {};
+}
+
+/**
+ * Adds time to the total of a phase
+ *
+ * @param {name} name of phase (i.e. 'connect')
+ * @param {seconds} time spent in phase
+ */
+function record_timing(name, seconds)
+{
+    phaseTimings[name] = (phaseTimings[name] || 0) + seconds;
+}
+
+/**
+ * Runs func and records its run time as phase 'name'
+ *
+ * @param {name} name of phase (i.e. 'connect')
+ * @param {func} function to run
+ *
+ * @returns return value of func
+ */
+function time_phase(name, func)
+{
+    var start = new Date().getTime();
+
+    try {
+        return func();
+    } finally {
+        record_timing(name, (new Date().getTime() - start) / 1000);
+    }
+}
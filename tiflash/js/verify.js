@@ -22,11 +22,13 @@ function handle_verify_cmds(session, scriptEnv, args)
         session.target.connect();
     }
 
-    if (args.binary) {
-        return verify_binary(session, scriptEnv, image, args.address);
-    } else {
-        return verify_program(session, scriptEnv, image);
-    }
+    return run_phase("verify", file_size(image), function () {
+        if (args.binary) {
+            return verify_binary(session, scriptEnv, image, args.address);
+        } else {
+            return verify_program(session, scriptEnv, image);
+        }
+    });
 }
 
 /**
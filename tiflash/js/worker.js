@@ -0,0 +1,72 @@
+/**
+ * worker.js - Worker include file that keeps the Debug Server resident and
+ * serves command requests sent over a local socket
+ */
+
+importPackage(java.io);
+importPackage(java.net);
+
+WORKER_SERVER = "localhost"
+
+/**
+ * Public function for serving worker requests. Each request is a single line
+ * containing a JSON array of command arguments (same format as the command
+ * line arguments passed to main.js). Each response is a result frame (see
+ * result.js) containing the JSON result envelope (see make_envelope). The debug
+ * session is ended after each request unless the request contains
+ * 'keepsession'.
+ *
+ * Returns when an 'exit' request is received or the socket is closed.
+
+ * @param {server} DSS Server object for device.
+ * @param {scriptEnv} DSS Scripting Environment object.
+ * @param {port} port of python worker socket to connect to
+ */
+function serve_worker(server, scriptEnv, port)
+{
+    var connection = new Socket(WORKER_SERVER, port);
+    var connection_in = new BufferedReader(
+        new InputStreamReader(connection.getInputStream(), "UTF-8"));
+    var connection_out = new DataOutputStream(
+        new BufferedOutputStream(connection.getOutputStream()));
+
+    while (true) {
+        var line = connection_in.readLine();
+
+        //  Python side closed the socket
+        if (line == null) {
+            break;
+        }
+
+        var request_args = parse_args(JSON.parse(String(line)));
+        if (request_args.exit) {
+            break;
+        }
+
+        set_trace_level(request_args);
+        set_data_channel(connection_out);
+        set_progress_channel(request_args.progress ? connection_out : null);
+        var response = run_commands(request_args);
+        set_progress_channel(null);
+        set_data_channel(null);
+
+        //  Sessions only persist between requests if asked to
+        if (!request_args.keepsession) {
+            try {
+                time_phase("teardown", end_session);
+            } catch (e) {
+                debugSession = null;
+                debugSessionKey = null;
+            }
+        }
+
+        write_frame(connection_out, FRAME_RESULT,
+            JSON.stringify(make_envelope(response)));
+
+        //  Startup timings are only returned with the first response
+        reset_timings();
+    }
+
+    connection_out.close();
+    connection.close();
+}
@@ -0,0 +1,269 @@
+"""
+helper module for calling Debug Server Scripting (dss) from asyncio (Python 3
+only)
+
+Mirrors dss.call_dss() but launches the script runner with
+asyncio.create_subprocess_exec and receives the result on an asyncio server,
+so a single event loop can drive many dss processes at once.
+"""
+
+import asyncio
+import sys
+import time
+from collections import deque
+
+from tiflash.utils import dss
+from tiflash.utils import workspace as ws
+from tiflash.utils.result import (FRAME_HEADER, FRAME_RESULT, FRAME_DATA,
+                                  FRAME_PROGRESS, RECV_CHUNK_SIZE,
+                                  notify_progress)
+
+HOST = "localhost"
+RESULT_GRACE_PERIOD = dss.RESULT_GRACE_PERIOD
+EXIT_GRACE_PERIOD = dss.EXIT_GRACE_PERIOD
+
+
+class ResultListener(object):
+    """Asyncio equivalent of result.ResultServer.
+
+    Listens on a local socket (port picked by the OS) for js/main.js to post
+    the result of a command to.
+
+    Args:
+        host (str): host to open socket; should ALWAYS be 'localhost'
+        sink (file, optional): file object to stream data frames to
+        progress (callable, optional): callback called with each progress
+            event
+    """
+
+    def __init__(self, host=HOST, sink=None, progress=None):
+        self.host = host
+        self.sink = sink
+        self.progress = progress
+        self.port = None
+        self.server = None
+        self.result = None  # future set to result string once posted
+        self.result_time = None     # time result was received
+
+    async def start(self):
+        """Starts listening for a result
+
+        Returns:
+            int: port listening on
+        """
+        self.result = asyncio.get_event_loop().create_future()
+        self.server = await asyncio.start_server(self._handle_client,
+                                                 self.host, 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+        return self.port
+
+    async def close(self):
+        """Stops listening for a result"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle_client(self, reader, writer):
+        """Reads frames until the result frame is received"""
+        result = None
+
+        try:
+            while True:
+                kind, payload = await read_frame(reader, sink=self.sink)
+                if kind is None:
+                    break
+                elif kind == FRAME_RESULT:
+                    result = payload.decode("utf-8").strip()
+                    self.result_time = time.time()
+                    break
+                elif kind == FRAME_PROGRESS:
+                    notify_progress(self.progress, payload)
+        except asyncio.IncompleteReadError:
+            result = None
+        finally:
+            writer.close()
+
+        if not self.result.done():
+            self.result.set_result(result)
+
+
+async def read_frame(reader, sink=None):
+    """Reads a single frame from an asyncio stream (see result.recv_frame())
+
+    Args:
+        reader (asyncio.StreamReader): stream to read frame from
+        sink (file, optional): file object to write data frame payloads to
+            (instead of returning them)
+
+    Returns:
+        (bytes, bytes): tuple of (kind, payload); payload is None if written
+        to sink. (None, None) is returned if the stream ended before a frame
+        was received.
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return (None, None)
+        raise
+
+    kind, length = FRAME_HEADER.unpack(header)
+
+    if sink is None or kind != FRAME_DATA:
+        return (kind, await reader.readexactly(length))
+
+    remaining = length
+    while remaining > 0:
+        chunk = await reader.read(min(remaining, RECV_CHUNK_SIZE))
+        if not chunk:
+            raise asyncio.IncompleteReadError(b'', remaining)
+        sink.write(chunk)
+        remaining -= len(chunk)
+
+    return (kind, None)
+
+
+async def call_dss(dss_path, commands, workspace=None, deadline=None,
+                   sink=None, progress=None, timings=None, attach=False):
+    """Calls js/main.js via new script runner (eclipsec) as a coroutine
+
+    Args:
+        dss_path (str): Path to dss.bat/.sh installation to use
+        commands (list): list of string commands to pass to main.js
+        workspace (str): workspace name (if None, a free workspace is
+            allocated for the call)
+        deadline (float, optional): wall-clock time (seconds) the whole
+            invocation may take (None/negative == no deadline, see
+            dss.call_dss())
+        sink (file, optional): file object to stream data posted by command
+            to (i.e. large memory dumps)
+        progress (callable, optional): callback called with each progress
+            event posted by command
+        timings (dict, optional): dict to add timings measured on the python
+            side to (see dss.call_dss())
+        attach (bool, optional): command attaches CCS session to device (see
+            dss.call_dss())
+
+    Returns:
+        (bool, str): returns tuple with (bool=result, str=value)
+            value is the result envelope; decode with dss.decode_result()
+
+    Raises:
+        DSSTimeoutError: raised if the result is not posted before the
+            deadline (the dss process and its children are killed)
+    """
+    # Remove deadline if negative number provided (no deadline)
+    if deadline is not None and deadline < 0:
+        deadline = None
+
+    # Workspace locking and args file writes block on disk, so they run in
+    # the default executor to keep the event loop free for other devices
+    loop = asyncio.get_event_loop()
+
+    # Use a workspace not in use by any other dss process
+    allocated = None
+    if workspace is None:
+        allocated = await loop.run_in_executor(None, ws.allocate_workspace)
+        workspace = allocated.path
+
+    listener = ResultListener(sink=sink, progress=progress)
+    args_file = None
+
+    try:
+        port = await listener.start()
+        (script_commands, args_file) = await loop.run_in_executor(
+            None, dss.prepare_commands, commands)
+        cmd = dss.build_dss_cmd(dss_path, port, script_commands,
+                                workspace=workspace)
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                **dss.new_process_group_kwargs())
+        except Exception as e:
+            print(e)
+            return (False, "Command Failed")
+
+        output = deque()
+        output_task = asyncio.ensure_future(_read_output(proc.stdout, output))
+        exit_task = asyncio.ensure_future(proc.wait())
+
+        # Wait for result to be posted (or dss process to exit)
+        done, pending = await asyncio.wait(
+            [listener.result, exit_task], timeout=deadline,
+            return_when=asyncio.FIRST_COMPLETED)
+
+        if not done:
+            await _kill_process_tree(proc)
+            await output_task
+            raise dss.DSSTimeoutError(
+                "Command exceeded its deadline of %s seconds" % deadline,
+                output=b"".join(output).decode("utf-8", "replace"))
+
+        if listener.result.done():
+            result = listener.result.result()
+        else:
+            # Process exited first; result may still be in flight
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(listener.result), RESULT_GRACE_PERIOD)
+            except asyncio.TimeoutError:
+                result = None
+
+        # Process keeps running after posting result when attaching
+        if attach:
+            retcode = await exit_task
+        else:
+            try:
+                retcode = await asyncio.wait_for(asyncio.shield(exit_task),
+                                                 EXIT_GRACE_PERIOD)
+            except asyncio.TimeoutError:
+                await _kill_process_tree(proc)
+                retcode = 0     # command status is carried in result
+        await output_task
+
+        if timings is not None and listener.result_time is not None:
+            timings['teardown'] = max(time.time() - listener.result_time, 0)
+    finally:
+        await listener.close()
+        await loop.run_in_executor(None, dss.remove_args_file, args_file)
+        if allocated is not None:
+            await loop.run_in_executor(None, allocated.release)
+
+    return (retcode == 0, result)
+
+
+async def _read_output(stream, output):
+    """PRIVATE FUNCTION: Echoes output of dss process to stdout, keeping the
+    last dss.MAX_OUTPUT_SIZE bytes of it in output (deque)
+    """
+    size = 0
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+
+        sys.stdout.write(line.decode("utf-8", "replace"))
+        sys.stdout.flush()
+
+        output.append(line)
+        size += len(line)
+        while size > dss.MAX_OUTPUT_SIZE and len(output) > 1:
+            size -= len(output.popleft())
+
+
+async def _kill_process_tree(proc):
+    """PRIVATE FUNCTION: Kills dss process and all of its children (see
+    dss.kill_process_tree())
+    """
+    dss.kill_process_group(proc.pid)
+
+    if proc.returncode is None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+    await proc.wait()
@@ -11,10 +11,20 @@ Contact: webbjcam@gmail.com
 import platform
 import os
 import re
+import json
+import tempfile
 
 TI_DIRECTORY = "ti"
 DEFAULT_WORKSPACE = "@user.home/.tiflash/workspace"
 
+# On disk index of found CCS installations (see get_ccs_index())
+CCS_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".tiflash",
+                              "ccs-index.json")
+CCS_INDEX_VERSION = 1
+
+# In-process memo of CCS installation indexes {(index_path, ccs_prefix): list}
+_ccs_index_memo = dict()
+
 class FindCCSError(Exception):
     """Generic FindCCS Error"""
     pass
@@ -99,6 +109,19 @@ def __get_ccs_exe_path():
     return ccs_exe_path
 
 
+def get_ccs_launcher_path(ccs_root):
+    """Returns the (canonical) path of the ccstudio executable of a ccs
+    installation. The path is not checked for existence.
+
+    Args:
+        ccs_root (str): full path to root of ccs installation
+
+    Returns:
+        str: full path to ccstudio executable for current OS
+    """
+    return os.path.normpath(ccs_root + '/' + __get_ccs_exe_path())
+
+
 def __is_ccs_root(path):
     """Returns True or False depending if path is a valid "ccs-root" folder.
 
@@ -177,7 +200,8 @@ def get_ccs_version(ccs_root):
                 break
     return version
 
-def get_ccs_installations(ccs_prefix):
+
+def get_ccs_installations(ccs_prefix, stamps=None):
     """Returns a list of paths to all found ccs-root locations.
 
     Uses ccs_prefix to begin search.
@@ -185,6 +209,8 @@ def get_ccs_installations(ccs_prefix):
     Args:
         ccs_prefix (str): path to top level directory containing ccs
             installations
+        stamps (dict, optional): if given, filled with the modification time
+            of every directory searched {path: mtime}
     Returns:
         list: list of paths to ccs installations found in search
     Raises:
@@ -194,6 +220,9 @@ def get_ccs_installations(ccs_prefix):
 
     def dfw_search(path):
         paths = []
+        if stamps is not None:
+            stamps[path] = os.stat(path).st_mtime
+
         if __is_ccs_root(path):
             paths.append(path)
         else:
@@ -211,6 +240,190 @@ def get_ccs_installations(ccs_prefix):
     return dfw_search(ccs_prefix)
 
 
+def __scan_ccs_installations(ccs_prefix):
+    """Searches ccs_prefix for CCS installations.
+
+    Returns:
+        (list, dict): tuple of (installations, stamps) where installations is
+        a list of installation dicts of format {'path': str, 'version': str,
+        'pf_filters': list, 'launcher': str} and stamps holds the
+        modification times of the searched directories and of each
+        installation's ccs.properties file {path: mtime}
+    """
+    stamps = dict()
+    installations = list()
+
+    for path in get_ccs_installations(ccs_prefix, stamps=stamps):
+        properties = path + '/eclipse/ccs.properties'
+        try:
+            stamps[properties] = os.stat(properties).st_mtime
+            version = get_ccs_version(path)
+            pf_filters = get_ccs_pf_filters(path)
+        except (IOError, OSError):
+            continue
+
+        if version is None:
+            continue
+
+        installations.append({'path': os.path.normpath(path),
+                              'version': version,
+                              'pf_filters': pf_filters,
+                              'launcher': get_ccs_launcher_path(path)})
+
+    return (installations, stamps)
+
+
+def __stamps_valid(stamps):
+    """Returns True if none of the stamped paths were modified (or removed)
+    """
+    try:
+        for path in stamps:
+            if os.stat(path).st_mtime != stamps[path]:
+                return False
+    except OSError:
+        return False
+
+    return True
+
+
+def __read_ccs_index(index_path):
+    """Returns contents of index file (empty index if missing or invalid)"""
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        if index.get('version') == CCS_INDEX_VERSION:
+            return index
+    except (IOError, OSError, ValueError, AttributeError):
+        pass
+
+    return {'version': CCS_INDEX_VERSION, 'prefixes': dict()}
+
+
+def __write_ccs_index(index_path, index):
+    """Writes index file atomically. The index is only a cache, so failing to
+    write it (i.e. read-only home directory) is ignored."""
+    try:
+        index_dir = os.path.dirname(index_path)
+        if not os.path.isdir(index_dir):
+            os.makedirs(index_dir)
+
+        (fd, tmp_path) = tempfile.mkstemp(prefix="ccs-index-", suffix=".tmp",
+                                          dir=index_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+
+        try:
+            os.replace(tmp_path, index_path)
+        except AttributeError:  # python 2
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            os.rename(tmp_path, index_path)
+    except (IOError, OSError):
+        pass
+
+
+def get_ccs_index(ccs_prefix, index_path=None, refresh=False):
+    """Returns the CCS installations found in ccs_prefix.
+
+    Searching for installations (and parsing their ccs.properties files) is
+    slow, so results are kept in an on disk index (CCS_INDEX_PATH) and in an
+    in-process memo. The on disk index is reused as long as none of the
+    searched directories (or ccs.properties files) were modified since it was
+    built. The in-process memo is used without any checks; call
+    clear_ccs_index() or pass refresh=True to pick up installation changes
+    made while the process runs.
+
+    Args:
+        ccs_prefix (str): path to top level directory containing ccs
+            installations
+        index_path (str, optional): path to index file (default:
+            CCS_INDEX_PATH)
+        refresh (bool, optional): rebuild index by searching ccs_prefix
+
+    Returns:
+        list: list of installation dicts of format {'path': str,
+        'version': str, 'pf_filters': list, 'launcher': str}
+
+    Raises:
+        OSError: raised if ccs_prefix does not exist
+    """
+    if index_path is None:
+        index_path = CCS_INDEX_PATH
+
+    ccs_prefix = os.path.normpath(os.path.abspath(ccs_prefix))
+    key = (index_path, ccs_prefix)
+
+    if not refresh and key in _ccs_index_memo:
+        return _ccs_index_memo[key]
+
+    index = __read_ccs_index(index_path)
+    entry = index['prefixes'].get(ccs_prefix)
+
+    if refresh or entry is None or not __stamps_valid(entry['stamps']):
+        (installations, stamps) = __scan_ccs_installations(ccs_prefix)
+        entry = {'installations': installations, 'stamps': stamps}
+        index['prefixes'][ccs_prefix] = entry
+        __write_ccs_index(index_path, index)
+
+    _ccs_index_memo[key] = entry['installations']
+
+    return entry['installations']
+
+
+def get_ccs_installation(ccs_root, index_path=None):
+    """Returns the indexed installation dict of the CCS installation at
+    ccs_root (see get_ccs_index()).
+
+    Installations already indexed in this process (i.e. by find_ccs()) are
+    returned without touching the disk; otherwise ccs_root is indexed on its
+    own.
+
+    Args:
+        ccs_root (str): path to ccs installation
+        index_path (str, optional): path to index file (default:
+            CCS_INDEX_PATH)
+
+    Returns:
+        dict: installation dict of format {'path': str, 'version': str,
+        'pf_filters': list, 'launcher': str} (None if ccs_root is not a CCS
+        installation)
+
+    Raises:
+        OSError: raised if ccs_root does not exist
+    """
+    ccs_root = os.path.normpath(os.path.abspath(ccs_root))
+
+    for installations in list(_ccs_index_memo.values()):
+        for installation in installations:
+            if installation['path'] == ccs_root:
+                return installation
+
+    for installation in get_ccs_index(ccs_root, index_path=index_path):
+        if installation['path'] == ccs_root:
+            return installation
+
+    return None
+
+
+def clear_ccs_index(index_path=None, remove=False):
+    """Clears the in-process memo of CCS installation indexes.
+
+    Args:
+        index_path (str, optional): path to index file (default:
+            CCS_INDEX_PATH)
+        remove (bool, optional): also remove the on disk index
+    """
+    if index_path is None:
+        index_path = CCS_INDEX_PATH
+
+    for key in list(_ccs_index_memo):
+        if key[0] == index_path:
+            del _ccs_index_memo[key]
+
+    if remove and os.path.exists(index_path):
+        os.remove(index_path)
+
+
 def get_workspace_dir():
     """Returns the workspace directory to use for tiflash.
 
@@ -243,37 +456,48 @@ def find_ccs(version=None, ccs_prefix=None):
         FindCCSError: raises exception if CCS installation can not be found
 
     """
-    ccs_installation_versions = dict()
-    version_list = list()
-
     # Get default ccs_prefix if none provided
     if ccs_prefix is None:
         ccs_prefix = get_ccs_prefix()
+    elif not os.path.exists(ccs_prefix):
+        raise FindCCSError("Could not a find CCS Installation directory")
 
-    # Get all CCS installations
-    ccs_installations = get_ccs_installations(ccs_prefix)
+    # Get all CCS installations (from index; re-searched if an installation
+    # was not found or has since been removed)
+    ccs_path = __find_ccs_in_index(get_ccs_index(ccs_prefix), version)
+    if ccs_path is None or not os.path.exists(ccs_path):
+        ccs_path = __find_ccs_in_index(
+            get_ccs_index(ccs_prefix, refresh=True), version)
 
-    # Check if any CCS installations were found
-    if len(ccs_installations) == 0:
-        raise FindCCSError(
-            "Could not find any installations of Code Composer Studio")
+    if ccs_path is None:
+        if version is None:
+            raise FindCCSError(
+                "Could not find any installations of Code Composer Studio")
+        raise FindCCSError("Could not find installation for CCS version: %s"
+                           % version)
 
-    # Get version numbers of installations
-    for installation in ccs_installations:
-        try:
-            v = get_ccs_version(installation)
-            ccs_installation_versions[v] = installation     # duplicate versions will be overwritten
-            version_list.append(v)
-        except:
-            continue
+    return ccs_path
+
+
+def __find_ccs_in_index(installations, version=None):
+    """Returns launcher checked path of latest installation matching version
+    (None if no installation matches)"""
+    ccs_installation_versions = dict()
+    for installation in installations:
+        # duplicate versions will be overwritten
+        ccs_installation_versions[installation['version']] = installation
+
+    version_list = list(ccs_installation_versions.keys())
 
     # Filter to only matching version numbers
     if version is not None:
         version_list = [ v for v in version_list if re.search("^" + version, v) ]
 
-        # Raise error if specific version could not be found
-        if len(version_list) == 0:
-            raise FindCCSError("Could not find installation for CCS version: %s" % version)
+    if len(version_list) == 0:
+        return None
+
+    installation = ccs_installation_versions[max(version_list)]
+    if not os.path.exists(installation['launcher']):
+        return None
 
-    ccs_path = ccs_installation_versions[max(version_list)]
-    return os.path.normpath(ccs_path)
+    return installation['path']
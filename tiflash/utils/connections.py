@@ -13,6 +13,7 @@ import re
 import json
 
 from tiflash.utils import xmlhelper
+from tiflash.utils import targetdb
 
 CONNECTIONS_DIR = "/ccs_base/common/targetdb/connections"
 DEBUG_PROBES_PATH = "/ccs_base/cloudagent/src/targetDetection/debug_probes.json"
@@ -42,7 +43,28 @@ def get_connections_directory(ccs_path):
     return connections_directory
 
 
-def get_connections(ccs_path):
+def get_connection_index(ccs_path, progress=None):
+    """Returns index of connection xmls (see targetdb). Each record holds the
+    'name' of a connection xml.
+
+    Args:
+        ccs_path (str): full path to ccs installation to use
+        progress (callable, optional): called with progress events while
+            xml files are parsed (see targetdb.get_index())
+
+    Returns:
+        targetdb.TargetDBIndex: index of connections directory
+
+    Raises:
+        ConnectionsError: raises exception if connections directory can not
+            be found
+    """
+    return targetdb.get_index(get_connections_directory(ccs_path),
+                              __parse_connection_xml, "connections",
+                              progress=progress)
+
+
+def get_connections(ccs_path, progress=None):
     """ Returns list of installed connection names.
 
     Searches "<ccs_path>/ccs_base/common/targetdb/connections" directory for
@@ -50,6 +72,8 @@ def get_connections(ccs_path):
 
     Args:
         ccs_path (str): full path to ccs installation to use
+        progress (callable, optional): called with progress events while
+            xml files are parsed (see targetdb.get_index())
 
     Returns:
         list: connection names
@@ -59,21 +83,7 @@ def get_connections(ccs_path):
             be found
 
     """
-    #   Set Connections directory
-    connections_directory = get_connections_directory(ccs_path)
-
-    #   Get connections xmls
-    connection_xmls = get_connection_xmls(ccs_path, full_path=True)
-
-    connection_list = list()
-    for cxml in connection_xmls:
-        try:    # Some xmls are not valid connection xml files
-            connection = get_connection_name(cxml)
-        except Exception:
-            continue
-        connection_list.append(connection)
-
-    return connection_list
+    return get_connection_index(ccs_path, progress).values('name')
 
 
 def get_connection_xml_path(xml_name, ccs_path):
@@ -91,19 +101,10 @@ def get_connection_xml_path(xml_name, ccs_path):
         ConnectionsError: raises exception if connections directory can not
             be found
     """
-    connection_xml = None
-
     if not xml_name.endswith('.xml'):
         xml_name += ".xml"
 
-    #   Set Connections directory
-    connection_xmls = get_connection_xmls(ccs_path)
-
-    if xml_name in connection_xmls:
-        connection_xml = os.path.normpath(
-                            get_connections_directory(ccs_path) + "/" + xml_name)
-
-    return connection_xml
+    return get_connection_index(ccs_path).path(xml_name)
 
 
 
@@ -126,13 +127,16 @@ def get_connection_xmls(ccs_path, full_path=False):
     return conns
 
 
-def get_connection_name(conn_xml):
+def get_connection_name(conn_xml, ccs_path=None):
     """ Returns full connection name (as specified in connectionxml)
 
     Opens connection xml file and reads 'desc' of connection tag.
 
     Args:
         conn_xml (str): full path to connection xml file to parse
+        ccs_path (str, optional): full path to ccs installation; the name is
+            read from its connection index if conn_xml is one of its
+            connection xmls
 
     Returns:
         str: connection name
@@ -141,6 +145,10 @@ def get_connection_name(conn_xml):
         ConnectionsError: raises exception xml is unable to be parsed
 
     """
+    record = __get_indexed_record(conn_xml, ccs_path)
+    if record is not None:
+        return record['name']
+
     root = __get_connection_root(conn_xml)
 
     if root.tag != "connection":
@@ -225,6 +233,32 @@ def get_connection_xml_from_vidpid(vid, pid, ccs_path):
     return connection_path
 
 
+def __get_indexed_record(conn_xml, ccs_path):
+    """Returns record of connection xml in the connection index of ccs_path
+    (None if ccs_path is None or conn_xml is not a valid connection xml of
+    ccs_path)"""
+    if ccs_path is None:
+        return None
+
+    try:
+        index = get_connection_index(ccs_path)
+    except ConnectionsError:
+        return None
+
+    xml_name = os.path.basename(conn_xml)
+    indexed_path = index.path(xml_name)
+    if indexed_path is None or os.path.normcase(os.path.abspath(
+            indexed_path)) != os.path.normcase(os.path.abspath(conn_xml)):
+        return None
+
+    return index.record(xml_name)
+
+
+def __parse_connection_xml(conn_xml):
+    """Returns values of connection xml kept in the connection index"""
+    return {'name': get_connection_name(conn_xml)}
+
+
 def __get_connection_root(connection_path):
     """Returns the root Element of the connection file
 
@@ -232,12 +266,13 @@ def __get_connection_root(connection_path):
         connection_path (str): full path to connection file to parse
 
     Returns:
-        xml.Element: root element of connection file
+        xml.Element: root element of connection file (only tag and
+        attributes; the file is only read up to the root's start tag)
     """
     if not os.path.exists(connection_path):
         raise ConnectionsError("Could not find connection xml: %s" %
             connection_path)
 
-    root = xmlhelper.get_xml_root(connection_path)
+    root = xmlhelper.get_xml_root_element(connection_path)
 
     return root
@@ -12,6 +12,7 @@ import os
 import re
 
 from tiflash.utils import xmlhelper
+from tiflash.utils import targetdb
 
 CPUS_DIR = "/ccs_base/common/targetdb/cpus"
 
@@ -38,7 +39,26 @@ def get_cpus_directory(ccs_path):
     return cpus_directory
 
 
-def get_cpus(ccs_path):
+def get_cpu_index(ccs_path, progress=None):
+    """Returns index of cpu xmls (see targetdb). Each record holds the
+    'name' of a cpu xml.
+
+    Args:
+        ccs_path (str): full path to ccs installation to use
+        progress (callable, optional): called with progress events while
+            xml files are parsed (see targetdb.get_index())
+
+    Returns:
+        targetdb.TargetDBIndex: index of cpus directory
+
+    Raises:
+        CPUError: raises exception if cpus directory can not be found
+    """
+    return targetdb.get_index(get_cpus_directory(ccs_path), __parse_cpu_xml,
+                              "cpus", progress=progress)
+
+
+def get_cpus(ccs_path, progress=None):
     """ Returns list of installed cpu names.
 
     Searches "<ccs_path>/ccs_base/common/targetdb/cpus" directory for
@@ -46,6 +66,8 @@ def get_cpus(ccs_path):
 
     Args:
         ccs_path (str): full path to ccs installation to use
+        progress (callable, optional): called with progress events while
+            xml files are parsed (see targetdb.get_index())
 
     Returns:
         list: cpu names
@@ -54,21 +76,7 @@ def get_cpus(ccs_path):
         CPUError: raises exception if cpus directory can not
         be found
     """
-    #   Set CPU directory
-    cpus_directory = get_cpus_directory(ccs_path)
-
-    #   Get cpus xmls
-    cpu_xmls = get_cpu_xmls(ccs_path, full_path=True)
-
-    cpu_list = list()
-    for cxml in cpu_xmls:
-        try:    # Some xmls are not valid cpu xml files
-            cpu = get_cpu_name(cxml)
-        except Exception:
-            continue
-        cpu_list.append(cpu)
-
-    return cpu_list
+    return get_cpu_index(ccs_path, progress).values('name')
 
 
 def get_cpu_xmls(ccs_path, full_path=False):
@@ -103,19 +111,10 @@ def get_cpu_xml_path(xml_name, ccs_path):
     Raises:
         CPUError: raises exception if cpu directory can not be found
     """
-    cpu_xml = None
-
     if not xml_name.endswith('.xml'):
         xml_name += ".xml"
 
-    #   Set Connections directory
-    cpu_xmls = get_cpu_xmls(ccs_path)
-
-    if xml_name in cpu_xmls:
-        cpu_xml = os.path.normpath(
-                            get_cpus_directory(ccs_path) + "/" + xml_name)
-
-    return cpu_xml
+    return get_cpu_index(ccs_path).path(xml_name)
 
 
 def get_cpu_name(xml_file):
@@ -136,7 +135,7 @@ def get_cpu_name(xml_file):
     root = __get_cpu_root(xml_file)
 
     if root.tag != "cpu":
-        raise CPUError("Error parsing cpu xml: %s" % cpu_xml)
+        raise CPUError("Error parsing cpu xml: %s" % xml_file)
 
     cpu_name = xmlhelper.get_attrib_value(root.attrib, ["desc", "id"])
 
@@ -171,6 +170,11 @@ def find_cpu(cpu_name, ccs_path):
     return match_list
 
 
+def __parse_cpu_xml(cpu_xml):
+    """Returns values of cpu xml kept in the cpu index"""
+    return {'name': get_cpu_name(cpu_xml)}
+
+
 def __get_cpu_root(cpu_path):
     """Returns the root Element of the cpu file
 
@@ -178,11 +182,12 @@ def __get_cpu_root(cpu_path):
         cpu_path (str): full path to cpu file to parse
 
     Returns:
-        xml.Element: root element of cpu file
+        xml.Element: root element of cpu file (only tag and attributes;
+        the file is only read up to the root's start tag)
     """
     if not os.path.exists(cpu_path):
         raise CPUError("Could not find cpu xml: %s" % cpu_path)
 
-    root = xmlhelper.get_xml_root(cpu_path)
+    root = xmlhelper.get_xml_root_element(cpu_path)
 
     return root
@@ -13,6 +13,7 @@ import re
 import json
 
 from tiflash.utils import xmlhelper
+from tiflash.utils import targetdb
 
 from tiflash.utils.connections import get_connections_directory
 from tiflash.utils.cpus import get_cpus_directory
@@ -23,6 +24,12 @@ BOARD_IDS_PATH = "/ccs_base/cloudagent/src/targetDetection/board_ids.json"
 # Place this file in utils/ folder to use a custom board_ids file
 CUSTOM_BOARD_IDS_FILE = "board_ids.json"
 
+# Elements read from device xmls {key: (tag, attribs)} (see xmlhelper)
+DEVICE_XML_ELEMENTS = {
+    'cpu': ('cpu', None),
+    'connection': ('property', {'id': 'DefaultConnection'}),
+}
+
 
 class DeviceError(Exception):
     """Generic Device Error"""
@@ -46,6 +53,27 @@ def get_devices_directory(ccs_path):
     return devices_directory
 
 
+def get_device_index(ccs_path, progress=None):
+    """Returns index of device xmls (see targetdb). Each record holds the
+    'devicetype', 'cpu' and default 'connection' (xml name) of a device xml.
+
+    Args:
+        ccs_path (str): full path to ccs installation to use
+        progress (callable, optional): called with progress events while
+            xml files are parsed (see targetdb.get_index())
+
+    Returns:
+        targetdb.TargetDBIndex: index of devices directory
+
+    Raises:
+        DeviceError: raises exception if devices directory can not
+            be found
+    """
+    return targetdb.get_index(get_devices_directory(ccs_path),
+                              __parse_device_xml, "devices",
+                              progress=progress)
+
+
 def get_device_xml_from_devicetype(devicetype, ccs_path):
     """Returns full path to device xml given a devicetype if exists, else returns None.
 
@@ -60,68 +88,59 @@ def get_device_xml_from_devicetype(devicetype, ccs_path):
         DeviceError: raises exception if devices directory can not
             be found
     """
-    device_xml = None
-
-    # Get devices xmls
-    device_xmls = get_device_xmls(ccs_path, full_path=True)
-
-    for dxml in device_xmls:
-        try:    # Some xmls are not valid device xml files
-            device = get_devicetype(dxml)
-        except Exception:
-            continue
+    index = get_device_index(ccs_path)
+    xml_name = index.find_one('devicetype', devicetype)
 
-        if device == devicetype:
-            device_xml = os.path.normpath(dxml)
-            break
-
-    else:
+    if xml_name is None:
         raise DeviceError("Could not find device xml for %s. Please install "
                             "drivers for %s.""" % (devicetype, devicetype))
 
-    return device_xml
+    return index.path(xml_name)
 
 
-def get_devicetype(device_xml):
+def get_devicetype(device_xml, ccs_path=None):
     """Returns the devicetype from the device xml file
 
     Args:
         device_xml (str): full path to device xml file
+        ccs_path (str, optional): full path to ccs installation; the
+            devicetype is read from its device index if device_xml is one of
+            its device xmls
 
     Returns:
         str: devicetype set in device xml file
     """
-    devicetype = None
-    root = __get_device_root(device_xml)
+    record = __get_indexed_record(device_xml, ccs_path)
+    if record is not None:
+        return record['devicetype']
 
-    if root.tag != "device":
-        raise DeviceError("Error parsing devicetype from device xml: %s" %
-                        device_xml)
-
-    devicetype = xmlhelper.get_attrib_value(root.attrib, ["desc", "partnum", "id"])
+    (root, found) = __find_device_elements(device_xml)
 
-    return devicetype
+    return __get_devicetype_from_root(root, device_xml)
 
 
-def get_cpu(device_xml):
+def get_cpu(device_xml, ccs_path=None):
     """Returns the cpu name from device xml file.
 
     Args:
         device_xml (str): full path to the device xml file to parse
+        ccs_path (str, optional): full path to ccs installation; the cpu is
+            read from its device index if device_xml is one of its device
+            xmls
 
     Returns:
         str: cpu name
     """
-    cpu = None
-    root = __get_device_root(device_xml)
+    record = __get_indexed_record(device_xml, ccs_path)
+    if record is not None:
+        if record['cpu'] is None:
+            raise DeviceError("Error parsing cpu from device xml: %s" %
+                              device_xml)
+        return record['cpu']
 
-    cpu_element = root.find(".//cpu")
-    if cpu_element is None:
-        raise DeviceError("Error parsing cpu from device xml: %s" % device_xml)
+    (root, found) = __find_device_elements(device_xml, ['cpu'])
 
-    cpu = xmlhelper.get_attrib_value(cpu_element.attrib, ["desc", "id"])
-
-    return cpu
+    return __get_cpu_from_element(found.get('cpu'), device_xml)
 
 
 def get_default_connection_xml(device_xml, ccs_path):
@@ -129,6 +148,9 @@ def get_default_connection_xml(device_xml, ccs_path):
 
     Args:
         device_xml (str): full path to device xml file
+        ccs_path (str): full path to ccs installation (the default connection
+            is read from its device index if device_xml is one of its device
+            xmls)
 
     Returns:
         str: default connection xml set in device xml file
@@ -137,16 +159,16 @@ def get_default_connection_xml(device_xml, ccs_path):
         DeviceError: raised if device xml does not contain 'default connection'
     """
     connection_xml = None
-    root = __get_device_root(device_xml)
-
-    conn_element = root.find(".//property[@id='DefaultConnection']")
-
-    if conn_element is None:
-        raise DeviceError("Device XML: %s does not contain a Default "
-                            "Connection type." % device_xml)
-
-    xml_name = xmlhelper.get_attrib_value(conn_element.attrib, ["Value"])
-
+    record = __get_indexed_record(device_xml, ccs_path)
+    if record is not None:
+        xml_name = record['connection']
+        if xml_name is None:
+            raise DeviceError("Device XML: %s does not contain a Default "
+                              "Connection type." % device_xml)
+    else:
+        (root, found) = __find_device_elements(device_xml, ['connection'])
+        xml_name = __get_default_connection_from_element(
+            found.get('connection'), device_xml)
 
     connection_xml = get_connections_directory(ccs_path) + '/' + xml_name
     connection_xml = os.path.normpath(connection_xml)
@@ -186,18 +208,10 @@ def get_device_xml_path(xml_name, ccs_path):
     Raises:
         deviceError: raises exception if device directory can not be found
     """
-    device_xml = None
-
     if not xml_name.endswith('.xml'):
         xml_name += ".xml"
 
-    device_xmls = get_device_xmls(ccs_path)
-
-    if xml_name in device_xmls:
-        device_xml = os.path.normpath(
-                            get_devices_directory(ccs_path) + "/" + xml_name)
-
-    return device_xml
+    return get_device_index(ccs_path).path(xml_name)
 
 
 def get_cpu_xml(device_xml, ccs_path):
@@ -231,7 +245,7 @@ def get_cpu_xml(device_xml, ccs_path):
     return cpu_xml
 
 
-def get_devicetypes(ccs_path):
+def get_devicetypes(ccs_path, progress=None):
     """ Returns list of installed device names.
 
     Searches "<ccs_path>/ccs_base/common/targetdb/devices" directory for
@@ -239,6 +253,8 @@ def get_devicetypes(ccs_path):
 
     Args:
         ccs_path (str): full path to ccs installation to use
+        progress (callable, optional): called with progress events while
+            xml files are parsed (see targetdb.get_index())
 
     Returns:
         list: device names
@@ -248,21 +264,7 @@ def get_devicetypes(ccs_path):
             be found
 
     """
-    #   Set Devices directory
-    devices_directory = get_devices_directory(ccs_path)
-
-    #   Get devices xmls
-    device_xmls = get_device_xmls(ccs_path, full_path=True)
-
-    device_list = list()
-    for cxml in device_xmls:
-        try:    # Some xmls are not valid device xml files
-            device = get_devicetype(cxml)
-        except Exception:
-            continue
-        device_list.append(device)
-
-    return device_list
+    return get_device_index(ccs_path, progress).values('devicetype')
 
 
 def find_device(device_name, ccs_path):
@@ -366,7 +368,7 @@ def get_device_from_serno(serno, ccs_path):
     """
     dxml_fullpath = get_device_xml_from_serno(serno, ccs_path)
 
-    return get_devicetype(dxml_fullpath)
+    return get_devicetype(dxml_fullpath, ccs_path)
 
 
 def __get_device_root(device_path):
@@ -384,3 +386,84 @@ def __get_device_root(device_path):
     root = xmlhelper.get_xml_root(device_path)
 
     return root
+
+
+def __find_device_elements(device_path, keys=()):
+    """Returns (root, found) of device file, reading it only up to the
+    elements of DEVICE_XML_ELEMENTS given by keys (see
+    xmlhelper.find_elements())"""
+    if not os.path.exists(device_path):
+        raise DeviceError("Could not find device: %s" % device_path)
+
+    matches = dict((k, DEVICE_XML_ELEMENTS[k]) for k in keys)
+
+    return xmlhelper.find_elements(device_path, matches)
+
+
+def __get_indexed_record(device_xml, ccs_path):
+    """Returns record of device xml in the device index of ccs_path (None if
+    ccs_path is None or device_xml is not a valid device xml of ccs_path)"""
+    if ccs_path is None:
+        return None
+
+    try:
+        index = get_device_index(ccs_path)
+    except DeviceError:
+        return None
+
+    xml_name = os.path.basename(device_xml)
+    indexed_path = index.path(xml_name)
+    if indexed_path is None or os.path.normcase(os.path.abspath(
+            indexed_path)) != os.path.normcase(os.path.abspath(device_xml)):
+        return None
+
+    return index.record(xml_name)
+
+
+def __parse_device_xml(device_xml):
+    """Returns values of device xml kept in the device index (reading the
+    xml only once)"""
+    (root, found) = __find_device_elements(device_xml,
+                                           list(DEVICE_XML_ELEMENTS))
+    record = {'devicetype': __get_devicetype_from_root(root, device_xml),
+              'cpu': None, 'connection': None}
+
+    try:
+        record['cpu'] = __get_cpu_from_element(found.get('cpu'), device_xml)
+    except Exception:
+        pass    # Not all device xmls have a cpu
+
+    try:
+        record['connection'] = __get_default_connection_from_element(
+            found.get('connection'), device_xml)
+    except Exception:
+        pass    # Not all device xmls have a default connection
+
+    return record
+
+
+def __get_devicetype_from_root(root, device_xml):
+    """Returns devicetype set in root Element of device file"""
+    if root.tag != "device":
+        raise DeviceError("Error parsing devicetype from device xml: %s" %
+                        device_xml)
+
+    return xmlhelper.get_attrib_value(root.attrib, ["desc", "partnum", "id"])
+
+
+def __get_cpu_from_element(cpu_element, device_xml):
+    """Returns cpu name set in cpu Element of device file"""
+    if cpu_element is None:
+        raise DeviceError("Error parsing cpu from device xml: %s" % device_xml)
+
+    return xmlhelper.get_attrib_value(cpu_element.attrib, ["desc", "id"])
+
+
+def __get_default_connection_from_element(conn_element, device_xml):
+    """Returns default connection xml name set in DefaultConnection property
+    Element of device file"""
+    if conn_element is None:
+        raise DeviceError("Device XML: %s does not contain a Default "
+                          "Connection type." % device_xml)
+
+    return xmlhelper.get_attrib_value(conn_element.attrib, ["Value"])
@@ -9,10 +9,19 @@ Contact: webbjcam@gmail.com
 """
 
 import subprocess
+import threading
+import tempfile
 import platform
+import signal
+import json
+import time
+import sys
 import os
+from collections import deque
 
 from tiflash.utils.result import ResultServer
+from tiflash.utils import workspace as ws
+from tiflash.utils.ccs import get_ccs_launcher_path
 
 MAIN_JS_PATH = "js/main.js"
 ECLIPSE_SUBPATH = "/eclipse"
@@ -20,17 +29,126 @@ DSS_ARGS = ['-nosplash', '-application', 'com.ti.ccstudio.apps.runScript',
             '-product', 'com.ti.ccstudio.branding.product', '-dss.rhinoArgs']
 
 CMD_DEFAULT_TIMEOUT = 60
+RESULT_VERSION = 1  # version of result envelope (must match js/main.js)
+POLL_INTERVAL = 0.1         # interval to check dss process (seconds)
+EXIT_GRACE_PERIOD = 10      # time for dss to exit after posting result
+RESULT_GRACE_PERIOD = 1.0   # time to wait for result after dss exits
+MAX_OUTPUT_SIZE = 64 * 1024  # max bytes of dss output kept for errors
+MAX_CMDLINE_ARGS = 8000     # larger commands are passed in an args file
+MAX_LAUNCHER_DEPTH = 4      # max depth of eclipse dir searched for launcher
+
+# script launcher path found for each ccs installation {ccs_path: dss_path}
+_dss_path_memo = dict()
 
 class DSSError(Exception):
     """Generic DSS Error"""
     pass
 
 
+class DSSTimeoutError(DSSError):
+    """DSS command did not complete before its deadline.
+
+    Attributes:
+        output (str): last output of the dss process before it was killed
+    """
+    def __init__(self, message, output=None):
+        super(DSSTimeoutError, self).__init__(message)
+        self.output = output
+
+
+class ProcessOutput(object):
+    """Reads the output of a dss process (on a background thread), echoing
+    it to stdout and keeping the last MAX_OUTPUT_SIZE bytes of it.
+
+    Args:
+        pipe (file): stdout pipe of process
+    """
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+        self.chunks = deque()
+        self.size = 0
+        self.thread = threading.Thread(target=self.__read)
+        self.thread.daemon = True
+
+    def start(self):
+        """Starts reading output"""
+        self.thread.start()
+
+    def join(self, timeout=None):
+        """Waits for the process to close its output"""
+        self.thread.join(timeout)
+
+    def get(self):
+        """Returns the kept output (str)"""
+        return b"".join(self.chunks).decode("utf-8", "replace")
+
+    def __read(self):
+        """PRIVATE FUNCTION: Reads output until pipe is closed"""
+        for line in iter(self.pipe.readline, b''):
+            sys.stdout.write(line.decode("utf-8", "replace"))
+            sys.stdout.flush()
+
+            self.chunks.append(line)
+            self.size += len(line)
+            while self.size > MAX_OUTPUT_SIZE and len(self.chunks) > 1:
+                self.size -= len(self.chunks.popleft())
+
+        self.pipe.close()
+
+
+def new_process_group_kwargs():
+    """Returns Popen keyword arguments for starting a process in its own
+    process group (so it can be killed along with its children)"""
+    if platform.system() == "Windows":
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    elif sys.version_info[0] == 2:
+        return {'preexec_fn': os.setsid}
+    else:
+        return {'start_new_session': True}
+
+
+def kill_process_group(pid):
+    """Kills all processes of the process group started (with
+    new_process_group_kwargs()) as process 'pid' (i.e. ccstudio and the JVM
+    it starts).
+
+    Args:
+        pid (int): process id of process group leader
+    """
+    if platform.system() == "Windows":
+        with open(os.devnull, 'w') as devnull:
+            subprocess.call(["taskkill", "/F", "/T", "/PID", str(pid)],
+                            stdout=devnull, stderr=devnull)
+    else:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass    # already exited
+
+
+def kill_process_tree(proc):
+    """Kills a process started with new_process_group_kwargs() and all of
+    its children, and waits for it to exit.
+
+    Args:
+        proc (subprocess.Popen): process to kill
+    """
+    kill_process_group(proc.pid)
+
+    if proc.poll() is None:
+        proc.kill()
+    proc.wait()
+
+
 def find_dss(ccs_path):
     """Finds path to eclipsec/ccstudio executable.
 
-    Searches (OS specific) CCS installation directory for eclipsec/ccstudio
-    executable.
+    Checks the (OS specific) canonical location of the eclipsec/ccstudio
+    executable first and only searches the CCS installation's eclipse
+    directory (up to MAX_LAUNCHER_DEPTH levels deep) if it is not there. The
+    path found is remembered for each CCS installation, so only the first
+    call for an installation accesses the disk.
 
     Args:
         ccs_path (str): path to ccs installation to use
@@ -55,48 +173,53 @@ def find_dss(ccs_path):
     else:
         raise DSSError("Unsupported Operating System: %s" % system)
 
-    if not os.path.exists(ccs_path):
-        raise DSSError("Could not find CCS installation: %s" % ccs_path)
+    if ccs_path in _dss_path_memo:
+        return _dss_path_memo[ccs_path]
 
-    walker = os.walk(ccs_path + ECLIPSE_SUBPATH)
+    script_launcher_path = get_ccs_launcher_path(ccs_path)
 
-    for root, dirs, files in walker:
-        if script_launcher in files:
-            script_launcher_path = os.path.join(root, script_launcher)
-            script_launcher_path = os.path.normpath(script_launcher_path)
-            break
+    if not os.path.isfile(script_launcher_path):
+        if not os.path.exists(ccs_path):
+            raise DSSError("Could not find CCS installation: %s" % ccs_path)
 
-    else:
-        raise DSSError("Could not find script launcher: %s" % script_launcher)
+        eclipse_path = os.path.normpath(ccs_path + ECLIPSE_SUBPATH)
+        walker = os.walk(eclipse_path)
 
-    return script_launcher_path
+        for root, dirs, files in walker:
+            if script_launcher in files:
+                script_launcher_path = os.path.join(root, script_launcher)
+                script_launcher_path = os.path.normpath(script_launcher_path)
+                break
 
+            # Bound search depth (eclipse dir holds thousands of plugin files)
+            depth = root[len(eclipse_path):].count(os.sep)
+            if depth >= MAX_LAUNCHER_DEPTH:
+                dirs[:] = []
 
-def call_dss(dss_path, commands, workspace=None, timeout=CMD_DEFAULT_TIMEOUT):
-    """Calls js/main.js via new script runner (eclipsec)
+        else:
+            raise DSSError("Could not find script launcher: %s" %
+                           script_launcher)
 
-    Makes a subprocess call to main.js by using the given eclipsec exe
+    _dss_path_memo[ccs_path] = script_launcher_path
+
+    return script_launcher_path
+
+
+def build_dss_cmd(dss_path, port, commands, workspace=None):
+    """Builds the command list for calling js/main.js via the script runner
 
     Args:
         dss_path (str): Path to dss.bat/.sh installation to use
+        port (int): port of local socket main.js should connect to
         commands (list): list of string commands to pass to main.js
         workspace (str): workspace name
-        timeout (int):  time to give command to complete (negative == infinite)
 
     Returns:
-        (bool, str): returns tuple with (bool=result, str=value)
-            caller must convert value to proper value
+        list: command list to pass to subprocess
 
+    Raises:
+        DSSError: raises exception if main.js can not be found
     """
-    # Open local socket for IPC (result of command is posted to socket)
-    result_server = ResultServer(debug=False)
-    port = result_server.start()
-    result = None
-
-    # Remove timeout if negative number provided (inifinite timeout)
-    if timeout < 0:
-        timeout = None
-
     main_js = os.path.abspath(os.path.dirname(
         __file__) + "/../" + MAIN_JS_PATH)
     if not os.path.isfile(main_js):
@@ -119,18 +242,182 @@ def call_dss(dss_path, commands, workspace=None, timeout=CMD_DEFAULT_TIMEOUT):
     script_args_str = " ".join(script_args)
 
     cmd.append(script_args_str)
-    try:
-        retcode = subprocess.call(cmd)
-    except Exception as e:
-        print(e)
-        return (False, "Command Failed")
 
-    # Wait on result to be populated
-    result = result_server.get_result(timeout=timeout)
+    return cmd
+
+
+def prepare_commands(commands):
+    """Returns the commands to pass to main.js on the command line.
+
+    Commands too large for the command line (OS limits on argument length,
+    i.e. large memory writes) are written to a temporary JSON file instead,
+    which main.js reads with '--argsfile <path>'.
+
+    Args:
+        commands (list): list of string commands to pass to main.js
+
+    Returns:
+        (list, str): returns tuple of (commands, args_file); args_file is
+            the path of the args file to remove once dss exits (None if
+            commands fit on the command line)
+    """
+    commands = [str(c) for c in commands]
+    if sum(len(c) + 1 for c in commands) <= MAX_CMDLINE_ARGS:
+        return (commands, None)
+
+    (fd, args_file) = tempfile.mkstemp(prefix="tiflash-args-",
+                                       suffix=".json")
+    with os.fdopen(fd, 'w') as f:
+        json.dump(commands, f)
+
+    return (["--argsfile", "\"%s\"" % args_file], args_file)
+
+
+def remove_args_file(args_file):
+    """Removes an args file created by prepare_commands() (if any)"""
+    if args_file is not None:
+        try:
+            os.remove(args_file)
+        except OSError:
+            pass
+
+
+def call_dss(dss_path, commands, workspace=None, timeout=None,
+             sink=None, progress=None, timings=None, deadline=None,
+             attach=False):
+    """Calls js/main.js via new script runner (eclipsec)
+
+    Makes a subprocess call to main.js by using the given eclipsec exe
+
+    Args:
+        dss_path (str): Path to dss.bat/.sh installation to use
+        commands (list): list of string commands to pass to main.js
+        workspace (str): workspace name (if None, a free workspace is
+            allocated for the call)
+        timeout (int):  deprecated alias of deadline; used as the deadline
+            if deadline is not given (the timeout of each DSS call is passed
+            to main.js in the session args, see TIFlash.set_timeout())
+        sink (file, optional): file object to stream data posted by command
+            to (i.e. large memory dumps)
+        progress (callable, optional): callback called with each progress
+            event posted by command (see result.notify_progress())
+        timings (dict, optional): dict to add timings (seconds) measured on
+            the python side to ('teardown': time for dss to exit after
+            posting the result)
+        deadline (float, optional): wall-clock time (seconds) the whole
+            invocation (jvm startup included) may take before the dss
+            process and its children are killed (None/negative == no
+            deadline)
+        attach (bool, optional): command attaches CCS session to device (dss
+            keeps running after posting the result until CCS is closed)
+
+    Returns:
+        (bool, str): returns tuple with (bool=result, str=value)
+            value is the result envelope; decode with decode_result()
+
+    Raises:
+        DSSTimeoutError: raised if the result is not posted before the
+            deadline
+
+    """
+    if deadline is None:
+        deadline = timeout
+
+    # Remove deadline if negative number provided (no deadline)
+    if deadline is not None and deadline < 0:
+        deadline = None
+    end_time = None if deadline is None else time.time() + deadline
+
+    # Use a workspace not in use by any other dss process
+    allocated = None
+    if workspace is None:
+        allocated = ws.allocate_workspace()
+        workspace = allocated.path
+
+    # Open local socket for IPC (result of command is posted to socket)
+    result_server = ResultServer(sink=sink, progress=progress,
+                                 timeout=deadline, debug=False)
+    args_file = None
+
+    try:
+        port = result_server.start()
+        (script_commands, args_file) = prepare_commands(commands)
+        cmd = build_dss_cmd(dss_path, port, script_commands,
+                            workspace=workspace)
+
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT,
+                                    **new_process_group_kwargs())
+        except Exception as e:
+            print(e)
+            return (False, "Command Failed")
+
+        output = ProcessOutput(proc.stdout)
+        output.start()
+
+        retcode = _wait_for_dss(proc, result_server, end_time,
+                                attach=attach)
+        exit_time = time.time()
+
+        if retcode is None:
+            kill_process_tree(proc)
+            output.join(POLL_INTERVAL)
+            raise DSSTimeoutError("Command exceeded its deadline of %s "
+                                  "seconds" % deadline, output=output.get())
+
+        output.join(POLL_INTERVAL)
+
+        # Result may still be in flight if process exited first
+        result = result_server.get_result(timeout=RESULT_GRACE_PERIOD)
+
+        if timings is not None and result_server.result_time is not None:
+            timings['teardown'] = max(exit_time - result_server.result_time,
+                                      0)
+    finally:
+        result_server.stop()
+        remove_args_file(args_file)
+        if allocated is not None:
+            allocated.release()
 
     return (retcode == 0, result)
 
 
+def _wait_for_dss(proc, result_server, end_time, attach=False):
+    """PRIVATE FUNCTION: Waits for dss process to exit.
+
+    The deadline (end_time, None = no deadline) applies until the result is
+    posted. After that the process
+    is given EXIT_GRACE_PERIOD to exit (and is killed if it does not), unless
+    attaching, in which case it runs until CCS is closed.
+
+    Returns:
+        int: return code of process (0 if killed after posting its result)
+        or None if the deadline passed
+    """
+    exit_deadline = None
+
+    while True:
+        retcode = proc.poll()
+        if retcode is not None:
+            return retcode
+
+        now = time.time()
+        if exit_deadline is None and result_server.done():
+            if attach:
+                return proc.wait()
+            exit_deadline = now + EXIT_GRACE_PERIOD
+
+        if exit_deadline is not None:
+            if now > exit_deadline:
+                kill_process_tree(proc)
+                return 0
+        elif end_time is not None and now > end_time:
+            return None
+
+        time.sleep(POLL_INTERVAL)
+
+
 def format_args(args):
     """Converts args dict to properly formatted cmd list for dss scripts
     """
@@ -150,11 +437,85 @@ def format_args(args):
     return arg_list
 
 
+def decode_result(code, result):
+    """Decodes the result envelope posted by js/main.js
+
+    The envelope is a JSON object of format
+    {version, status, type, value, error, timings}. Results that are not an
+    envelope (i.e. timeout/launch failure messages) are returned as is.
+
+    Args:
+        code (bool): result of call_dss() (or DSSWorker.run())
+        result (str): result envelope string (or None if no result)
+
+    Returns:
+        (bool, value, dict): returns tuple of (success, value, envelope);
+            value is the typed command result on success or the error
+            message on failure. envelope is None if result is not an
+            envelope.
+
+    Raises:
+        DSSError: raised if envelope version is not supported
+    """
+    try:
+        envelope = json.loads(result)
+    except (TypeError, ValueError):
+        return (code, result, None)
+
+    if type(envelope) is not dict or 'version' not in envelope:
+        return (code, result, None)
+
+    (success, value) = decode_envelope(envelope)
+
+    return (code and success, value, envelope)
+
+
+def decode_envelope(envelope):
+    """Returns (success, value) of an already parsed result envelope (see
+    decode_result())
+
+    Raises:
+        DSSError: raised if envelope version is not supported
+    """
+    if envelope['version'] > RESULT_VERSION:
+        raise DSSError("Unsupported result version: %s" % envelope['version'])
+
+    if envelope['status'] != 'ok':
+        return (False, envelope['error'])
+
+    return (True, envelope['value'])
+
+
+def format_value(value):
+    """Formats a typed result value as a string (the same way js/main.js
+    formats values)
+
+    Args:
+        value: typed value of result envelope
+
+    Returns:
+        str: value as string
+    """
+    if value is None:
+        return ""
+    elif value is True:
+        return "true"
+    elif value is False:
+        return "false"
+    elif type(value) is list:
+        return ",".join([format_value(v) for v in value])
+    elif isinstance(value, type(u"")):
+        return value
+
+    return str(value)
+
+
 def parse_response_float(response):
     """Handles the parsing of a string response representing a float
 
-    All responses are sent as strings. In order to convert these strings to
-    their python equivalent value, you must call a parse_response_* function.
+    Values decoded from a result envelope are already typed (and are
+    returned as is). String responses (i.e. option values) must be converted
+    to their python equivalent value by calling a parse_response_* function.
 
     Args:
         response (str): response string to parse and convert to proper value
@@ -172,8 +533,9 @@ def parse_response_number(response):
     """Handles the parsing of a string response representing a number (no
     decimal)
 
-    All responses are sent as strings. In order to convert these strings to
-    their python equivalent value, you must call a parse_response_* function.
+    Values decoded from a result envelope are already typed (and are
+    returned as is). String responses (i.e. option values) must be converted
+    to their python equivalent value by calling a parse_response_* function.
 
     Args:
         response (str): response string to parse and convert to proper value
@@ -189,8 +551,9 @@ def parse_response_number(response):
 def parse_response_list(response):
     """Handles the parsing of a string response representing a list
 
-    All responses are sent as strings. In order to convert these strings to
-    their python equivalent value, you must call a parse_response_* function.
+    Values decoded from a result envelope are already typed (and are
+    returned as is). String responses (i.e. option values) must be converted
+    to their python equivalent value by calling a parse_response_* function.
 
     Args:
         response (str): response string to parse and convert to proper value
@@ -200,6 +563,10 @@ def parse_response_list(response):
     """
     element_sep = ";;"
 
+    # Already typed (decoded from result envelope)
+    if type(response) is list:
+        return response
+
     parsed_response = response.split(element_sep)
 
     return parsed_response
@@ -208,8 +575,9 @@ def parse_response_list(response):
 def parse_response_bool(response):
     """Handles the parsing of a string response representing a bool
 
-    All responses are sent as strings. In order to convert these strings to
-    their python equivalent value, you must call a parse_response_* function.
+    Values decoded from a result envelope are already typed (and are
+    returned as is). String responses (i.e. option values) must be converted
+    to their python equivalent value by calling a parse_response_* function.
 
     Args:
         response (str): response string to parse and convert to proper value
@@ -218,7 +586,9 @@ def parse_response_bool(response):
         (bool): returns reponse string converted to bool
     """
     parsed_response = None
-    if response.lower() == 'true':
+    if type(response) is bool:   # Already typed
+        parsed_response = response
+    elif response.lower() == 'true':
         parsed_response = True
     elif response.lower() == 'false':
         parsed_response = False
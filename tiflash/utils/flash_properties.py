@@ -11,7 +11,6 @@ flash_properties.py    --   helper module for gathering device specific
 
 import os
 import re
-from xml.dom import minidom
 
 from tiflash.utils import xmlhelper
 
@@ -51,21 +50,20 @@ def __translate_to_property_xml(devicetype, translator_xml):
         raise FlashPropertiesError("Could not find 'translator' file: %s" %
                                    translator_xml)
 
-    xmldoc = minidom.parse(translator_xml)
-
-    property_files = xmldoc.getElementsByTagName('FlashProperties')
+    # Stream translator (reading stops once the property file is found)
+    property_files = xmlhelper.iter_elements(translator_xml, 'FlashProperties')
 
     # Loop through device types in translator to find correct property file
     for pf in property_files:
         # only take elements that have attributes
-        if pf.attributes is None or len(pf.attributes) == 0:
+        if len(pf.attrib) == 0:
             continue
 
-        property_file_name = pf.attributes['name'].value
-        partnums = pf.getElementsByTagName('partnum')
+        property_file_name = pf.get('name')
+        partnums = pf.iter('partnum')
 
         for pn in partnums:
-            beginsWith = pn.attributes['beginsWith'].value
+            beginsWith = pn.get('beginsWith')
 
             # Prepare for regex
             beginsWithPattern = beginsWith.replace('*', '.')
@@ -171,44 +169,41 @@ def get_device_properties_xml(devicetype, ccs_path):
 def get_property_elements(xmlfile, target=None, exclude_tags=None):
     """ Returns list of properties in given xmlfile
 
-    Opens property xml file and reads 'property' tags
+    Streams property xml file and reads 'property' tags (only the property
+    elements returned are kept in memory)
 
     Args:
         xmlfile (str): full path to device property xml file to parse
 
     Returns:
-        list: list of property names
+        list: list of property elements (ElementTree.Element)
 
     Raises:
         FlashPropertiesError: raises exception if xml is unable to be parsed
 
     """
-    xmldoc = minidom.parse(xmlfile)
-
-    properties = xmlhelper.get_elements_by(xmldoc, tag='property')
-
-    if len(properties) < 1:
-        raise FlashPropertiesError("Error parsing properties xml: %s"
-                                   % xmlfile)
+    def get_target_name(e):
+        target_element = e.find('.//target')
+        if target_element is None:
+            return ''
+        return target_element.text or ''
 
+    num_properties = 0
     property_elements = []
-    for p in properties:
-        children = xmlhelper.get_elements_by(p, tag='*')
+    for p in xmlhelper.iter_elements(xmlfile, 'property'):
+        num_properties += 1
+        children = list(p.iter())[1:]
         if len(children) != 0:
             for c in children:
-                if c.tagName == 'hidden' or c.tagName == 'action':
+                if c.tag == 'hidden' or c.tag == 'action':
                     break
             else:
-                property_elements.append(p)
-
-    if target is not None:
-        def get_target_name(e):
-            target_element = xmlhelper.get_unique_element_by(e, tag='target')
-            target_name = xmlhelper.get_text_from_element(target_element)
-            return target_name
-
-        property_elements = [ p for p in property_elements if get_target_name(p) == target ]
+                if target is None or get_target_name(p) == target:
+                    property_elements.append(p)
 
+    if num_properties < 1:
+        raise FlashPropertiesError("Error parsing properties xml: %s"
+                                   % xmlfile)
 
     return property_elements
 
@@ -217,30 +212,27 @@ def parse_property_element(element):
     """Returns dict with parsed element information
 
     Args:
-        element (xml.Element): property element to parse
+        element (ElementTree.Element): property element to parse
 
     Returns:
         dict: dictionary of parsed element info
     """
     property_values = dict()
-    property_id = xmlhelper.get_attribute_value(element, 'id')
+    property_id = element.get('id')
 
-    type_element = xmlhelper.get_unique_element_by(element, tag='valueType')
+    type_element = element.find('.//valueType')
     if type_element is None:
         raise FlashPropertiesError("Invalid Property Element")
 
-    property_values['type'] = xmlhelper.get_text_from_element(type_element)
+    property_values['type'] = type_element.text or ''
 
     if property_values['type'] == 'ChoiceList':
-        vals_element = xmlhelper.get_unique_element_by(element, tag='values')
-        val_elements = xmlhelper.get_elements_by(vals_element, tag='value')
-        property_values['choices'] = [xmlhelper.get_text_from_element(val)
-                                      for val in val_elements]
+        vals_element = element.find('.//values')
+        val_elements = vals_element.iter('value')
+        property_values['choices'] = [val.text or '' for val in val_elements]
 
-    default_element = xmlhelper.get_unique_element_by(element,
-                                                      tag='defaultValue')
+    default_element = element.find('.//defaultValue')
     if default_element is not None:
-        property_values['default'] = xmlhelper.get_text_from_element(
-            default_element)
+        property_values['default'] = default_element.text or ''
 
     return {property_id: property_values}
@@ -0,0 +1,258 @@
+"""
+helper module for managing a warm pool of Debug Server Scripting (dss) workers
+
+The pool pre-starts workers into an idle "ready, no target" state. Commands
+are dispatched to an already started worker and a replacement worker is
+started in the background, so commands do not wait on ccstudio startup.
+"""
+
+import threading
+import time
+
+from tiflash.utils.worker import DSSWorker, DSSWorkerError
+
+DEFAULT_POOL_SIZE = 2
+REAP_INTERVAL = 1.0     # max interval between checking for idle workers
+
+
+class DSSWorkerPoolError(DSSWorkerError):
+    """Generic DSS Worker Pool Error"""
+    pass
+
+
+class DSSWorkerPool(object):
+    """Class for managing a pool of pre-started dss workers.
+
+    The pool has the same run() interface as DSSWorker so it can be used
+    anywhere a worker can (i.e. TIFlash.set_worker()).
+
+    Args:
+        dss_path (str): Path to eclipsec/ccstudio executable to use
+        size (int): number of idle (ready) workers to keep started
+        max_size (int, optional): maximum number of workers (idle + busy) to
+            run at once (None = no limit)
+        idle_timeout (float, optional): stop workers that have been idle for
+            this many seconds (None = never). Stopped workers are replaced
+            the next time a worker is needed.
+        debug (bool, optional): choose to include debug messages
+
+    """
+
+    def __init__(self, dss_path, size=DEFAULT_POOL_SIZE, max_size=None,
+                 idle_timeout=None, debug=False):
+        if size < 1:
+            raise DSSWorkerPoolError("Pool size must be at least 1")
+
+        self.dss_path = dss_path
+        self.size = size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.debug = debug
+
+        self.idle = list()      # list of (worker, idle_since) tuples
+        self.busy = set()
+        self.starting = 0       # number of workers currently starting
+        self.last_error = None
+        self.running = False
+
+        self.cond = threading.Condition()
+        self.reaper_thread = None
+
+    def __enter__(self):
+        if not self.running:
+            self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Starts the pool (workers are started in the background)."""
+        with self.cond:
+            if self.running:
+                raise DSSWorkerPoolError("Pool is already running")
+            self.running = True
+            self.__fill()
+
+        if self.idle_timeout is not None:
+            self.reaper_thread = threading.Thread(target=self.__reap)
+            self.reaper_thread.daemon = True
+            self.reaper_thread.start()
+
+    def stop(self):
+        """Stops the pool and all of its workers."""
+        with self.cond:
+            self.running = False
+            workers = [w for w, _ in self.idle] + list(self.busy)
+            self.idle = list()
+            self.busy = set()
+            self.cond.notify_all()
+
+        for worker in workers:
+            worker.stop()
+
+    def get_stats(self):
+        """Returns the number of idle, busy and starting workers
+
+        Returns:
+            dict: dictionary of format {'idle': int, 'busy': int,
+            'starting': int}
+        """
+        with self.cond:
+            return {'idle': len(self.idle), 'busy': len(self.busy),
+                    'starting': self.starting}
+
+    def acquire(self, timeout=None):
+        """Returns an idle (started) worker, waiting for one if necessary.
+
+        A replacement worker is started in the background. The worker must
+        be given back to the pool with release().
+
+        Args:
+            timeout (float, optional): time to wait for a worker (seconds).
+                If 'None' will block/wait forever.
+
+        Returns:
+            DSSWorker: started worker
+
+        Raises:
+            DSSWorkerPoolError: raised if pool is stopped, workers fail to
+                start or timeout is exceeded
+        """
+        deadline = None if timeout is None else time.time() + timeout
+
+        with self.cond:
+            while True:
+                if not self.running:
+                    raise DSSWorkerPoolError("Pool is not running")
+
+                # Raise error if workers are failing to start
+                if not self.idle and self.starting == 0 and \
+                        self.last_error is not None:
+                    error = self.last_error
+                    self.last_error = None
+                    raise DSSWorkerPoolError("Failed to start worker: %s" %
+                                             error)
+
+                # Use most recently idle worker first (others may be reaped)
+                while self.idle:
+                    worker, _ = self.idle.pop()
+                    if worker.is_alive():
+                        self.busy.add(worker)
+                        self.__fill()
+                        return worker
+
+                self.__fill()
+
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise DSSWorkerPoolError("Timed out waiting for an "
+                                                 "idle worker")
+                self.cond.wait(remaining)
+
+    def release(self, worker):
+        """Gives a worker (returned by acquire()) back to the pool.
+
+        Args:
+            worker (DSSWorker): worker to give back
+        """
+        with self.cond:
+            self.busy.discard(worker)
+
+            keep = self.running and worker.is_alive()
+            # Without idle eviction, do not keep more than 'size' idle workers
+            if self.idle_timeout is None and len(self.idle) >= self.size:
+                keep = False
+
+            if keep:
+                self.idle.append((worker, time.time()))
+                self.cond.notify_all()
+                return
+
+        worker.stop()
+
+    def run(self, commands, deadline=None, sink=None, progress=None):
+        """Runs commands on an idle worker of the pool (see DSSWorker.run())
+
+        Args:
+            commands (list): list of string commands to pass to main.js
+            deadline (float, optional): wall-clock time (seconds) to wait
+                for the result of the whole command
+            sink (file, optional): file object to stream data posted by
+                command to
+            progress (callable, optional): callback called with each
+                progress event posted by command
+
+        Returns:
+            (bool, str): returns tuple with (bool=result, str=value)
+        """
+        worker = self.acquire()
+        try:
+            return worker.run(commands, deadline=deadline, sink=sink,
+                              progress=progress)
+        finally:
+            self.release(worker)
+
+    def __fill(self):
+        """PRIVATE FUNCTION: Starts workers in the background until there
+        are 'size' idle/starting workers (must be called with lock held)
+        """
+        while len(self.idle) + self.starting < self.size:
+            total = len(self.idle) + len(self.busy) + self.starting
+            if self.max_size is not None and total >= self.max_size:
+                break
+
+            self.starting += 1
+            spawn_thread = threading.Thread(target=self.__spawn)
+            spawn_thread.daemon = True
+            spawn_thread.start()
+
+    def __spawn(self):
+        """PRIVATE FUNCTION: Starts a worker and adds it to the idle list
+
+        Each worker allocates its own (reusable) workspace.
+        """
+        worker = DSSWorker(self.dss_path, debug=self.debug)
+
+        try:
+            worker.start()
+            error = None
+        except Exception as e:
+            error = e
+
+        with self.cond:
+            self.starting -= 1
+
+            if error is None and self.running:
+                self.idle.append((worker, time.time()))
+                self.cond.notify_all()
+                return
+
+            if error is not None:
+                self.last_error = error
+            self.cond.notify_all()
+
+        worker.stop()
+
+    def __reap(self):
+        """PRIVATE FUNCTION: Stops workers idle for longer than idle_timeout
+        """
+        interval = min(self.idle_timeout, REAP_INTERVAL)
+
+        while True:
+            time.sleep(interval)
+
+            with self.cond:
+                if not self.running:
+                    break
+
+                now = time.time()
+                expired = [w for w, since in self.idle
+                           if now - since >= self.idle_timeout]
+                self.idle = [(w, since) for w, since in self.idle
+                             if w not in expired]
+
+            for worker in expired:
+                worker.stop()
@@ -9,18 +9,29 @@ Contact: webbjcam@gmail.com
 
 """
 
+import json
 import socket
+import struct
 import threading
+import time
 from sys import version_info as pyversion
 
 HOST = "localhost"
-PORT = 19876    # Port to open socket on
-MAX_PORTS = 24   # Determines number of tiflash processes can run simultaneously
+PORT = 0        # Port to open socket on (0 = let OS pick a free port)
 MAX_CLIENTS = 1
 if pyversion[0] == 2:
     SOCK_TIMEOUT = None   # timeouts don't seem to work for py2
 else:
-    SOCK_TIMEOUT = 60   # timeout to wait for result
+    SOCK_TIMEOUT = 60   # default timeout to wait for result
+ACCEPT_POLL_INTERVAL = 0.2  # interval to check server has not been stopped
+
+# Frames: kind (1 byte) + payload length (4 bytes, big endian) + payload
+# (must match tiflash/js/result.js)
+FRAME_HEADER = struct.Struct(">cI")
+FRAME_RESULT = b'R'     # UTF-8 result string (last frame)
+FRAME_DATA = b'D'       # raw data (streamed to sink)
+FRAME_PROGRESS = b'P'   # UTF-8 JSON progress event
+RECV_CHUNK_SIZE = 64 * 1024
 
 
 class ResultServerError(Exception):
@@ -28,6 +39,92 @@ class ResultServerError(Exception):
     pass
 
 
+def recv_frame(sock, sink=None):
+    """Receives a single frame from socket.
+
+    The payload is received directly into a buffer preallocated to the
+    payload length. Data frame payloads are instead streamed (in chunks) to
+    'sink' if provided.
+
+    Args:
+        sock (socket.socket): connected socket to receive frame from
+        sink (file, optional): file object to write data frame payloads to
+            (instead of returning them)
+
+    Returns:
+        (bytes, bytearray): tuple of (kind, payload); payload is None if
+        written to sink. (None, None) is returned if the connection was closed
+        before a frame was received.
+
+    Raises:
+        ResultServerError: raised if connection closes mid-frame
+    """
+    header = bytearray(FRAME_HEADER.size)
+    if not _recv_into(sock, memoryview(header), allow_eof=True):
+        return (None, None)
+
+    kind, length = FRAME_HEADER.unpack(bytes(header))
+
+    if sink is None or kind != FRAME_DATA:
+        payload = bytearray(length)
+        _recv_into(sock, memoryview(payload))
+        return (kind, payload)
+
+    chunk = memoryview(bytearray(min(length, RECV_CHUNK_SIZE) or 1))
+    remaining = length
+    while remaining > 0:
+        n = min(remaining, len(chunk))
+        _recv_into(sock, chunk[:n])
+        sink.write(chunk[:n].tobytes())
+        remaining -= n
+
+    return (kind, None)
+
+
+def notify_progress(progress, payload):
+    """Decodes a progress frame payload and passes the event to progress.
+
+    Progress events are dicts of format {'phase': str, 'status': str,
+    'done': int, 'total': int, 'elapsed': float} where status is 'start',
+    'running' or 'done', done/total are in bytes (total is 0 if unknown) and
+    elapsed is the time (seconds) since the phase started. done/total are
+    left out of events that do not know them (i.e. 'running' events of a
+    flash, see TIFlash.set_progress()).
+    Exceptions raised by the callback are ignored so the channel stays in
+    sync.
+
+    Args:
+        progress (callable): callback to pass event to (None = ignore event)
+        payload (bytearray): payload of progress frame
+    """
+    if progress is None:
+        return
+
+    try:
+        progress(json.loads(payload.decode("utf-8")))
+    except Exception:
+        pass
+
+
+def _recv_into(sock, view, allow_eof=False):
+    """Fills view with data received from sock.
+
+    Returns:
+        bool: False if connection was closed before any data was received
+        (only when allow_eof is True)
+    """
+    received = 0
+    while received < len(view):
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            if allow_eof and received == 0:
+                return False
+            raise ResultServerError("Connection closed mid-frame")
+        received += n
+
+    return True
+
+
 class ResultServer(object):
     """ Class for receiving a result over a local socket
         from js/main.js subprocess.
@@ -40,20 +137,33 @@ class ResultServer(object):
 
     """
 
-    def __init__(self, host=HOST, port=PORT, debug=False):
+    def __init__(self, host=HOST, port=PORT, sink=None, progress=None,
+                 timeout=SOCK_TIMEOUT, debug=False):
         """ Initializes and starts the ResultServer
 
         Args:
             host (str): host to open socket; should ALWAYS be 'localhost'
-            port (int): port to open socket on;
+            port (int): port to open socket on; by default (0) the OS assigns
+                a free port, so there is no limit on the number of
+                ResultServers running at once
+            sink (file, optional): file object to stream data frames to
+            progress (callable, optional): callback called (from the server
+                thread) with each progress event (see notify_progress())
+            timeout (float, optional): time to wait for the result to be
+                posted (None = until stop() is called)
             debug (bool): choose to include debug messages
 
         """
         self.host = host
         self.port = port
+        self.sink = sink
+        self.progress = progress
+        self.timeout = timeout
         self.debug = debug
 
         self.result = None
+        self.result_time = None     # time result was received
+        self.sock = None
         self.server_thread = None
         # Server Running Event (set only when server is running)
         self.running = threading.Event()
@@ -63,17 +173,47 @@ class ResultServer(object):
         self.running.clear()
 
     def start(self):
-        """Starts the Result Server"""
+        """Starts the Result Server
+
+        Returns:
+            int: port the Result Server is listening on
+
+        Raises:
+            ResultServerError: raised if socket could not be opened
+        """
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+        try:
+            s.bind((self.host, self.port))
+            s.listen(MAX_CLIENTS)
+        except socket.error as e:
+            s.close()
+            raise ResultServerError("Result Server failed to start: %s" % e)
+
+        s.settimeout(ACCEPT_POLL_INTERVAL)
+        self.sock = s
+        self.port = s.getsockname()[1]
+
+        # Set/Fire server running event
+        self.running.set()
+
         self.server_thread = threading.Thread(
             target=self._start_server, args=(self.debug,))
+        self.server_thread.daemon = True
         self.server_thread.start()
 
-        # Wait for server running event
-        if not self.running.wait(timeout=0.5):  # timeout=0 feels to risky
-            raise ResultServerError("Result Server failed to start")
-
         return self.port
 
+    def stop(self):
+        """Stops waiting for a result (if not yet connected)"""
+        self.running.clear()
+
+    def done(self):
+        """Returns True if the server is no longer waiting for a result
+        (result posted, connection closed or timed out)"""
+        return self.server_thread is not None and \
+            not self.server_thread.is_alive()
+
     def get_result(self, timeout=None):
         """ Gets the result posted to the socket. Blocks until result is posted
             to socket, unless a timeout is given.
@@ -83,11 +223,11 @@ class ResultServer(object):
                 If 'None' will block/wait forever. If '0' will not block.
 
         """
-        if self.server_thread.isAlive() is True:
+        if self.server_thread.is_alive():
             self.server_thread.join(timeout=timeout)
 
             # Thread should only be alive if timeout was exceeded
-            if self.server_thread.isAlive is True:
+            if self.server_thread.is_alive():
                 return None
 
         if type(self.result) == str:
@@ -96,52 +236,59 @@ class ResultServer(object):
             return self.result
 
     def _start_server(self, debug):
-        """ Creates the socket for the result to be posted to.
+        """ Waits for the result to be posted to the (already bound) socket.
 
         """
         result = ""
-        if debug:
-            print("Starting server...")
-        # with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:   #Py3
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s = self.sock
 
-        s.settimeout(SOCK_TIMEOUT)
+        if debug:
+            print("Starting server on port %d..." % self.port)
 
-        # Try up to MAX_PORTS different ports
-        for i in range(MAX_PORTS):
+        # Wait for connection until timeout or server is stopped
+        deadline = None if self.timeout is None else \
+            time.time() + self.timeout
+        conn = None
+        while self.running.is_set():
             try:
-                s.bind((self.host, self.port + i))
-                self.port = self.port + i
+                conn, addr = s.accept()
                 break
-            except Exception:
-                continue
-        else:
-            raise ResultServerError("""Too many result sockets in use. (At
-                least %d)""" % MAX_PORTS)
-
-        # Set/Fire server running event
-        self.running.set()
+            except socket.timeout:
+                if deadline is not None and time.time() > deadline:
+                    break
 
-        s.listen(MAX_CLIENTS)
-        conn, addr = s.accept()
+        if conn is None:
+            s.close()
+            return
         # with conn: #Py3
+        conn.settimeout(self.timeout)
         if debug:
             print("Connected by", addr)
 
-        # Run until server running event is cleared
+        # Run until result frame received or server running event is cleared
         while self.running.is_set():
             try:
-                data = conn.recv(1024)
-            except socket.timeout:
+                kind, payload = recv_frame(conn, sink=self.sink)
+            except (socket.timeout, socket.error, ResultServerError):
                 result = None
                 break
-            if not data:
+
+            if kind is None:
+                break
+            elif kind == FRAME_RESULT:
+                # Decode once (multi-byte characters are never split)
+                result = payload.decode("utf-8")
+                self.result_time = time.time()
                 break
-            result += data.decode("utf-8").strip()
+            elif kind == FRAME_PROGRESS:
+                notify_progress(self.progress, payload)
+            elif debug and kind != FRAME_DATA:
+                print("Ignoring unknown frame: %s" % kind)
 
         if debug:
             print("Received: %s from %s" % (result, addr))
 
         self.result = result
 
+        conn.close()
         s.close()
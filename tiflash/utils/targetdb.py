@@ -0,0 +1,348 @@
+"""
+helper module for indexing the xml files of a ccs installation's targetdb
+
+Listing or searching the targetdb (devices, connections, cpus) means parsing
+every xml file of a directory. The values parsed from each xml file are kept
+in an index (one JSON file per directory) so they are only parsed again when
+the file changes. When an index is loaded, each xml file's modification time
+and size are checked against the index and only the xml files that changed
+are parsed again. Indexes kept in memory are reused for as long as the
+directory's modification time does not change (xml files added or removed).
+
+Building an index from scratch (i.e. fresh CCS installation) parses the xml
+files in chunks across a pool of worker processes.
+
+Example:
+    index = targetdb.get_index(devices_dir, parse_device)
+    xml_name = index.find_one('devicetype', "MSP432P401R")
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import multiprocessing
+import time
+
+INDEX_DIR = os.path.join(os.path.expanduser("~"), ".tiflash", "targetdb")
+INDEX_VERSION = 1
+
+# xml files are parsed in worker processes when at least PARALLEL_MIN_FILES
+# files need parsing; each worker task parses CHUNK_SIZE files
+PARALLEL_MIN_FILES = 256
+CHUNK_SIZE = 64
+
+# In-process memo of indexes {(index_dir, directory, kind): TargetDBIndex}
+_index_memo = dict()
+
+
+class TargetDBIndex(object):
+    """Index of the xml files of a targetdb directory.
+
+    Args:
+        directory (str): full path to indexed directory
+        mtime (float): modification time of directory when indexed
+        records (dict): values parsed from each xml file
+            {xml_name: dict or None (not a valid xml file)}
+    """
+
+    def __init__(self, directory, mtime, records):
+        self.directory = directory
+        self.mtime = mtime
+        self.records = records
+        self.__lookups = dict()
+
+    def xml_names(self):
+        """Returns (sorted) list of xml file names of valid xml files"""
+        return sorted(n for n in self.records if self.records[n] is not None)
+
+    def path(self, xml_name):
+        """Returns full path to xml file (None if not indexed)"""
+        if xml_name not in self.records:
+            return None
+
+        return os.path.normpath(self.directory + '/' + xml_name)
+
+    def record(self, xml_name):
+        """Returns values parsed from xml file (None if not a valid xml file
+        or not indexed)"""
+        return self.records.get(xml_name)
+
+    def values(self, field):
+        """Returns list of field's value of every valid xml file (ordered by
+        xml file name)"""
+        return [self.records[n][field] for n in self.xml_names()]
+
+    def find(self, field, value):
+        """Returns list of xml file names with field set to value"""
+        if field not in self.__lookups:
+            lookup = dict()
+            for xml_name in self.xml_names():
+                lookup.setdefault(self.records[xml_name].get(field),
+                                  list()).append(xml_name)
+            self.__lookups[field] = lookup
+
+        return self.__lookups[field].get(value, list())
+
+    def find_one(self, field, value):
+        """Returns (first) xml file name with field set to value (None if not
+        found)"""
+        xml_names = self.find(field, value)
+
+        return xml_names[0] if xml_names else None
+
+
+def get_index(directory, parse, kind, index_dir=None, progress=None,
+              processes=None):
+    """Returns the index of the xml files in directory.
+
+    Args:
+        directory (str): full path to directory of xml files
+        parse (function): function returning dict of values parsed from a
+            xml file (given its full path); raising an Exception marks the
+            file as not valid
+        kind (str): name of indexed values (i.e. 'devices'); must change if
+            the values returned by parse change
+        index_dir (str, optional): directory to store index files in
+            (default: INDEX_DIR)
+        progress (callable, optional): called with progress events while
+            xml files are parsed (see TIFlash.set_progress()); 'phase' is
+            kind and 'done'/'total' count xml files ('unit' is 'files')
+        processes (int, optional): max number of worker processes to parse
+            xml files with (default: number of cpus; 1 = parse in this
+            process)
+
+    Returns:
+        TargetDBIndex: index of directory
+
+    Raises:
+        OSError: raised if directory does not exist
+    """
+    if index_dir is None:
+        index_dir = INDEX_DIR
+
+    directory = os.path.normpath(os.path.abspath(directory))
+    key = (index_dir, directory, kind)
+    mtime = os.stat(directory).st_mtime
+
+    index = _index_memo.get(key)
+    if index is not None and index.mtime == mtime:
+        return index
+
+    # xml files rewritten in place (i.e. driver updates) do not change the
+    # directory's mtime, so every file's stamps are checked when the index
+    # is loaded from disk (only changed files are parsed again)
+    index_path = __get_index_path(index_dir, directory, kind)
+    stored = __read_index(index_path, directory, kind)
+
+    entries = __update_index(directory, parse, kind, stored.get('files', {}),
+                             progress, processes)
+    entries['mtime'] = mtime
+    if entries['files'] != stored.get('files') or \
+            stored.get('mtime') != mtime:
+        __write_index(index_path, directory, kind, entries)
+
+    records = dict((n, entries['files'][n]['record'])
+                   for n in entries['files'])
+    index = TargetDBIndex(directory, mtime, records)
+    _index_memo[key] = index
+
+    return index
+
+
+def clear_index(index_dir=None, remove=False):
+    """Clears the in-process memo of indexes.
+
+    Args:
+        index_dir (str, optional): directory index files are stored in
+            (default: INDEX_DIR)
+        remove (bool, optional): also remove the index files
+    """
+    if index_dir is None:
+        index_dir = INDEX_DIR
+
+    for key in list(_index_memo):
+        if key[0] == index_dir:
+            del _index_memo[key]
+
+    if remove and os.path.isdir(index_dir):
+        for f in os.listdir(index_dir):
+            if f.endswith(".json"):
+                os.remove(os.path.join(index_dir, f))
+
+
+def __get_index_path(index_dir, directory, kind):
+    """Returns path to index file of directory"""
+    digest = hashlib.sha1(directory.encode('utf-8')).hexdigest()[:16]
+
+    return os.path.join(index_dir, "%s-%s.json" % (kind, digest))
+
+
+def __update_index(directory, parse, kind, files, progress=None,
+                   processes=None):
+    """Returns index entries of directory; xml files that did not change
+    (same mtime and size) keep their entry in files"""
+    updated = dict()
+    stale = list()
+
+    for xml_name in sorted(os.listdir(directory)):
+        if not xml_name.endswith('.xml'):
+            continue
+
+        xml_path = os.path.join(directory, xml_name)
+        try:
+            st = os.stat(xml_path)
+        except OSError:
+            continue
+
+        entry = files.get(xml_name)
+        if entry is None or entry['mtime'] != st.st_mtime or \
+                entry['size'] != st.st_size:
+            entry = {'mtime': st.st_mtime, 'size': st.st_size,
+                     'record': None}
+            stale.append(xml_name)
+
+        updated[xml_name] = entry
+
+    xml_paths = [os.path.join(directory, n) for n in stale]
+    records = __parse_files(xml_paths, parse, kind, progress, processes)
+    for (xml_name, record) in zip(stale, records):
+        updated[xml_name]['record'] = record
+
+    return {'files': updated}
+
+
+def __parse_files(xml_paths, parse, kind, progress=None, processes=None):
+    """Returns list of records parsed from each xml file (in order of
+    xml_paths). Files are parsed in chunks, in worker processes when there
+    are enough files to parse."""
+    total = len(xml_paths)
+    if total == 0:
+        return list()
+
+    start = time.time()
+
+    def notify(status, done):
+        if progress is not None:
+            progress({'phase': kind, 'status': status, 'done': done,
+                      'total': total, 'elapsed': time.time() - start,
+                      'unit': 'files'})
+
+    chunks = [(parse, xml_paths[i:i + CHUNK_SIZE])
+              for i in range(0, total, CHUNK_SIZE)]
+
+    pool = None
+    if total >= PARALLEL_MIN_FILES:
+        pool = __get_pool(processes, len(chunks))
+
+    notify('start', 0)
+    records = list()
+    try:
+        # imap returns chunks in order, so records match xml_paths
+        if pool is not None:
+            parsed_chunks = pool.imap(__parse_chunk, chunks)
+        else:
+            parsed_chunks = (__parse_chunk(c) for c in chunks)
+
+        for parsed in parsed_chunks:
+            records.extend(parsed)
+            notify('running', len(records))
+    finally:
+        if pool is not None:
+            pool.terminate()    # all chunks are parsed (or parsing failed)
+            pool.join()
+    notify('done', len(records))
+
+    return records
+
+
+def __parse_chunk(chunk):
+    """Returns list of records parsed from a chunk (parse, xml_paths); runs
+    in worker processes"""
+    (parse, xml_paths) = chunk
+    records = list()
+
+    for xml_path in xml_paths:
+        try:
+            record = parse(xml_path)
+        except Exception:   # Some xmls are not valid targetdb xml files
+            record = None
+        records.append(record)
+
+    return records
+
+
+def __get_pool(processes, num_chunks):
+    """Returns a pool of worker processes to parse xml files with (None if
+    xml files should be parsed in this process).
+
+    Workers are forked (not spawned) so the caller's main module is not
+    imported again in each worker. Forking a process running other threads
+    is not safe, so xml files are only parsed in parallel from
+    single-threaded processes (i.e. the command line).
+    """
+    if processes is None:
+        try:
+            processes = multiprocessing.cpu_count()
+        except NotImplementedError:
+            processes = 1
+    processes = min(processes, num_chunks)
+
+    if processes < 2 or threading.active_count() > 1:
+        return None
+
+    try:
+        context = multiprocessing.get_context('fork')
+    except AttributeError:  # python 2 (always forks on posix)
+        if os.name != 'posix':
+            return None
+        context = multiprocessing
+    except ValueError:      # fork not supported (i.e. windows)
+        return None
+
+    try:
+        return context.Pool(processes)
+    except (OSError, ImportError):  # i.e. no semaphore support
+        return None
+
+
+def __read_index(index_path, directory, kind):
+    """Returns entries of index file (empty if missing or invalid)"""
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION and \
+                index.get('directory') == directory and \
+                index.get('kind') == kind:
+            return index
+    except (IOError, OSError, ValueError, AttributeError):
+        pass
+
+    return dict()
+
+
+def __write_index(index_path, directory, kind, entries):
+    """Writes index file atomically. The index is only a cache, so failing to
+    write it (i.e. read-only home directory) is ignored."""
+    index = {'version': INDEX_VERSION, 'directory': directory, 'kind': kind}
+    index.update(entries)
+
+    try:
+        index_dir = os.path.dirname(index_path)
+        if not os.path.isdir(index_dir):
+            os.makedirs(index_dir)
+
+        (fd, tmp_path) = tempfile.mkstemp(prefix="index-", suffix=".tmp",
+                                          dir=index_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+
+        try:
+            os.replace(tmp_path, index_path)
+        except AttributeError:  # python 2
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            os.rename(tmp_path, index_path)
+    except (IOError, OSError):
+        pass
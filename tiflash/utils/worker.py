@@ -0,0 +1,247 @@
+"""
+helper module for running a persistent Debug Server Scripting (dss) worker
+
+A worker launches js/main.js once (in 'worker' mode) and keeps it resident.
+Commands are then sent to the worker over a local socket, so consecutive
+commands only pay the ccstudio startup cost once per worker.
+"""
+
+import json
+import socket
+import subprocess
+import threading
+import time
+
+from tiflash.utils import dss
+from tiflash.utils import result as result_channel
+from tiflash.utils import workspace as ws
+
+HOST = "localhost"
+WORKER_START_TIMEOUT = 120  # time to wait for worker to connect (seconds)
+ACCEPT_POLL_INTERVAL = 0.5  # interval to check worker is still alive
+
+
+class DSSWorkerError(dss.DSSError):
+    """Generic DSS Worker Error"""
+    pass
+
+
+class DSSWorkerTimeoutError(DSSWorkerError, dss.DSSTimeoutError):
+    """Worker did not complete a command before its deadline (the worker
+    is killed)"""
+    pass
+
+
+class DSSWorker(object):
+    """Class for running commands on a persistent js/main.js process.
+
+    Args:
+        dss_path (str): Path to eclipsec/ccstudio executable to use
+        workspace (str, optional): workspace to use for worker process (if
+            None, a free workspace is allocated for the worker's lifetime)
+        debug (bool, optional): choose to include debug messages
+
+    """
+
+    def __init__(self, dss_path, workspace=None, debug=False):
+        self.dss_path = dss_path
+        self.workspace = workspace
+        self.debug = debug
+
+        self.process = None
+        self.output = None
+        self.conn = None
+        self.allocated_workspace = None
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        if not self.is_alive():
+            self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __del__(self):
+        try:
+            self.stop()
+        except Exception:
+            pass
+
+    def start(self, timeout=WORKER_START_TIMEOUT):
+        """Launches the worker process and waits for it to connect.
+
+        Args:
+            timeout (float): time to wait for worker to start (seconds)
+
+        Raises:
+            DSSWorkerError: raised if worker fails to start
+        """
+        if self.is_alive():
+            raise DSSWorkerError("Worker is already running")
+
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.bind((HOST, 0))   # Let OS pick a free port
+        s.listen(1)
+        s.settimeout(ACCEPT_POLL_INTERVAL)
+        port = s.getsockname()[1]
+
+        try:
+            workspace = self.workspace
+            if workspace is None:
+                self.allocated_workspace = ws.allocate_workspace()
+                workspace = self.allocated_workspace.path
+
+            cmd = dss.build_dss_cmd(self.dss_path, port, ["--worker"],
+                                    workspace=workspace)
+
+            self.process = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                **dss.new_process_group_kwargs())
+            self.output = dss.ProcessOutput(self.process.stdout)
+            self.output.start()
+
+            # Wait for worker to connect (fail early if process dies)
+            deadline = time.time() + timeout
+            while True:
+                try:
+                    conn, addr = s.accept()
+                    break
+                except socket.timeout:
+                    if self.process.poll() is not None:
+                        raise DSSWorkerError("Worker exited during startup "
+                                             "(code: %s)" %
+                                             self.process.returncode)
+                    if time.time() > deadline:
+                        raise DSSWorkerError("Timed out waiting for worker "
+                                             "to start")
+        except Exception:
+            self.__kill()
+            raise
+        finally:
+            s.close()
+
+        conn.settimeout(None)
+        self.conn = conn
+
+        if self.debug:
+            print("Worker connected by", addr)
+
+    def is_alive(self):
+        """Returns True if worker process is running and connected
+
+        Returns:
+            bool: True if worker is running
+        """
+        return self.process is not None and self.conn is not None \
+            and self.process.poll() is None
+
+    def run(self, commands, deadline=None, sink=None, progress=None):
+        """Runs commands on the worker and waits for the result.
+
+        Args:
+            commands (list): list of string commands to pass to main.js
+                (as returned by dss.format_args)
+            deadline (float, optional): wall-clock time (seconds) to wait
+                for the result of the whole command. If 'None' will
+                block/wait forever.
+            sink (file, optional): file object to stream data posted by
+                command to
+            progress (callable, optional): callback called with each
+                progress event posted by command
+
+        Returns:
+            (bool, str): returns tuple with (bool=result, str=value)
+                value is the result envelope; decode with
+                dss.decode_result()
+
+        Raises:
+            DSSWorkerTimeoutError: raised if the result is not received
+                before the deadline (worker is killed in this case)
+            DSSWorkerError: raised if worker is not running or stops
+                responding (worker is stopped in this case)
+        """
+        if deadline is not None and deadline < 0:
+            deadline = None
+        end_time = None if deadline is None else time.time() + deadline
+
+        with self.lock:
+            if not self.is_alive():
+                raise DSSWorkerError("Worker is not running")
+
+            request = json.dumps([str(c) for c in commands]) + "\n"
+
+            try:
+                self.conn.settimeout(deadline)
+                self.conn.sendall(request.encode("utf-8"))
+
+                # Receive frames until the result frame (deadline applies to
+                # the whole command, not to each frame)
+                kind = None
+                while kind != result_channel.FRAME_RESULT:
+                    if end_time is not None:
+                        remaining = end_time - time.time()
+                        if remaining <= 0:
+                            raise socket.timeout()
+                        self.conn.settimeout(remaining)
+
+                    kind, payload = result_channel.recv_frame(self.conn,
+                                                              sink=sink)
+                    if kind is None:
+                        break
+                    elif kind == result_channel.FRAME_PROGRESS:
+                        result_channel.notify_progress(progress, payload)
+            except socket.timeout:
+                output = self.output.get() if self.output else None
+                self.__kill()
+                raise DSSWorkerTimeoutError("Worker exceeded the deadline of "
+                                            "%s seconds running command" %
+                                            deadline, output=output)
+            except (socket.error, result_channel.ResultServerError) as e:
+                self.__kill()
+                raise DSSWorkerError("Lost connection to worker: %s" % e)
+
+            if kind is None:
+                self.__kill()
+                raise DSSWorkerError("Worker exited unexpectedly")
+
+        # Command status is carried in the result envelope
+        return (True, payload.decode("utf-8"))
+
+    def stop(self, timeout=10):
+        """Stops the worker process.
+
+        Args:
+            timeout (float): time to wait for worker to exit before killing
+        """
+        with self.lock:
+            if self.conn is not None and self.is_alive():
+                try:
+                    request = json.dumps(["--exit"]) + "\n"
+                    self.conn.sendall(request.encode("utf-8"))
+                except socket.error:
+                    pass
+
+            if self.process is not None:
+                deadline = time.time() + timeout
+                while self.process.poll() is None and time.time() < deadline:
+                    time.sleep(0.1)
+
+            self.__kill()
+
+    def __kill(self):
+        """PRIVATE FUNCTION: Closes the socket and kills the worker process if
+        still running
+        """
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+        if self.process is not None:
+            dss.kill_process_tree(self.process)
+            self.process = None
+            self.output = None
+
+        if self.allocated_workspace is not None:
+            self.allocated_workspace.release()
+            self.allocated_workspace = None
@@ -0,0 +1,181 @@
+"""
+helper module for allocating dss (eclipse) workspaces
+
+Only one ccstudio process can use an eclipse workspace at a time. Each dss
+process is given its own workspace from a set of reusable workspace slots,
+so concurrent tiflash processes do not contend on the same workspace lock.
+
+A workspace slot is reserved by holding an OS file lock on its lock file.
+The lock is released by the OS if the process dies, so slots are never left
+reserved by crashed processes.
+"""
+
+import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+WORKSPACE_ROOT = os.path.join(os.path.expanduser("~"), ".tiflash",
+                              "workspaces")
+WORKSPACE_PREFIX = "ws"
+LOCK_SUFFIX = ".lock"
+MAX_WORKSPACES = 128    # max number of workspaces in use at once
+
+
+class WorkspaceError(Exception):
+    """Generic Workspace Error"""
+    pass
+
+
+class Workspace(object):
+    """Workspace directory reserved for this process until released.
+
+    Can be used as a context manager (released on exit).
+
+    Args:
+        path (str): full path to workspace directory
+        lock_file (file): open lock file holding the reservation
+    """
+
+    def __init__(self, path, lock_file):
+        self.path = path
+        self.lock_file = lock_file
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def __del__(self):
+        self.release()
+
+    def release(self):
+        """Releases the workspace so it can be reused."""
+        if self.lock_file is not None:
+            _unlock_file(self.lock_file)
+            self.lock_file.close()
+            self.lock_file = None
+
+
+def allocate_workspace(name=None, root=WORKSPACE_ROOT):
+    """Reserves a workspace not in use by any other dss process.
+
+    Workspaces are reused: the first free slot (<name>-0, <name>-1, ...) is
+    returned.
+
+    Args:
+        name (str, optional): base name of workspace (i.e. a serno); default
+            is a generic workspace slot
+        root (str, optional): directory to create workspaces in
+
+    Returns:
+        Workspace: reserved workspace (call release() when done)
+
+    Raises:
+        WorkspaceError: raised if no workspace could be reserved
+    """
+    _make_dirs(root)
+
+    base_name = name or WORKSPACE_PREFIX
+    for i in range(MAX_WORKSPACES):
+        path = os.path.join(root, "%s-%d" % (base_name, i))
+
+        lock_file = _lock_workspace(path)
+        if lock_file is None:
+            continue    # in use
+
+        _make_dirs(path)
+        return Workspace(path, lock_file)
+
+    raise WorkspaceError("All %d '%s' workspaces are in use (%s)" %
+                         (MAX_WORKSPACES, base_name, root))
+
+
+def cleanup_workspaces(keep=0, root=WORKSPACE_ROOT):
+    """Removes workspaces that are not currently in use.
+
+    Args:
+        keep (int, optional): number of unused workspaces to keep (for reuse)
+        root (str, optional): directory workspaces are created in
+
+    Returns:
+        list: list of workspace paths removed
+    """
+    removed = list()
+
+    if not os.path.isdir(root):
+        return removed
+
+    workspace_names = sorted([f[:-len(LOCK_SUFFIX)] for f in os.listdir(root)
+                              if f.endswith(LOCK_SUFFIX)])
+
+    kept = 0
+    for workspace_name in workspace_names:
+        path = os.path.join(root, workspace_name)
+
+        lock_file = _lock_workspace(path)
+        if lock_file is None:
+            continue    # in use
+
+        try:
+            if not os.path.isdir(path):
+                continue
+
+            if kept < keep:
+                kept += 1
+                continue
+
+            # Lock files are left in place; removing them while another
+            # process opens them could let two processes reserve one slot
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+        finally:
+            _unlock_file(lock_file)
+            lock_file.close()
+
+    return removed
+
+
+def _lock_workspace(path):
+    """PRIVATE FUNCTION: Returns open (locked) lock file of workspace or None
+    if workspace is in use
+    """
+    lock_file = open(path + LOCK_SUFFIX, 'a+')
+
+    try:
+        lock_file.seek(0)
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except (IOError, OSError):
+        lock_file.close()
+        return None
+
+    return lock_file
+
+
+def _unlock_file(lock_file):
+    """PRIVATE FUNCTION: Releases lock held on lock file"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    except (IOError, OSError):
+        pass
+
+
+def _make_dirs(path):
+    """PRIVATE FUNCTION: Creates directory (and parents) if not existing"""
+    try:
+        os.makedirs(path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise WorkspaceError("Could not create directory: %s" % path)
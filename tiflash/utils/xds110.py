@@ -109,11 +109,6 @@ def xds110_list(ccs_path):
     Raises:
         XDS110Error: raises if xdsdfu.exe does not exist or fails
     """
-    device_list = list()
-    device_pattern = "<<<< Device [0-9]+ >>>>"
-    serno_pattern = r"Serial Num\:\s+([A-Z0-9]{8})"
-    version_pattern = r"Version\:\s+([0-9\.]+)"
-
     xdsdfu_path = get_xds110_exe_path(ccs_path, 'xdsdfu')
     xds_exe = [ xdsdfu_path]
 
@@ -126,6 +121,23 @@ def xds110_list(ccs_path):
     if ret != 0:
         raise XDS110Error(out)
 
+    return parse_xds110_list(out)
+
+
+def parse_xds110_list(out):
+    """Parses the output of 'xdsdfu -e' for sernos and versions
+
+    Args:
+        out (str): output of 'xdsdfu -e' command
+
+    Returns:
+        list: list of tuples (sernos, version) of the XDS110 devices listed
+    """
+    device_list = list()
+    device_pattern = "<<<< Device [0-9]+ >>>>"
+    serno_pattern = r"Serial Num\:\s+([A-Z0-9]{8})"
+    version_pattern = r"Version\:\s+([0-9\.]+)"
+
     device_matches = re.split(device_pattern, str(out))
 
     for dm in device_matches:
@@ -104,6 +104,162 @@ def get_xml_root(xml_path):
 
     return root
 
+
+def __matches(element, tag, attribs):
+    """Returns True if element has tag and attribute values (attribs)"""
+    if element.tag != tag:
+        return False
+
+    for key in attribs or {}:
+        if element.get(key) != attribs[key]:
+            return False
+
+    return True
+
+
+def find_elements(xml_path, matches):
+    """Finds the first element matching each of the given tag/attributes.
+
+    The xml file is read incrementally (iterparse) and reading stops as soon
+    as every match is found (or the root element is read when no matches are
+    given). Elements not matched are cleared once read, so memory use does
+    not depend on the size of the file.
+
+    Example:
+        (root, found) = find_elements(device_xml, {
+                'cpu': ('cpu', None),
+                'connection': ('property', {'id': 'DefaultConnection'})})
+
+    Args:
+        xml_path (str): full path to xml file to parse
+        matches (dict): dict of {key: (tag, attribs)} where attribs is a dict
+            of attribute values the element must have (or None)
+
+    Returns:
+        (Element, dict): tuple of (root, found) where root is the root
+        element (only its tag and attributes are complete) and found is a
+        dict of {key: Element} of each match found (complete with children)
+    """
+    if not os.path.exists(xml_path):
+        raise XMLHelperError("Could not find xml file: %s" % xml_path)
+
+    root = None
+    found = dict()
+    pending = dict(matches)
+    claimed = list()    # elements found (still open)
+    stack = list()
+
+    with open(xml_path, 'rb') as f:
+        for (event, element) in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = element
+                    if not pending:
+                        break
+
+                for key in list(pending):
+                    (tag, attribs) = pending[key]
+                    if __matches(element, tag, attribs):
+                        found[key] = element
+                        claimed.append(element)
+                        del pending[key]
+                        break
+
+                stack.append(element)
+                continue
+
+            stack.pop()
+            if claimed and claimed[-1] is element:
+                claimed.pop()
+
+            if not pending and not claimed:
+                break
+
+            if claimed or element is root:
+                continue    # Keep children of found elements (and root)
+
+            if element not in found.values():
+                element.clear()
+            if stack and len(stack[-1]) and stack[-1][-1] is element:
+                del stack[-1][-1]
+
+    return (root, found)
+
+
+def find_element(xml_path, tag, attribs=None):
+    """Returns the first element with tag and attribute values (attribs) in
+    the xml file, reading the file only up to that element (see
+    find_elements())
+
+    Args:
+        xml_path (str): full path to xml file to parse
+        tag (str): tag of element to find
+        attribs (dict, optional): attribute values element must have
+
+    Returns:
+        ElementTree.Element: element found (None if not found)
+    """
+    (root, found) = find_elements(xml_path, {tag: (tag, attribs)})
+
+    return found.get(tag)
+
+
+def get_xml_root_element(xml_path):
+    """Returns the root element of the xml file, reading the file only up to
+    the root's start tag (so the element has no children; only its tag and
+    attributes are set).
+
+    Args:
+        xml_path (str): full path to xml file to parse
+
+    Returns:
+        ElementTree.Element: root element of xml doc (without children)
+    """
+    (root, found) = find_elements(xml_path, {})
+    del root[:]     # Drop any children parsed ahead of the start tag
+
+    return root
+
+
+def iter_elements(xml_path, tag):
+    """Yields each element with tag in the xml file (complete with children)
+    as it is read. Other elements are cleared once read, so memory use does
+    not depend on the size of the file.
+
+    Args:
+        xml_path (str): full path to xml file to parse
+        tag (str): tag of elements to yield
+
+    Yields:
+        ElementTree.Element: element with tag
+    """
+    if not os.path.exists(xml_path):
+        raise XMLHelperError("Could not find xml file: %s" % xml_path)
+
+    stack = list()
+    open_matches = 0
+
+    with open(xml_path, 'rb') as f:
+        for (event, element) in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if element.tag == tag:
+                    open_matches += 1
+                stack.append(element)
+                continue
+
+            stack.pop()
+            if element.tag == tag:
+                open_matches -= 1
+                yield element
+            elif open_matches == 0:
+                element.clear()
+
+            # Drop read elements (keep children of elements not yielded yet)
+            if open_matches == 0 and stack and len(stack[-1]) and \
+                    stack[-1][-1] is element:
+                del stack[-1][-1]
+
+
 def get_sibling(target_node, parent_node, index):
     """Returns the sibling node at the index relative to the target_node.
 